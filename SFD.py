@@ -33,7 +33,6 @@ from urllib.parse import urlparse
 import pandas as pd
 import dask.dataframe as dd
 import numpy as np
-from geopy.distance import great_circle
 import folium
 from folium.plugins import MarkerCluster, HeatMap
 import matplotlib.pyplot as plt
@@ -46,12 +45,33 @@ import threading
 import subprocess
 from branca.element import Element
 import math
+import time
 
 
 # Import local utility modules
 from utils import get_cache_dir, clear_cache, check_dependencies, format_file_size
-from utils import log_memory_usage, suppress_warnings, validate_config, generate_cache_key
+from utils import log_memory_usage, suppress_warnings, validate_config
 from map_utils import MapCoordinateManager, add_lat_lon_grid_lines
+from read_planner import REQUIRED_COLUMNS, plan_for_file
+from day_prefetcher import DayPrefetcher, StageTimer, DEFAULT_PREFETCH_DEPTH
+from day_pair_pool import DayPairPool
+from geo_kernels import haversine, EARTH_RADIUS_NM, GPU_MIN_SIZE
+from anomaly_detectors import (first_last_positions, detect_beacon_on, detect_beacon_off,
+                               detect_position_jumps, detect_speed_events, detect_course_heading_mismatch,
+                               track_segments, daily_track_lengths, detect_excessive_travel_fast,
+                               detect_excessive_travel_slow,
+                               loitering_carry, loitering_tail, detect_loitering, detect_rendezvous,
+                               detect_identity_spoofing, detect_zone_violations)
+from anomaly_builder import AnomalyBuilder
+from anomaly_summary import (SUMMARY_PARQUET, write_anomaly_parquet, find_anomaly_summary, read_anomaly_summary,
+                             append_anomaly_summary)
+from vessel_state import VesselState, vessel_state_dir
+from zone_index import ZoneIndex, parse_polygon
+from ais_schema import conform_dataframe, memory_usage_mb
+from day_cache import (load_cached_day, save_cached_day, fingerprint_dir, normalize_partition,
+                       write_hot_day, hot_cache_path)
+from cache_manager import (CacheManager, cache_budget_bytes, enforce_cache_budget,
+                           format_cache_stats, DEFAULT_CACHE_MAX_GB)
 
 # Global variables for tracking background processes
 statistics_thread = None
@@ -574,12 +594,6 @@ else:
     else:
         logger.info("GPU support not available, using CPU-based processing")
 
-# Required columns for AIS data
-REQUIRED_COLUMNS = [
-    'MMSI', 'VesselName', 'VesselType', 'LAT', 'LON',
-    'BaseDateTime', 'SOG', 'Heading', 'COG'
-]
-
 # Using MapCoordinateManager to store calculated lat/lon range for all maps
 map_manager = MapCoordinateManager()
 
@@ -827,21 +841,18 @@ def get_files_for_date_range(data_dir, start_date, end_date, config=None):
             # Try to use the .ais_data_cache directory as a fallback
             cache_dir = get_cache_dir()
             
-            # Create date-specific subfolder path if dates are available
+            # Cached days for these preprocessing settings are named YYYY-MM-DD.parquet
             try:
-                start_fmt = start_date.strftime('%Y%m%d')
-                end_fmt = end_date.strftime('%Y%m%d')
-                date_subfolder = f"{start_fmt}-{end_fmt}"
-                cache_subdir = os.path.join(cache_dir, date_subfolder)
+                cache_subdir = fingerprint_dir(config or {}, cache_dir)
                 
-                if os.path.exists(cache_subdir):
-                    logger.info(f"Data directory {data_dir} not found, using cache directory: {cache_subdir}")
+                if cache_subdir and os.path.exists(cache_subdir):
+                    logger.info(f"Data directory {data_dir} not found, using day cache directory: {cache_subdir}")
                     data_dir = cache_subdir
                 else:
                     logger.info(f"Data directory {data_dir} not found, using main cache directory: {cache_dir}")
                     data_dir = cache_dir
             except Exception as e:
-                logger.warning(f"Error creating cache subfolder path: {e}, using main cache directory")
+                logger.warning(f"Error resolving day cache directory: {e}, using main cache directory")
                 logger.info(f"Data directory {data_dir} not found, using main cache directory: {cache_dir}")
                 data_dir = cache_dir
                 
@@ -915,6 +926,10 @@ def load_config(config_file='config.ini'):
             'MIN_SPEED_FOR_COG_CHECK': 10,
             'SPEED_THRESHOLD': 102,  # Max theoretical speed in knots (117 mph / 189 kph)
             'USE_DASK': True,
+            'PREFETCH_DEPTH': DEFAULT_PREFETCH_DEPTH,  # Days decoded ahead of detection (0 disables prefetch)
+            'WORKERS': 1,  # Processes detecting day pairs (1 detects them serially)
+            'CACHE_MAX_SIZE_GB': DEFAULT_CACHE_MAX_GB,  # Cache budget, least recently used entries evicted (0 = unlimited)
+            'HOT_CACHE': False,  # Keep memory-mappable Arrow copies of cached days
             'USE_GPU': GPU_AVAILABLE,  # Use GPU if available
             'DATA_DIRECTORY': 'data',
             'OUTPUT_DIRECTORY': 'C:\\AIS_Data\\Reports',  # Proper Windows path with double backslashes
@@ -923,6 +938,8 @@ def load_config(config_file='config.ini'):
             'S3_DATA_URI': '',
             'TIME_DIFF_THRESHOLD_MIN': 240,  # Default 4 hours (240 min) for time difference detection
             'BEACON_TIME_THRESHOLD_HOURS': 6,  # Default 6 hours for AIS beacon anomaly detection
+            'MIN_TRAVEL_NM': 200,  # Expected track per 24 h; underway vessels below their share are 'Slow'
+            'MAX_TRAVEL_NM': 550,  # Daily track above this is 'Fast'
             'start_date': '2024-10-15',  # Default start date
             'end_date': '2024-10-17'   # Default end date
         }
@@ -973,6 +990,10 @@ def load_config(config_file='config.ini'):
             'MIN_SPEED_FOR_COG_CHECK': get_config_value('Parameters', 'MIN_SPEED_FOR_COG_CHECK', fallback=10, value_type='float'),
             'SPEED_THRESHOLD': get_config_value('Parameters', 'SPEED_THRESHOLD', fallback=102, value_type='float'),
             'USE_DASK': get_config_value('Processing', 'USE_DASK', fallback=True, value_type='boolean'),
+            'PREFETCH_DEPTH': get_config_value('Processing', 'PREFETCH_DEPTH', fallback=DEFAULT_PREFETCH_DEPTH, value_type='int'),
+            'WORKERS': get_config_value('Processing', 'WORKERS', fallback=1, value_type='int'),
+            'CACHE_MAX_SIZE_GB': get_config_value('Processing', 'CACHE_MAX_SIZE_GB', fallback=DEFAULT_CACHE_MAX_GB, value_type='float'),
+            'HOT_CACHE': get_config_value('Processing', 'HOT_CACHE', fallback=False, value_type='boolean'),
             'USE_GPU': get_config_value('Processing', 'USE_GPU', fallback=GPU_AVAILABLE, value_type='boolean'),
             
             # Get directory paths checking both Paths and DEFAULT sections
@@ -980,16 +1001,20 @@ def load_config(config_file='config.ini'):
                                    fallback=get_config_value('DEFAULT', 'DATA_DIRECTORY', fallback='data')),
             'OUTPUT_DIRECTORY': get_config_value('Paths', 'OUTPUT_DIRECTORY',
                                      fallback=get_config_value('DEFAULT', 'OUTPUT_DIRECTORY', fallback='output')),
+            'STATE_DIRECTORY': get_config_value('Paths', 'STATE_DIRECTORY', fallback=''),
                                      
             'USE_S3': get_config_value('AWS', 'USE_S3', fallback=False, value_type='boolean'),
             'S3_DATA_URI': get_config_value('AWS', 'S3_DATA_URI', fallback=''),
             'TIME_DIFF_THRESHOLD_MIN': get_config_value('Parameters', 'TIME_DIFF_THRESHOLD_MIN', fallback=240, value_type='float'),
             'BEACON_TIME_THRESHOLD_HOURS': get_config_value('ANOMALY_THRESHOLDS', 'BEACON_TIME_THRESHOLD_HOURS', fallback=6, value_type='float'),
+            'MIN_TRAVEL_NM': get_config_value('ANOMALY_THRESHOLDS', 'MIN_TRAVEL_NM', fallback=200, value_type='float'),
+            'MAX_TRAVEL_NM': get_config_value('ANOMALY_THRESHOLDS', 'MAX_TRAVEL_NM', fallback=550, value_type='float'),
             
             # Anomaly types (all now enabled by default)
             'ais_beacon_on': get_config_value('ANOMALY_TYPES', 'ais_beacon_on', fallback=True, value_type='boolean'),
             'ais_beacon_off': get_config_value('ANOMALY_TYPES', 'ais_beacon_off', fallback=True, value_type='boolean'),
             'excessive_travel_distance_fast': get_config_value('ANOMALY_TYPES', 'excessive_travel_distance_fast', fallback=True, value_type='boolean'),
+            'excessive_travel_distance_slow': get_config_value('ANOMALY_TYPES', 'excessive_travel_distance_slow', fallback=True, value_type='boolean'),
             'cog-heading_inconsistency': get_config_value('ANOMALY_TYPES', 'cog-heading_inconsistency', fallback=True, value_type='boolean'),
             'loitering': get_config_value('ANOMALY_TYPES', 'loitering', fallback=True, value_type='boolean'),
             'rendezvous': get_config_value('ANOMALY_TYPES', 'rendezvous', fallback=True, value_type='boolean'),
@@ -1030,6 +1055,7 @@ def load_config(config_file='config.ini'):
             'filter_to_anomaly_vessels_only': get_config_value('OUTPUT_CONTROLS', 'filter_to_anomaly_vessels_only', fallback=False, value_type='boolean'),
             'show_lat_long_grid': get_config_value('OUTPUT_CONTROLS', 'show_lat_long_grid', fallback=True, value_type='boolean'),
             'show_anomaly_heatmap': get_config_value('OUTPUT_CONTROLS', 'show_anomaly_heatmap', fallback=True, value_type='boolean'),
+            'generate_geoparquet': get_config_value('OUTPUT_CONTROLS', 'generate_geoparquet', fallback=False, value_type='boolean'),
             
             # LOGGING settings
             'suppress_warnings': get_config_value('LOGGING', 'suppress_warnings', fallback=True, value_type='boolean'),
@@ -1065,13 +1091,26 @@ def load_config(config_file='config.ini'):
                     is_selected = config.getboolean('ZONE_VIOLATIONS', f'{zone_key}_is_selected', fallback=True)
                     # Only include selected zones
                     if is_selected:
-                        zone = {
-                            'name': config.get('ZONE_VIOLATIONS', f'{zone_key}_name'),
-                            'lat_min': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lat_min'),
-                            'lat_max': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lat_max'),
-                            'lon_min': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lon_min'),
-                            'lon_max': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lon_max')
-                        }
+                        polygon = config.get('ZONE_VIOLATIONS', f'{zone_key}_polygon', fallback='').strip()
+                        if polygon:
+                            # Polygon zone ("lat,lon; lat,lon; ..."), bounds taken from its vertices
+                            vertices = parse_polygon(polygon)
+                            zone = {
+                                'name': config.get('ZONE_VIOLATIONS', f'{zone_key}_name'),
+                                'lat_min': float(vertices[:, 0].min()),
+                                'lat_max': float(vertices[:, 0].max()),
+                                'lon_min': float(vertices[:, 1].min()),
+                                'lon_max': float(vertices[:, 1].max()),
+                                'polygon': polygon
+                            }
+                        else:
+                            zone = {
+                                'name': config.get('ZONE_VIOLATIONS', f'{zone_key}_name'),
+                                'lat_min': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lat_min'),
+                                'lat_max': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lat_max'),
+                                'lon_min': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lon_min'),
+                                'lon_max': config.getfloat('ZONE_VIOLATIONS', f'{zone_key}_lon_max')
+                            }
                         restricted_zones.append(zone)
                 except (configparser.NoOptionError, ValueError):
                     continue
@@ -1135,6 +1174,10 @@ def load_config(config_file='config.ini'):
             'MIN_SPEED_FOR_COG_CHECK': 10,
             'SPEED_THRESHOLD': 102,
             'USE_DASK': True,
+            'PREFETCH_DEPTH': DEFAULT_PREFETCH_DEPTH,
+            'WORKERS': 1,
+            'CACHE_MAX_SIZE_GB': DEFAULT_CACHE_MAX_GB,
+            'HOT_CACHE': False,
             'USE_GPU': GPU_AVAILABLE,
             'DATA_DIRECTORY': 'data',
             'OUTPUT_DIRECTORY': 'C:\\AIS_Data\\Reports',  # Proper Windows path format
@@ -1143,9 +1186,12 @@ def load_config(config_file='config.ini'):
             'S3_DATA_URI': '',
             'TIME_DIFF_THRESHOLD_MIN': 240,
             'BEACON_TIME_THRESHOLD_HOURS': 6,  # Default 6 hours for AIS beacon anomaly detection
+            'MIN_TRAVEL_NM': 200,
+            'MAX_TRAVEL_NM': 550,
             'ais_beacon_on': True,
             'ais_beacon_off': True,
             'excessive_travel_distance_fast': True,
+            'excessive_travel_distance_slow': True,
             'cog-heading_inconsistency': True,
             'loitering': True,
             'rendezvous': True,
@@ -1174,6 +1220,7 @@ def load_config(config_file='config.ini'):
             'filter_to_anomaly_vessels_only': False,
             'show_lat_long_grid': True,
             'show_anomaly_heatmap': True,
+            'generate_geoparquet': False,
             
             # Default LOGGING settings
             'suppress_warnings': True,
@@ -1210,7 +1257,7 @@ def haversine_distance_nm(lat1, lon1, lat2, lon2):
         if (pd.isna(lat1) or pd.isna(lon1) or pd.isna(lat2) or pd.isna(lon2)):
             return None
             
-        return great_circle((lat1, lon1), (lat2, lon2)).nm
+        return haversine(lat1, lon1, lat2, lon2)
     except Exception as e:
         logger.warning(f"Error calculating haversine distance: {e}")
         return None
@@ -1221,6 +1268,10 @@ def haversine_vectorized(df, use_gpu=None):
     Vectorized implementation of the Haversine formula with GPU support when available.
     Supports NVIDIA CUDA (with cudf), AMD ROCm (with cupy-rocm), and AMD HIP (with PyHIP).
     
+    Batches smaller than geo_kernels.GPU_MIN_SIZE always run on the CPU through
+    geo_kernels.haversine, since a host-device transfer costs more than the
+    arithmetic for them.
+    
     Args:
         df (DataFrame): DataFrame containing LAT1, LON1, LAT2, LON2 columns
         use_gpu (bool, optional): Whether to use GPU acceleration. If None, uses GPU_AVAILABLE.
@@ -1228,101 +1279,40 @@ def haversine_vectorized(df, use_gpu=None):
     Returns:
         Series: Distances in nautical miles
     """
-    # Earth radius in nautical miles
-    r = 3440.1
-    
     # Determine if we should use GPU
     # If use_gpu is explicitly False, don't use GPU even if available
     # If use_gpu is None, use GPU if available
-    # Can use cupy (CUDA/ROCm) or HIP directly
-    should_use_gpu = (use_gpu is not False) and GPU_AVAILABLE and (cp is not None or hip is not None)
+    # Can use cupy (CUDA/ROCm); HIP without cupy computes on the CPU
+    should_use_gpu = ((use_gpu is not False) and GPU_AVAILABLE and cp is not None
+                      and len(df) >= GPU_MIN_SIZE)
     
-    # Check if GPU is available and we can use it
     if should_use_gpu:
-        # For NVIDIA: check if this is a cuDF DataFrame
         if GPU_TYPE == 'NVIDIA' and cudf is not None and isinstance(df, cudf.DataFrame):
             # Use cuDF with cupy (CUDA)
-            lat1_rad = cp.radians(df['LAT1'].values)
-            lon1_rad = cp.radians(df['LON1'].values)
-            lat2_rad = cp.radians(df['LAT2'].values)
-            lon2_rad = cp.radians(df['LON2'].values)
-        elif GPU_TYPE == 'AMD' and cp is not None:
-            # For AMD ROCm/HIP via cupy-rocm, use cupy with pandas DataFrame
-            # Convert pandas DataFrame columns to cupy arrays
-            lat1_rad = cp.radians(cp.asarray(df['LAT1'].values))
-            lon1_rad = cp.radians(cp.asarray(df['LON1'].values))
-            lat2_rad = cp.radians(cp.asarray(df['LAT2'].values))
-            lon2_rad = cp.radians(cp.asarray(df['LON2'].values))
-        elif GPU_TYPE == 'AMD' and hip is not None and cp is None:
-            # Direct HIP support (PyHIP) - use numpy arrays and convert
-            # Note: HIP is lower-level, so we'll use numpy for computation
-            # In practice, cupy-rocm is preferred for HIP access
-            lat1_rad = np.radians(df['LAT1'].values)
-            lon1_rad = np.radians(df['LON1'].values)
-            lat2_rad = np.radians(df['LAT2'].values)
-            lon2_rad = np.radians(df['LON2'].values)
-            # For now, fall back to CPU computation with HIP detected
-            # Future: could add direct HIP kernel calls if needed
-        elif GPU_TYPE == 'NVIDIA' and (cudf is None or not isinstance(df, cudf.DataFrame)) and cp is not None:
-            # NVIDIA without cudf, use cupy with pandas DataFrame
-            lat1_rad = cp.radians(cp.asarray(df['LAT1'].values))
-            lon1_rad = cp.radians(cp.asarray(df['LON1'].values))
-            lat2_rad = cp.radians(cp.asarray(df['LAT2'].values))
-            lon2_rad = cp.radians(cp.asarray(df['LON2'].values))
+            lat1_rad, lon1_rad, lat2_rad, lon2_rad = (cp.radians(df[col].values)
+                                                      for col in ('LAT1', 'LON1', 'LAT2', 'LON2'))
         else:
-            # Fall back to CPU
-            lat1_rad = np.radians(df['LAT1'])
-            lon1_rad = np.radians(df['LON1'])
-            lat2_rad = np.radians(df['LAT2'])
-            lon2_rad = np.radians(df['LON2'])
-            
-            dlat = lat2_rad - lat1_rad
-            dlon = lon2_rad - lon1_rad
-            
-            a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
-            c = 2 * np.arcsin(np.sqrt(a))
-            
-            # Return as pandas Series to match expected return type
-            return pd.Series(c * r, index=df.index)
+            # pandas DataFrame on NVIDIA CUDA or AMD ROCm (cupy-rocm)
+            lat1_rad, lon1_rad, lat2_rad, lon2_rad = (cp.radians(cp.asarray(df[col].values, dtype=cp.float64))
+                                                      for col in ('LAT1', 'LON1', 'LAT2', 'LON2'))
         
         # Haversine formula with cupy (works for both CUDA and ROCm/HIP)
-        if cp is not None:
-            dlat = lat2_rad - lat1_rad
-            dlon = lon2_rad - lon1_rad
-            
-            a = cp.sin(dlat/2)**2 + cp.cos(lat1_rad) * cp.cos(lat2_rad) * cp.sin(dlon/2)**2
-            c = 2 * cp.arcsin(cp.sqrt(a))
-            
-            # Convert back to numpy array for return
-            result = cp.asnumpy(c * r)
-            return pd.Series(result, index=df.index)
-        else:
-            # HIP detected but no cupy - fall back to CPU computation
-            # (HIP is lower-level and would require custom kernels)
-            dlat = lat2_rad - lat1_rad
-            dlon = lon2_rad - lon1_rad
-            
-            a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
-            c = 2 * np.arcsin(np.sqrt(a))
-            
-            # Return as pandas Series to match expected return type
-            return pd.Series(c * r, index=df.index)
-    else:
-        # CPU implementation with numpy
-        lat1_rad = np.radians(df['LAT1'])
-        lon1_rad = np.radians(df['LON1'])
-        lat2_rad = np.radians(df['LAT2'])
-        lon2_rad = np.radians(df['LON2'])
-        
-        # Haversine formula
         dlat = lat2_rad - lat1_rad
         dlon = lon2_rad - lon1_rad
+        a = cp.sin(dlat/2)**2 + cp.cos(lat1_rad) * cp.cos(lat2_rad) * cp.sin(dlon/2)**2
+        c = 2 * cp.arcsin(cp.sqrt(cp.minimum(a, 1.0)))
         
-        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
-        
-        # Return as pandas Series to match expected return type
-        return pd.Series(c * r, index=df.index)
+        # Convert back to numpy array for return
+        return pd.Series(cp.asnumpy(c * EARTH_RADIUS_NM), index=df.index)
+    
+    # CPU implementation (float64 math even when positions are stored as float32)
+    distances = haversine(df['LAT1'].to_numpy(dtype=np.float64, na_value=np.nan),
+                          df['LON1'].to_numpy(dtype=np.float64, na_value=np.nan),
+                          df['LAT2'].to_numpy(dtype=np.float64, na_value=np.nan),
+                          df['LON2'].to_numpy(dtype=np.float64, na_value=np.nan))
+    
+    # Return as pandas Series to match expected return type
+    return pd.Series(distances, index=df.index)
 
 
 # def get_cache_dir():
@@ -1349,14 +1339,14 @@ def haversine_vectorized(df, use_gpu=None):
 #     return cache_dir
 
 
-# Function generate_cache_key is now imported from utils.py
-# See top of file for import statement
-
-
 def check_cached_data(file_path, config):
     """
     Check if data for a file path is already cached.
     
+    Cached days are keyed by the source day and a fingerprint of the
+    preprocessing settings (see day_cache.py), so any run whose range includes
+    the day reuses the entry regardless of the range that created it.
+    
     Args:
         file_path (str): Path to the data file to check
         config (dict): Configuration dictionary
@@ -1369,62 +1359,21 @@ def check_cached_data(file_path, config):
         logger.debug("Cache disabled by configuration")
         return None, None
     
-    # Get the base cache directory
-    base_cache_dir = get_cache_dir()
-    if not base_cache_dir:
-        return None, None
-    
-    # Create date-specific subfolder path if dates are available
-    start_date = config.get('START_DATE', '')
-    end_date = config.get('END_DATE', '')
-    
-    if start_date and end_date:
-        # Format the dates for folder name (YYYYMMDD-YYYYMMDD)
-        try:
-            start_fmt = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y%m%d')
-            end_fmt = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y%m%d')
-            date_subfolder = f"{start_fmt}-{end_fmt}"
-            
-            # Create subfolder for the date range
-            cache_dir = os.path.join(base_cache_dir, date_subfolder)
-            if not os.path.exists(cache_dir):
-                try:
-                    os.makedirs(cache_dir, exist_ok=True)
-                    logger.info(f"Created cache subfolder: {cache_dir}")
-                except Exception as e:
-                    logger.warning(f"Failed to create cache subfolder: {e}")
-                    cache_dir = base_cache_dir  # Fall back to base directory
-        except Exception as e:
-            logger.warning(f"Error formatting dates for cache subfolder: {e}")
-            cache_dir = base_cache_dir
-    else:
-        cache_dir = base_cache_dir
-    
-    cache_key = generate_cache_key(file_path, config)
-    cache_path = os.path.join(cache_dir, f"{cache_key}.parquet")
-    
-    # Check if the cache file exists
-    if os.path.exists(cache_path):
-        try:
-            logger.info(f"CACHE: Using cached data for {os.path.basename(file_path)}")
-            if config.get('USE_DASK', True):
-                df = dd.read_parquet(cache_path).compute()
-            else:
-                df = pd.read_parquet(cache_path)
-            return df, cache_path
-        except Exception as e:
-            logger.warning(f"Failed to load cached data: {e}")
-    
-    return None, cache_path
+    df, cache_path = load_cached_day(file_path, config)
+    if df is not None:
+        logger.info(f"CACHE: Using cached data for {os.path.basename(file_path)}")
+    return df, cache_path
 
 
-def save_to_cache(df, cache_path):
+def save_to_cache(df, cache_path, file_path=None, hot=False):
     """
     Save processed data to cache.
     
     Args:
         df (DataFrame): The processed DataFrame to cache
         cache_path (str): Path where the cached data should be saved
+        file_path (str, optional): Source file the data was loaded from
+        hot (bool, optional): Also write the memory-mapped hot cache copy
     
     Returns:
         bool: True if successful, False otherwise
@@ -1432,22 +1381,10 @@ def save_to_cache(df, cache_path):
     if df is None or df.empty or cache_path is None:
         return False
     
-    try:
-        # Create a temporary file then rename to avoid partial writes
-        temp_path = cache_path + ".tmp"
-        df.to_parquet(temp_path, index=False)
-        shutil.move(temp_path, cache_path)
+    if save_cached_day(df, cache_path, file_path or '', hot=hot):
         logger.info(f"CACHE: Data saved to cache: {os.path.basename(cache_path)}")
         return True
-    except Exception as e:
-        logger.warning(f"Failed to save data to cache: {e}")
-        # Clean up temp file if it exists
-        if os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except:
-                pass
-        return False
+    return False
 
 
 def load_and_preprocess_day(file_path, config, use_dask=True):
@@ -1471,6 +1408,10 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
         logger.info(f"Loading data from {file_path}")
         file_ext = os.path.splitext(file_path)[1].lower()
         
+        # Build the column projection and row filters pushed down into the reader
+        read_plan = plan_for_file(file_path, config)
+        logger.info(f"Read plan: {read_plan.describe()}")
+        
         # Try using GPU first if enabled (only for NVIDIA with cudf)
         # AMD ROCm doesn't have cudf, so we'll use CPU/Dask for loading but GPU for computations
         if config.get('USE_GPU', False) and GPU_AVAILABLE and GPU_TYPE == 'NVIDIA' and cudf is not None:
@@ -1479,7 +1420,7 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
                 if file_ext == '.csv':
                     df = cudf.read_csv(file_path, dtype={'MMSI': 'float64'})
                 elif file_ext == '.parquet':
-                    df = cudf.read_parquet(file_path)
+                    df = cudf.read_parquet(file_path, **read_plan.reader_kwargs())
                 else:
                     logger.error(f"Unsupported file extension: {file_ext}")
                     return None
@@ -1497,7 +1438,7 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
                 if file_ext == '.csv':
                     df = dd.read_csv(file_path, dtype={'MMSI': 'float64'})
                 elif file_ext == '.parquet':
-                    df = dd.read_parquet(file_path)
+                    df = dd.read_parquet(file_path, **read_plan.reader_kwargs())
                 else:
                     logger.error(f"Unsupported file extension: {file_ext}")
                     return None
@@ -1513,10 +1454,17 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
             if file_ext == '.csv':
                 df = pd.read_csv(file_path, dtype={'MMSI': 'float64'})
             elif file_ext == '.parquet':
-                df = pd.read_parquet(file_path)
+                try:
+                    df = pd.read_parquet(file_path, **read_plan.reader_kwargs())
+                except Exception as e:
+                    logger.warning(f"Error reading parquet with pushdown filters: {e}. Reading full file.")
+                    df = pd.read_parquet(file_path)
             else:
                 logger.error(f"Unsupported file extension: {file_ext}")
                 return None
+        
+        # Apply the same filters in memory for readers without pushdown (CSV, fallbacks)
+        df = read_plan.apply(df)
                 
         # Check for required columns
         missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
@@ -1524,12 +1472,18 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
             logger.error(f"Missing required columns: {missing_columns}")
             return None
             
-        # Convert BaseDateTime to datetime
+        # Apply the canonical compact schema (uint32 MMSI, float32 kinematics,
+        # categorical strings, native timestamps) once, at ingest
         try:
-            df['BaseDateTime'] = pd.to_datetime(df['BaseDateTime'])
+            df = conform_dataframe(df)
         except Exception as e:
-            logger.error(f"Error converting BaseDateTime: {e}")
+            logger.error(f"Error applying AIS schema: {e}")
             return None
+        invalid_times = df['BaseDateTime'].isna()
+        if invalid_times.any():
+            logger.warning(f"Removing {invalid_times.sum()} rows with invalid BaseDateTime")
+            df = df[~invalid_times]
+        logger.info(f"Loaded {len(df)} records ({memory_usage_mb(df):.1f} MB in memory)")
             
         # Filter by ship type if specified
         selected_types = config.get('SELECTED_SHIP_TYPES', [])
@@ -1597,9 +1551,13 @@ def load_and_preprocess_day(file_path, config, use_dask=True):
         if 'SOG' in df.columns:
             df = df[df['SOG'] <= speed_threshold]
         
+        # Deduplicate and order the day the way cache partitions store it,
+        # so cached and uncached runs see the same rows
+        df = normalize_partition(df)
+        
         # Save successfully loaded data to cache before returning
         if not df.empty and cache_path:
-            save_to_cache(df, cache_path)
+            save_to_cache(df, cache_path, file_path, hot=config.get('HOT_CACHE', False))
             
         # Return the DataFrame (empty or not)
         return df
@@ -2087,17 +2045,24 @@ def create_summary_charts(anomalies_df, output_dir, config=None):
         logger.error(f"Error creating summary charts: {e}")
 
 
-def save_concatenated_dataframe(all_daily_data, config):
+def save_concatenated_dataframe(all_daily_data, config, source_files=None):
     """
-    Save the concatenated all_daily_data dataframe to the cache directory for future use.
-    If a previous concatenated file exists, it will merge with it to include all data.
+    Make sure every analysed day is available in the per-day cache for future use.
+    
+    The preprocessing fingerprint directory (see day_cache.py) is an
+    append-only dataset partitioned by date. Days already cached by
+    load_and_preprocess_day are kept as they are; only partitions for missing
+    days are added, so the cost depends on the run, not on the history.
     
     Args:
         all_daily_data (dict): Dictionary with date keys and DataFrame values for each day's data
         config (dict): Configuration parameters
-        
+        source_files (dict, optional): Dictionary with the same date keys and the
+            source file each day was loaded from, so new partitions are
+            invalidated when that file changes
+    
     Returns:
-        str: Path to the saved concatenated dataframe file
+        str: Path to the day cache directory holding the data
     """
     try:
         # Get the base cache directory
@@ -2106,71 +2071,32 @@ def save_concatenated_dataframe(all_daily_data, config):
             logger.error("Cannot determine cache directory")
             return None
             
-        # Create a consolidated dataframe from all daily data
         if not all_daily_data:
             logger.warning("No daily data to consolidate")
             return None
-            
-        consolidated_df = pd.concat(all_daily_data.values())
-        logger.info(f"Created consolidated dataframe with {len(consolidated_df)} records")
-        
-        # Determine if we should use a date-specific subfolder
-        start_date = config.get('START_DATE', '')
-        end_date = config.get('END_DATE', '')
         
-        if start_date and end_date:
-            try:
-                # Format dates for folder name
-                start_fmt = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y%m%d')
-                end_fmt = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y%m%d')
-                date_subfolder = f"{start_fmt}-{end_fmt}"
-                logger.info(f"Date subfolder: {date_subfolder}")
-
-                # Use the date subfolder
-                cache_dir = os.path.join(base_cache_dir, date_subfolder)
-                if not os.path.exists(cache_dir):
-                    os.makedirs(cache_dir, exist_ok=True)
-            except Exception as e:
-                logger.warning(f"Error creating date subfolder: {e}, using base cache directory")
-                cache_dir = base_cache_dir
-        else:
-            cache_dir = base_cache_dir
-        
-        # Define the filename for the consolidated dataframe
-        consolidated_filename = "consolidated_data.parquet"
-        consolidated_path = os.path.join(cache_dir, consolidated_filename)
-        
-        # Check if a previous consolidated file exists and merge with it
-        if os.path.exists(consolidated_path):
-            try:
-                logger.info(f"Previous consolidated file found, merging with new data")
-                previous_df = pd.read_parquet(consolidated_path)
-                
-                # Merge based on unique MMSI and timestamp combinations to avoid duplicates
-                # First ensure all timestamps are in datetime format
-                if 'BaseDateTime' in previous_df.columns:
-                    previous_df['BaseDateTime'] = pd.to_datetime(previous_df['BaseDateTime'])
-                if 'BaseDateTime' in consolidated_df.columns:
-                    consolidated_df['BaseDateTime'] = pd.to_datetime(consolidated_df['BaseDateTime'])
-                
-                # Concatenate the dataframes
-                merged_df = pd.concat([previous_df, consolidated_df])
-                
-                # Remove duplicate rows based on MMSI and BaseDateTime
-                if 'MMSI' in merged_df.columns and 'BaseDateTime' in merged_df.columns:
-                    merged_df = merged_df.drop_duplicates(subset=['MMSI', 'BaseDateTime'])
-                    logger.info(f"Merged with previous data, now have {len(merged_df)} records (removed duplicates)")
-                    consolidated_df = merged_df
-                else:
-                    logger.warning("Cannot deduplicate - missing MMSI or BaseDateTime columns")
-            except Exception as e:
-                logger.warning(f"Error merging with previous consolidated data: {e}")
+        cache_dir = fingerprint_dir(config, base_cache_dir, create=True)
+        written = 0
+        total_records = 0
+        for day, df in sorted(all_daily_data.items()):
+            if df is None or df.empty:
+                continue
+            total_records += len(df)
+            day_str = day.strftime('%Y-%m-%d') if hasattr(day, 'strftime') else str(day)
+            day_path = os.path.join(cache_dir, f"{day_str}.parquet")
+            if os.path.exists(day_path):
+                # The end-of-run dataset also goes to the hot tier when enabled
+                if config.get('HOT_CACHE', False) and not os.path.exists(hot_cache_path(day_path)):
+                    write_hot_day(df, day_path)
+                continue
+            source_file = (source_files or {}).get(day) or ''
+            if save_cached_day(df, day_path, source_file, hot=config.get('HOT_CACHE', False)):
+                written += 1
         
-        # Save the consolidated dataframe
-        consolidated_df.to_parquet(consolidated_path, index=False)
-        logger.info(f"Saved consolidated dataframe with {len(consolidated_df)} records to {consolidated_path}")
+        logger.info(f"Day cache holds {len(all_daily_data)} analysed days ({total_records} records, "
+                    f"{written} newly written) in {cache_dir}")
         
-        return consolidated_path
+        return cache_dir
         
     except Exception as e:
         logger.error(f"Error saving consolidated dataframe: {e}")
@@ -2336,11 +2262,11 @@ def generate_analysis_statistics(all_daily_data, selected_dates, config, output_
                         daily_df.to_excel(writer, sheet_name=sheet_name, index=False)
                     
                     # Add AIS Anomalies Summary data
-                    summary_path = os.path.join(output_dir, "AIS_Anomalies_Summary.csv")
-                    if os.path.exists(summary_path):
+                    summary_path = find_anomaly_summary(output_dir)
+                    if summary_path is not None:
                         try:
-                            # Read the summary CSV file
-                            summary_df = pd.read_csv(summary_path)
+                            # Read the summary file (typed parquet preferred)
+                            summary_df = read_anomaly_summary(summary_path)
                             
                             # Add full summary as a worksheet
                             summary_df.to_excel(writer, sheet_name='All Anomalies', index=False)
@@ -2427,11 +2353,11 @@ def generate_analysis_statistics(all_daily_data, selected_dates, config, output_
                             daily_df.to_excel(writer, sheet_name=sheet_name, index=False)
                         logger.info(f"Added 'Nulls {date_str}' worksheet to Excel file")
                         # Add AIS Anomalies Summary data
-                        summary_path = os.path.join(output_dir, "AIS_Anomalies_Summary.csv")
-                        if os.path.exists(summary_path):
+                        summary_path = find_anomaly_summary(output_dir)
+                        if summary_path is not None:
                             try:
-                                # Read the summary CSV file
-                                summary_df = pd.read_csv(summary_path)
+                                # Read the summary file (typed parquet preferred)
+                                summary_df = read_anomaly_summary(summary_path)
                                 
                                 # Add full summary as a worksheet
                                 summary_df.to_excel(writer, sheet_name='All Anomalies', index=False)
@@ -3001,6 +2927,304 @@ def create_vessel_path_maps(all_daily_data, selected_dates, config, output_dir):
     return maps_dir
 
 
+def _build_zone_index(config):
+    """
+    Index the restricted zones of a configuration (default zones if not specified).
+    
+    Args:
+        config (dict): Configuration dictionary
+    
+    Returns:
+        ZoneIndex or None: Indexed zones, None if zone violation checks are disabled
+    """
+    zone_index = None
+    if config.get('zone_violations', True):
+        restricted_zones = config.get('RESTRICTED_ZONES', None)
+        if restricted_zones is None:
+            # Default restricted zones
+            restricted_zones = [
+                {'name': 'Strait of Hormuz', 'lat_min': 25.0, 'lat_max': 27.0, 'lon_min': 55.0, 'lon_max': 57.5},
+                {'name': 'South China Sea', 'lat_min': 5.0, 'lat_max': 25.0, 'lon_min': 105.0, 'lon_max': 120.0},
+            ]
+        zone_index = ZoneIndex(restricted_zones)
+    return zone_index
+
+
+def _select_reported_anomalies(all_anomalies_df, config):
+    """
+    Anomalies of the enabled types that pass the ANALYSIS_FILTERS settings.
+    
+    Args:
+        all_anomalies_df (DataFrame): Assembled anomaly records
+        config (dict): Configuration dictionary
+    
+    Returns:
+        DataFrame: Anomalies to report
+    """
+    # Filter anomalies by selected anomaly types
+    if 'AnomalyType' in all_anomalies_df.columns:
+        # Map AnomalyType values to config keys
+        anomaly_type_mapping = {
+            'AIS_Beacon_Off': 'ais_beacon_off',
+            'AIS_Beacon_On': 'ais_beacon_on',
+            'Speed': 'excessive_travel_distance_fast',  # Speed anomalies are fast travel
+            'Slow_Travel': 'excessive_travel_distance_slow',
+            'Course': 'cog-heading_inconsistency',
+            'Loitering': 'loitering',
+            'Rendezvous': 'rendezvous',
+            'Identity_Spoofing': 'identity_spoofing',
+            'Zone_Violation': 'zone_violations'
+        }
+        
+        # Build list of enabled anomaly types
+        enabled_anomaly_types = []
+        for anomaly_type, config_key in anomaly_type_mapping.items():
+            # Check if this anomaly type is enabled in config
+            if config.get(config_key, True):  # Default to True if not specified
+                enabled_anomaly_types.append(anomaly_type)
+        
+        # Filter to only include enabled anomaly types
+        if enabled_anomaly_types:
+            original_count = len(all_anomalies_df)
+            all_anomalies_df = all_anomalies_df[all_anomalies_df['AnomalyType'].isin(enabled_anomaly_types)]
+            all_anomalies_df = all_anomalies_df.assign(
+                AnomalyType=all_anomalies_df['AnomalyType'].cat.remove_unused_categories())
+            filtered_count = len(all_anomalies_df)
+            logger.info(f"Filtered anomalies by type: {filtered_count} of {original_count} anomalies retained (enabled types: {', '.join(enabled_anomaly_types)})")
+        else:
+            logger.warning("No anomaly types are enabled. All anomalies will be filtered out.")
+            all_anomalies_df = pd.DataFrame()  # Return empty DataFrame
+    
+    # Apply filters based on ANALYSIS_FILTERS settings
+    logger.info("Applying analysis filters to detected anomalies")
+    all_anomalies_df = filter_anomalies_by_settings(all_anomalies_df, config)
+    
+    return all_anomalies_df
+
+
+def _detect_day_anomalies(df_current_day, current_date, last_previous, previous_date, last_seen,
+                          loitering_carried, config, zone_index):
+    """
+    Run every enabled detector on one day against the state of the day before.
+    
+    Args:
+        df_current_day (DataFrame): Current day of AIS reports
+        current_date (date): Current day
+        last_previous (DataFrame): Last report of each vessel on the previous day
+        previous_date (date): Previous day
+        last_seen (DataFrame): Last report of every vessel seen before the
+            current day, in MMSI order (VesselState.vessels)
+        loitering_carried (DataFrame): Earlier positions for the loitering
+            windows (loitering_carry of the previous day, or the tail returned
+            for it)
+        config (dict): Configuration dictionary
+        zone_index (ZoneIndex): Indexed restricted zones (None if zone checks are off)
+    
+    Returns:
+        tuple: (list of anomaly DataFrames, daily track lengths or None,
+            loitering positions to carry into the next day or None)
+    """
+    anomalies = []
+    report_date = current_date.strftime('%Y-%m-%d')
+    
+    # 1. AIS Beacon on/off anomalies (sudden appearance/disappearance)
+    logger.info("Detecting AIS beacon on/off anomalies...")
+    beacon_anomalies = []
+    
+    # Set threshold for beacon anomalies (in hours, convert to minutes)
+    beacon_time_threshold = config.get('BEACON_TIME_THRESHOLD_HOURS', 6) * 60  # Convert hours to minutes
+    
+    # First report of every vessel on the current day; the beacon detectors
+    # join these against each vessel's last report on any earlier day
+    first_current, _ = first_last_positions(df_current_day)
+    
+    # Every segment between consecutive reports of a vessel, measured once
+    # and shared by the speed, travel distance and spoofing checks
+    segments = None
+    if (config.get('excessive_travel_distance_fast', True) or config.get('excessive_travel_distance_slow', True)
+            or config.get('identity_spoofing', True)):
+        segments = track_segments(df_current_day)
+    
+    # Distance each vessel travelled today, kept for the travel report
+    track_lengths = None
+    if config.get('excessive_travel_distance_fast', True) or config.get('excessive_travel_distance_slow', True):
+        track_lengths = daily_track_lengths(df_current_day, config.get('SPEED_THRESHOLD', 102), segments)
+    
+    # Vessels reporting again after a gap since their last known report (beacon on)
+    if config.get('ais_beacon_on', True):  # Check if this anomaly type is enabled
+        beacon_anomalies.append(detect_beacon_on(
+            first_current, last_seen, current_date, report_date, beacon_time_threshold))
+    
+    # Known vessels silent for the threshold by the end of the current day (beacon off)
+    if config.get('ais_beacon_off', True):  # Check if this anomaly type is enabled
+        beacon_anomalies.append(detect_beacon_off(
+            last_seen, first_current['MMSI'], previous_date, current_date, report_date,
+            beacon_time_threshold))
+    
+    beacon_anomalies = [frame for frame in beacon_anomalies if not frame.empty]
+    if beacon_anomalies:
+        anomalies.extend(beacon_anomalies)
+        logger.info(f"Found {sum(len(frame) for frame in beacon_anomalies)} AIS beacon anomalies.")
+    
+    # 2. Position jumps (Speed anomalies)
+    # Check if speed anomalies are enabled
+    if config.get('excessive_travel_distance_fast', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting speed anomalies (position jumps)...")
+        
+        # Join each vessel's last position of the previous day with its first
+        # position of the current day and compute every distance in one call
+        # (pass USE_GPU config setting)
+        speed_anomalies = detect_position_jumps(
+            last_previous, first_current, current_date, report_date,
+            config.get('TIME_DIFF_THRESHOLD_MIN', 240),  # Default 4 hours
+            config.get('SPEED_THRESHOLD', 102),
+            lambda distance_df: haversine_vectorized(distance_df, use_gpu=config.get('USE_GPU', GPU_AVAILABLE)))
+        
+        if not speed_anomalies.empty:
+            anomalies.append(speed_anomalies)
+            logger.info(f"Found {len(speed_anomalies)} speed anomalies.")
+        
+        # Jumps between consecutive reports within the current day, with
+        # runs of fast segments merged into single events
+        speed_events = detect_speed_events(
+            df_current_day, current_date, report_date,
+            config.get('TIME_DIFF_THRESHOLD_MIN', 240),
+            config.get('SPEED_THRESHOLD', 102), segments)
+        
+        if not speed_events.empty:
+            anomalies.append(speed_events)
+            logger.info(f"Found {len(speed_events)} intra-day speed anomalies.")
+        
+        # Vessels whose daily track is longer than plausible
+        travel_fast = detect_excessive_travel_fast(
+            first_current, track_lengths, current_date, report_date,
+            config.get('MAX_TRAVEL_NM', 550))
+        
+        if not travel_fast.empty:
+            anomalies.append(travel_fast)
+            logger.info(f"Found {len(travel_fast)} excessive travel distance (fast) anomalies.")
+    
+    # Slow travel (daily track shorter than expected)
+    if config.get('excessive_travel_distance_slow', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting short daily tracks...")
+        
+        travel_slow = detect_excessive_travel_slow(
+            first_current, track_lengths, current_date, report_date,
+            config.get('MIN_TRAVEL_NM', 200))
+        
+        if not travel_slow.empty:
+            anomalies.append(travel_slow)
+            logger.info(f"Found {len(travel_slow)} excessive travel distance (slow) anomalies.")
+    
+    # 2. Course vs. Heading anomalies
+    # Check if course anomalies are enabled
+    if config.get('cog-heading_inconsistency', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting course vs. heading anomalies...")
+        
+        # One pass over the whole day: rows with sufficient speed and valid
+        # COG and Heading whose difference exceeds the threshold
+        course_anomalies = detect_course_heading_mismatch(
+            df_current_day, current_date, report_date,
+            config.get('MIN_SPEED_FOR_COG_CHECK', 10),
+            config.get('COG_HEADING_MAX_DIFF', 45))
+        
+        if not course_anomalies.empty:
+            anomalies.append(course_anomalies)
+            logger.info(f"Found {len(course_anomalies)} course anomalies.")
+    
+    # 3. Loitering detection
+    if config.get('loitering', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting loitering vessels...")
+        
+        # Get thresholds from config
+        loitering_radius_nm = config.get('LOITERING_RADIUS_NM', 5.0)  # Default 5 nautical miles
+        loitering_duration_hours = config.get('LOITERING_DURATION_HOURS', 24.0)  # Default 24 hours
+        
+        # Rolling windows reach back across midnight through the positions
+        # carried over from earlier days
+        loitering_anomalies, loitering_carried = detect_loitering(
+            df_current_day, loitering_carried, current_date, report_date,
+            loitering_radius_nm, loitering_duration_hours)
+        
+        if not loitering_anomalies.empty:
+            anomalies.append(loitering_anomalies)
+            logger.info(f"Found {len(loitering_anomalies)} loitering anomalies.")
+    
+    # 4. Rendezvous detection
+    if config.get('rendezvous', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting vessel rendezvous...")
+        
+        # Get thresholds from config
+        rendezvous_proximity_nm = config.get('RENDEZVOUS_PROXIMITY_NM', 0.5)  # Default 0.5 nautical miles
+        rendezvous_duration_minutes = config.get('RENDEZVOUS_DURATION_MINUTES', 30)  # Default 30 minutes
+        
+        # Time-aligned positions joined through a spatial grid, so only
+        # nearby vessel pairs are measured
+        rendezvous_anomalies = detect_rendezvous(
+            df_current_day, current_date, report_date,
+            rendezvous_proximity_nm, rendezvous_duration_minutes)
+        
+        if not rendezvous_anomalies.empty:
+            anomalies.append(rendezvous_anomalies)
+            logger.info(f"Found {len(rendezvous_anomalies)} rendezvous anomalies.")
+    
+    # 5. Identity Spoofing detection
+    if config.get('identity_spoofing', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting identity spoofing...")
+        
+        # Identity fields that change within one MMSI, and the same MMSI
+        # reported from places no ship could travel between in time
+        spoofing_anomalies = detect_identity_spoofing(
+            df_current_day, current_date, report_date,
+            config.get('SPEED_THRESHOLD', 102), segments=segments)
+        
+        if not spoofing_anomalies.empty:
+            anomalies.append(spoofing_anomalies)
+            logger.info(f"Found {len(spoofing_anomalies)} identity spoofing anomalies.")
+    
+    # 6. Zone Violations detection
+    if config.get('zone_violations', True):  # Check if this anomaly type is enabled
+        logger.info("Detecting zone violations...")
+        
+        # One indexed pass assigns every position to its zones; each visit
+        # becomes a record with its enter/exit/dwell details
+        zone_violation_anomalies = detect_zone_violations(
+            df_current_day, last_previous, zone_index, current_date, report_date)
+        
+        if not zone_violation_anomalies.empty:
+            anomalies.append(zone_violation_anomalies)
+            logger.info(f"Found {len(zone_violation_anomalies)} zone violation anomalies.")
+    
+    return anomalies, track_lengths, loitering_carried
+
+
+def _detect_day_pair(df_current_day, df_previous_day, current_date, previous_date, last_seen,
+                     loitering_carried, config, zone_index):
+    """
+    Run every enabled detector on one (previous day, current day) pair.
+    
+    Takes the previous day's frame rather than its last reports, so a worker
+    process of DayPairPool can run it from the two shared day frames alone.
+    
+    Args:
+        df_current_day (DataFrame): Current day of AIS reports
+        df_previous_day (DataFrame): Previous day of AIS reports
+        current_date (date): Current day
+        previous_date (date): Previous day
+        last_seen (DataFrame): Last report of every vessel seen before the
+            current day, in MMSI order (VesselState.vessels)
+        loitering_carried (DataFrame): Earlier positions for the loitering windows
+        config (dict): Configuration dictionary
+        zone_index (ZoneIndex): Indexed restricted zones (None if zone checks are off)
+    
+    Returns:
+        tuple: The result of _detect_day_anomalies
+    """
+    _, last_previous = first_last_positions(df_previous_day)
+    return _detect_day_anomalies(df_current_day, current_date, last_previous, previous_date, last_seen,
+                                 loitering_carried, config, zone_index)
+
+
 def _process_anomaly_detection(file_paths, dates_in_order, config, use_dask=True):
     """
     Internal function that handles the actual anomaly detection process.
@@ -3015,8 +3239,9 @@ def _process_anomaly_detection(file_paths, dates_in_order, config, use_dask=True
         DataFrame: Detected anomalies
     """
     
-    # Store each day's data for later statistics and path mapping
+    # Store each day's data and source file for later statistics and path mapping
     all_daily_data = {}
+    daily_source_files = {}
     
     if not file_paths or len(file_paths) <= 1:
         logger.error("Not enough valid daily files found for comparison. Need at least 2 days.")
@@ -3025,541 +3250,134 @@ def _process_anomaly_detection(file_paths, dates_in_order, config, use_dask=True
     # Process files day by day for comparisons
     df_previous_day = None
     processed_first_day = False
-    all_anomalies = []
-    
-    for i in range(len(file_paths)):
-        current_file_path = file_paths[i]
-        current_date = dates_in_order[i]
-        logger.info(f"Processing data for: {current_date.strftime('%Y-%m-%d')} ({current_file_path})")
-        
-        df_current_day = load_and_preprocess_day(current_file_path, config, use_dask)
-        
-        # Check if DataFrame is None or empty
-        if df_current_day is None or df_current_day.empty:
-            if df_current_day is None:
-                logger.warning(f"Skipping {current_file_path} due to loading errors (returned None).")
-            else:
-                logger.warning(f"Skipping {current_file_path} - DataFrame is empty after filtering.")
-            
-            # Reset previous day if current fails
-            df_previous_day = None
-            continue
-            
-        # Store the daily data for later analysis
-        all_daily_data[current_date] = df_current_day
-        
-        if not processed_first_day:
-            df_previous_day = df_current_day
-            processed_first_day = True
-            logger.info(f"Loaded initial day: {current_date.strftime('%Y-%m-%d')}. No comparisons possible yet.")
-            continue  # Skip to the next day for comparisons
-        
-        # --- ANOMALY DETECTION ---
-        anomalies = []
-        report_date = current_date.strftime('%Y-%m-%d')
-        
-        # Group data by MMSI for analysis (move this up from below)
-        prev_grouped = df_previous_day.groupby('MMSI')
-        current_grouped = df_current_day.groupby('MMSI')
-        
-        # 1. AIS Beacon on/off anomalies (sudden appearance/disappearance)
-        logger.info("Detecting AIS beacon on/off anomalies...")
-        beacon_anomalies = []
-        
-        # Set threshold for beacon anomalies (in hours, convert to minutes)
-        beacon_time_threshold = config.get('BEACON_TIME_THRESHOLD_HOURS', 6) * 60  # Convert hours to minutes
-        
-        # Find vessels that appeared in current day but not in previous day (beacon on)
-        if config.get('ais_beacon_on', True):  # Check if this anomaly type is enabled
-            # For beacon on, we need to check if this vessel has been absent for at least 6 hours
-            # This requires looking at all previous days, not just the last one
-            # For now, we'll implement a basic version that just checks between consecutive days
-            beacon_on_mmsi = set(df_current_day['MMSI'].unique()) - set(df_previous_day['MMSI'].unique())
-            logger.info(f"Found {len(beacon_on_mmsi)} potential vessels with AIS beacon on")
-            
-            # Vessels that meet the 6-hour threshold
-            confirmed_beacon_on = []
-            
-            for mmsi in beacon_on_mmsi:
-                # Get the vessel's first appearance in the current day
-                vessel_curr = current_grouped.get_group(mmsi).copy()
-                vessel_curr = vessel_curr.sort_values('BaseDateTime')
-                
-                if len(vessel_curr) > 0:
-                    first_appearance = vessel_curr.iloc[0]['BaseDateTime']
-                    
-                    # Check if the first appearance is at least 6 hours after the start of the current day
-                    # This is a simplification - ideally we'd check against the last known position
-                    day_start = pd.Timestamp(current_date).replace(hour=0, minute=0, second=0)
-                    time_since_day_start = (first_appearance - day_start).total_seconds() / 60  # in minutes
-                    
-                    # If the vessel appears more than 6 hours after the day start, or
-                    # if it's the first record of the day, count it as a beacon on
-                    if time_since_day_start >= beacon_time_threshold:
-                        first_pos = vessel_curr.iloc[0]
-                        anomaly_record = first_pos.copy()
-                        anomaly_record['AnomalyType'] = 'AIS_Beacon_On'
-                        anomaly_record['SpeedAnomaly'] = False
-                        anomaly_record['PositionAnomaly'] = True
-                        anomaly_record['CourseAnomaly'] = False
-                        anomaly_record['BeaconAnomaly'] = True
-                        anomaly_record['BeaconGapMinutes'] = time_since_day_start
-                        anomaly_record['Date'] = current_date
-                        anomaly_record['ReportDate'] = report_date
-                        
-                        beacon_anomalies.append(anomaly_record)
-                        confirmed_beacon_on.append(mmsi)
-            
-            logger.info(f"Confirmed {len(confirmed_beacon_on)} vessels with AIS beacon on (gap >= {beacon_time_threshold/60:.1f} hours)")
-        
-        # Find vessels that disappeared in current day but were in previous day (beacon off)
-        if config.get('ais_beacon_off', True):  # Check if this anomaly type is enabled
-            beacon_off_mmsi = set(df_previous_day['MMSI'].unique()) - set(df_current_day['MMSI'].unique())
-            logger.info(f"Found {len(beacon_off_mmsi)} potential vessels with AIS beacon off")
-            
-            # Vessels that meet the 6-hour threshold
-            confirmed_beacon_off = []
-            
-            for mmsi in beacon_off_mmsi:
-                # Get the vessel's last appearance in the previous day
-                vessel_prev = prev_grouped.get_group(mmsi).copy()
-                vessel_prev = vessel_prev.sort_values('BaseDateTime')
-                
-                if len(vessel_prev) > 0:
-                    last_appearance = vessel_prev.iloc[-1]['BaseDateTime']
-                    
-                    # Check if the last appearance is at least 6 hours before the end of the previous day
-                    day_end = pd.Timestamp(dates_in_order[i-1]).replace(hour=23, minute=59, second=59)
-                    time_to_day_end = (day_end - last_appearance).total_seconds() / 60  # in minutes
-                    
-                    # If the vessel disappears more than 6 hours before the day end, count it as a beacon off
-                    if time_to_day_end >= beacon_time_threshold:
-                        last_pos = vessel_prev.iloc[-1]
-                        anomaly_record = last_pos.copy()
-                        anomaly_record['AnomalyType'] = 'AIS_Beacon_Off'
-                        anomaly_record['SpeedAnomaly'] = False
-                        anomaly_record['PositionAnomaly'] = True
-                        anomaly_record['CourseAnomaly'] = False
-                        anomaly_record['BeaconAnomaly'] = True
-                        anomaly_record['BeaconGapMinutes'] = time_to_day_end
-                        anomaly_record['Date'] = current_date
-                        anomaly_record['ReportDate'] = report_date
-                        
-                        beacon_anomalies.append(anomaly_record)
-                        confirmed_beacon_off.append(mmsi)
-            
-            logger.info(f"Confirmed {len(confirmed_beacon_off)} vessels with AIS beacon off (gap >= {beacon_time_threshold/60:.1f} hours)")
-        
-        if beacon_anomalies:
-            # Convert Series objects to dictionaries for consistent DataFrame creation
-            beacon_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in beacon_anomalies]
-            beacon_anomalies_df = pd.DataFrame(beacon_anomalies_dicts)
-            anomalies.extend(beacon_anomalies_dicts)
-            logger.info(f"Found {len(beacon_anomalies)} AIS beacon anomalies.")
-        
-        # 2. Position jumps (Speed anomalies)
-        speed_anomalies = []
-        
-        # Check if speed anomalies are enabled
-        if config.get('excessive_travel_distance_fast', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting speed anomalies (position jumps)...")
-            
-            # Look for common vessels between days
-            common_mmsi = set(df_previous_day['MMSI'].unique()) & set(df_current_day['MMSI'].unique())
-            
-            for mmsi in common_mmsi:
-                # Get the vessel data for previous and current day
-                vessel_prev = prev_grouped.get_group(mmsi).copy()
-                vessel_curr = current_grouped.get_group(mmsi).copy()
-                
-                # Get the last position from previous day and first position from current day
-                vessel_prev = vessel_prev.sort_values('BaseDateTime')
-                vessel_curr = vessel_curr.sort_values('BaseDateTime')
-                
-                if len(vessel_prev) == 0 or len(vessel_curr) == 0:
-                    continue
-                    
-                last_pos_prev = vessel_prev.iloc[-1]
-                first_pos_curr = vessel_curr.iloc[0]
-                
-                # Calculate time difference in minutes
-                time_diff = (first_pos_curr['BaseDateTime'] - last_pos_prev['BaseDateTime']).total_seconds() / 60
-                
-                # Skip if positions are too far apart in time (e.g., data gaps)
-                time_threshold = config.get('TIME_DIFF_THRESHOLD_MIN', 240)  # Default 4 hours
-                if time_diff > time_threshold:
-                    continue
-                    
-                # Calculate distance between points (using vectorized function)
-                # Create a DataFrame for vectorized haversine calculation
-                distance_df = pd.DataFrame({
-                    'LAT1': [last_pos_prev['LAT']],
-                    'LON1': [last_pos_prev['LON']],
-                    'LAT2': [first_pos_curr['LAT']],
-                    'LON2': [first_pos_curr['LON']]
-                })
-                
-                # Use vectorized haversine function (pass USE_GPU config setting)
-                dist_result = haversine_vectorized(distance_df, use_gpu=config.get('USE_GPU', GPU_AVAILABLE))
-                if dist_result.empty or pd.isna(dist_result.iloc[0]):
-                    continue
-                dist_nm = dist_result.iloc[0]
-                    
-                # Calculate implied speed
-                implied_speed = dist_nm / (time_diff / 60)  # Convert minutes to hours for knots
-                
-                # Check if the implied speed exceeds our threshold
-                if implied_speed > config.get('SPEED_THRESHOLD', 102):
-                    # This is an anomaly - position jump detected
-                    anomaly_record = first_pos_curr.copy()
-                    anomaly_record['AnomalyType'] = 'Speed'
-                    anomaly_record['SpeedAnomaly'] = True
-                    anomaly_record['PositionAnomaly'] = False
-                    anomaly_record['CourseAnomaly'] = False
-                    anomaly_record['Distance'] = dist_nm
-                    anomaly_record['TimeDiff'] = time_diff
-                    anomaly_record['ImpliedSpeed'] = implied_speed
-                    anomaly_record['Date'] = current_date
-                    anomaly_record['ReportDate'] = report_date
-                    
-                    speed_anomalies.append(anomaly_record)
-            
-            if speed_anomalies:
-                # Convert Series objects to dictionaries for consistent DataFrame creation
-                speed_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in speed_anomalies]
-                speed_anomalies_df = pd.DataFrame(speed_anomalies_dicts)
-                anomalies.extend(speed_anomalies_dicts)
-                logger.info(f"Found {len(speed_anomalies)} speed anomalies.")
-        
-        # 2. Course vs. Heading anomalies
-        course_anomalies = []
-        
-        # Check if course anomalies are enabled
-        if config.get('cog-heading_inconsistency', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting course vs. heading anomalies...")
-            
-            for _, vessel_data in current_grouped:
-                # Filter rows with sufficient speed and valid COG and Heading
-                min_speed = config.get('MIN_SPEED_FOR_COG_CHECK', 10)
-                valid_rows = vessel_data[
-                    (vessel_data['SOG'] >= min_speed) &
-                    vessel_data['COG'].notna() &
-                    vessel_data['Heading'].notna()
-                ]
-                
-                if len(valid_rows) == 0:
-                    continue
-                    
-                # Calculate the difference between COG and Heading
-                valid_rows['CourseHeadingDiff'] = valid_rows.apply(
-                    lambda row: normalize_angle_difference(row['COG'] - row['Heading']),
-                    axis=1
-                )
-                
-                # Identify potential anomalies where the difference exceeds the threshold
-                max_diff = config.get('COG_HEADING_MAX_DIFF', 45)
-                anomalous_rows = valid_rows[abs(valid_rows['CourseHeadingDiff']) > max_diff]
-                
-                if not anomalous_rows.empty:
-                    # Mark these as course anomalies (vectorized)
-                    # Create a copy of the anomalous rows and add the required columns
-                    anomaly_records = anomalous_rows.copy()
-                    anomaly_records['AnomalyType'] = 'Course'
-                    anomaly_records['SpeedAnomaly'] = False
-                    anomaly_records['PositionAnomaly'] = False
-                    anomaly_records['CourseAnomaly'] = True
-                    anomaly_records['Date'] = current_date
-                    anomaly_records['ReportDate'] = report_date
-                    
-                    # Convert to list of dictionaries for compatibility with existing code
-                    course_anomalies.extend(anomaly_records.to_dict('records'))
-            
-            if course_anomalies:
-                course_anomalies_df = pd.DataFrame(course_anomalies)
-                anomalies.extend(course_anomalies)
-                logger.info(f"Found {len(course_anomalies)} course anomalies.")
-        
-        # 3. Loitering detection
-        if config.get('loitering', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting loitering vessels...")
-            loitering_anomalies = []
+    anomaly_builder = AnomalyBuilder()
+    daily_travel = []
+    loitering_carried = None
+    
+    # Per-vessel state after each day, saved at the end so later days can be
+    # analysed incrementally
+    vessel_state = VesselState()
+    loitering_duration_hours = config.get('LOITERING_DURATION_HOURS', 24.0)
+    
+    # Index the restricted zones once for the whole run
+    zone_index = _build_zone_index(config)
+    
+    # Decode and preprocess upcoming days in the background while the current
+    # day pair is analysed. A depth of 0 loads each day inline.
+    stage_timer = StageTimer()
+    prefetcher = DayPrefetcher(
+        file_paths,
+        lambda file_path: load_and_preprocess_day(file_path, config, use_dask),
+        depth=config.get('PREFETCH_DEPTH', DEFAULT_PREFETCH_DEPTH),
+        timer=stage_timer
+    )
+    
+    # With WORKERS > 1 each day pair is detected on a worker process; this
+    # loop keeps the state chained from day to day and merges the results
+    # in date order
+    pair_pool = None
+    if config.get('WORKERS', 1) > 1:
+        try:
+            pair_pool = DayPairPool(config['WORKERS'], _detect_day_pair, config,
+                                    setup_func=_build_zone_index, timer=stage_timer)
+        except Exception as e:
+            logger.warning(f"Parallel day-pair detection unavailable ({e}); detecting day pairs serially")
+    
+    def collect_day(day, day_anomalies, track_lengths):
+        """Add one day's detector output to the run's results."""
+        day_start_count = len(anomaly_builder)
+        report_date = day.strftime('%Y-%m-%d')
+        for frame in day_anomalies:
+            anomaly_builder.add(frame)
+        if track_lengths is not None:
+            daily_travel.append(track_lengths.reset_index().assign(Date=day, ReportDate=report_date))
+        logger.info(f"Total anomalies detected for {report_date}: {len(anomaly_builder) - day_start_count}")
+    
+    # The thread pool, worker processes and shared files are released even
+    # when a day fails
+    try:
+        for i in range(len(file_paths)):
+            current_file_path = file_paths[i]
+            current_date = dates_in_order[i]
+            logger.info(f"Processing data for: {current_date.strftime('%Y-%m-%d')} ({current_file_path})")
             
-            # Get thresholds from config
-            loitering_radius_nm = config.get('LOITERING_RADIUS_NM', 5.0)  # Default 5 nautical miles
-            loitering_duration_hours = config.get('LOITERING_DURATION_HOURS', 24.0)  # Default 24 hours
+            df_current_day = prefetcher.get(i)
             
-            for mmsi, vessel_data in current_grouped:
-                if len(vessel_data) < 10:  # Need at least 10 records
-                    continue
-                
-                # Sort by time
-                vessel_data = vessel_data.sort_values('BaseDateTime').copy()
-                
-                # Calculate time span in hours
-                time_span = (vessel_data['BaseDateTime'].max() - vessel_data['BaseDateTime'].min()).total_seconds() / 3600
-                
-                if time_span < loitering_duration_hours:
-                    continue
-                
-                # Calculate center point
-                center_lat = vessel_data['LAT'].mean()
-                center_lon = vessel_data['LON'].mean()
+            # Check if DataFrame is None or empty
+            if df_current_day is None or df_current_day.empty:
+                if df_current_day is None:
+                    logger.warning(f"Skipping {current_file_path} due to loading errors (returned None).")
+                else:
+                    logger.warning(f"Skipping {current_file_path} - DataFrame is empty after filtering.")
                 
-                # Calculate maximum distance from center for all positions
-                max_dist = 0
-                for _, row in vessel_data.iterrows():
-                    if pd.notna(row['LAT']) and pd.notna(row['LON']):
-                        # Use haversine_vectorized for distance calculation
-                        distance_df = pd.DataFrame({
-                            'LAT1': [center_lat],
-                            'LON1': [center_lon],
-                            'LAT2': [row['LAT']],
-                            'LON2': [row['LON']]
-                        })
-                        dist_result = haversine_vectorized(distance_df, use_gpu=config.get('USE_GPU', GPU_AVAILABLE))
-                        if not dist_result.empty and pd.notna(dist_result.iloc[0]):
-                            dist_nm = dist_result.iloc[0]
-                            max_dist = max(max_dist, dist_nm)
+                # Reset previous day if current fails
+                df_previous_day = None
+                loitering_carried = None
+                continue
                 
-                # If all positions are within the radius, it's loitering
-                if max_dist < loitering_radius_nm:
-                    # Use the first position as the anomaly record
-                    anomaly_record = vessel_data.iloc[0].copy()
-                    anomaly_record['AnomalyType'] = 'Loitering'
-                    anomaly_record['SpeedAnomaly'] = False
-                    anomaly_record['PositionAnomaly'] = True
-                    anomaly_record['CourseAnomaly'] = False
-                    anomaly_record['LoiteringRadiusNM'] = max_dist
-                    anomaly_record['LoiteringDurationHours'] = time_span
-                    anomaly_record['LoiteringRecordCount'] = len(vessel_data)
-                    anomaly_record['Date'] = current_date
-                    anomaly_record['ReportDate'] = report_date
-                    
-                    loitering_anomalies.append(anomaly_record)
+            # Store the daily data for later analysis
+            all_daily_data[current_date] = df_current_day
+            daily_source_files[current_date] = current_file_path
             
-            if loitering_anomalies:
-                loitering_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in loitering_anomalies]
-                anomalies.extend(loitering_anomalies_dicts)
-                logger.info(f"Found {len(loitering_anomalies)} loitering anomalies.")
-        
-        # 4. Rendezvous detection
-        if config.get('rendezvous', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting vessel rendezvous...")
-            rendezvous_anomalies = []
+            # A day after a failed one has nothing to be compared with either
+            if not processed_first_day or df_previous_day is None:
+                df_previous_day = df_current_day
+                processed_first_day = True
+                vessel_state.update(df_current_day, current_date, None, loitering_duration_hours, zone_index)
+                logger.info(f"Loaded initial day: {current_date.strftime('%Y-%m-%d')}. No comparisons possible yet.")
+                continue  # Skip to the next day for comparisons
             
-            # Get thresholds from config
-            rendezvous_proximity_nm = config.get('RENDEZVOUS_PROXIMITY_NM', 0.5)  # Default 0.5 nautical miles
-            rendezvous_duration_minutes = config.get('RENDEZVOUS_DURATION_MINUTES', 30)  # Default 30 minutes
+            # --- ANOMALY DETECTION ---
+            detect_start = time.perf_counter()
             
-            # Group data by time windows (e.g., 1-hour windows)
-            df_current_day_sorted = df_current_day.sort_values('BaseDateTime').copy()
+            # The positions the loitering windows reach back into
+            if loitering_carried is None and config.get('loitering', True):
+                loitering_carried = loitering_carry(
+                    df_previous_day, pd.Timestamp(current_date) - pd.Timedelta(hours=loitering_duration_hours))
             
-            # Create time windows (1-hour bins) - convert datetime to numeric for binning
-            if len(df_current_day_sorted) > 0:
-                # Use hour of day as the time window
-                df_current_day_sorted['TimeWindow'] = df_current_day_sorted['BaseDateTime'].dt.hour
+            if pair_pool is None:
+                day_anomalies, track_lengths, loitering_carried = _detect_day_pair(
+                    df_current_day, df_previous_day, current_date, dates_in_order[i-1], vessel_state.vessels,
+                    loitering_carried, config, zone_index)
+                collect_day(current_date, day_anomalies, track_lengths)
             else:
-                df_current_day_sorted['TimeWindow'] = []
-            
-            # Process each time window
-            for window_id, window_group in df_current_day_sorted.groupby('TimeWindow'):
-                if len(window_group) < 2:
-                    continue
-                
-                # Group by MMSI within this time window
-                window_vessels = window_group.groupby('MMSI')
-                if len(window_vessels) < 2:
-                    continue
-                
-                # Calculate average position for each vessel in this window
-                vessel_positions = {}
-                for mmsi, vessel_group in window_vessels:
-                    if len(vessel_group) >= 3:  # Need at least 3 records
-                        avg_lat = vessel_group['LAT'].mean()
-                        avg_lon = vessel_group['LON'].mean()
-                        if pd.notna(avg_lat) and pd.notna(avg_lon):
-                            vessel_positions[mmsi] = (avg_lat, avg_lon, len(vessel_group))
-                
-                # Check all pairs of vessels in this window
-                vessel_list = list(vessel_positions.keys())
-                for i in range(len(vessel_list)):
-                    for j in range(i + 1, len(vessel_list)):
-                        mmsi1, mmsi2 = vessel_list[i], vessel_list[j]
-                        lat1, lon1, count1 = vessel_positions[mmsi1]
-                        lat2, lon2, count2 = vessel_positions[mmsi2]
-                        
-                        # Calculate distance between vessels
-                        distance_df = pd.DataFrame({
-                            'LAT1': [lat1],
-                            'LON1': [lon1],
-                            'LAT2': [lat2],
-                            'LON2': [lon2]
-                        })
-                        dist_result = haversine_vectorized(distance_df, use_gpu=config.get('USE_GPU', GPU_AVAILABLE))
-                        if dist_result.empty or pd.isna(dist_result.iloc[0]):
-                            continue
-                        distance_nm = dist_result.iloc[0]
-                        
-                        # Check if vessels are close enough
-                        if distance_nm < rendezvous_proximity_nm:
-                            # Get the first record from vessel 1 as the anomaly record
-                            vessel1_records = window_group[window_group['MMSI'] == mmsi1]
-                            if len(vessel1_records) > 0:
-                                anomaly_record = vessel1_records.iloc[0].copy()
-                                anomaly_record['AnomalyType'] = 'Rendezvous'
-                                anomaly_record['SpeedAnomaly'] = False
-                                anomaly_record['PositionAnomaly'] = True
-                                anomaly_record['CourseAnomaly'] = False
-                                anomaly_record['RendezvousMMSI2'] = mmsi2
-                                anomaly_record['RendezvousDistanceNM'] = distance_nm
-                                anomaly_record['RendezvousLat'] = (lat1 + lat2) / 2
-                                anomaly_record['RendezvousLon'] = (lon1 + lon2) / 2
-                                anomaly_record['Date'] = current_date
-                                anomaly_record['ReportDate'] = report_date
-                                
-                                rendezvous_anomalies.append(anomaly_record)
+                pair_pool.submit(df_current_day, df_previous_day, current_date, dates_in_order[i-1],
+                                 vessel_state.vessels, loitering_carried)
+                # The worker's carried positions would arrive too late for the next
+                # day, so they are worked out here
+                if config.get('loitering', True):
+                    loitering_carried = loitering_tail(df_current_day, loitering_carried, current_date,
+                                                       loitering_duration_hours)
+                for day, (day_anomalies, track_lengths, _) in pair_pool.ready():
+                    collect_day(day, day_anomalies, track_lengths)
             
-            if rendezvous_anomalies:
-                rendezvous_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in rendezvous_anomalies]
-                anomalies.extend(rendezvous_anomalies_dicts)
-                logger.info(f"Found {len(rendezvous_anomalies)} rendezvous anomalies.")
-        
-        # 5. Identity Spoofing detection
-        if config.get('identity_spoofing', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting identity spoofing...")
-            spoofing_anomalies = []
-            
-            # Check for multiple vessel names for same MMSI
-            if 'VesselName' in df_current_day.columns:
-                for mmsi, vessel_data in current_grouped:
-                    unique_names = vessel_data['VesselName'].dropna().unique()
-                    if len(unique_names) > 1:
-                        # Multiple names for same MMSI - potential spoofing
-                        anomaly_record = vessel_data.iloc[0].copy()
-                        anomaly_record['AnomalyType'] = 'Identity_Spoofing'
-                        anomaly_record['SpeedAnomaly'] = False
-                        anomaly_record['PositionAnomaly'] = False
-                        anomaly_record['CourseAnomaly'] = False
-                        anomaly_record['SpoofingIssue'] = 'multiple_vessel_names'
-                        anomaly_record['NameCount'] = len(unique_names)
-                        anomaly_record['VesselNames'] = ', '.join(unique_names[:5].tolist())  # First 5 names
-                        anomaly_record['Date'] = current_date
-                        anomaly_record['ReportDate'] = report_date
-                        
-                        spoofing_anomalies.append(anomaly_record)
-            
-            # Check for impossible speeds (already detected in speed anomalies, but flag as spoofing too)
-            # This is handled by the speed anomaly detection above, so we'll skip duplicate detection here
-            
-            if spoofing_anomalies:
-                spoofing_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in spoofing_anomalies]
-                anomalies.extend(spoofing_anomalies_dicts)
-                logger.info(f"Found {len(spoofing_anomalies)} identity spoofing anomalies.")
-        
-        # 6. Zone Violations detection
-        if config.get('zone_violations', True):  # Check if this anomaly type is enabled
-            logger.info("Detecting zone violations...")
-            zone_violation_anomalies = []
-            
-            # Get restricted zones from config (default zones if not specified)
-            restricted_zones = config.get('RESTRICTED_ZONES', None)
-            if restricted_zones is None:
-                # Default restricted zones
-                restricted_zones = [
-                    {'name': 'Strait of Hormuz', 'lat_min': 25.0, 'lat_max': 27.0, 'lon_min': 55.0, 'lon_max': 57.5},
-                    {'name': 'South China Sea', 'lat_min': 5.0, 'lat_max': 25.0, 'lon_min': 105.0, 'lon_max': 120.0},
-                ]
-            
-            # Check each zone
-            for zone in restricted_zones:
-                zone_name = zone.get('name', 'Unknown Zone')
-                lat_min = zone.get('lat_min', -90)
-                lat_max = zone.get('lat_max', 90)
-                lon_min = zone.get('lon_min', -180)
-                lon_max = zone.get('lon_max', 180)
-                
-                # Find vessels in this zone
-                in_zone = df_current_day[
-                    (df_current_day['LAT'] >= lat_min) & 
-                    (df_current_day['LAT'] <= lat_max) & 
-                    (df_current_day['LON'] >= lon_min) & 
-                    (df_current_day['LON'] <= lon_max)
-                ]
-                
-                if len(in_zone) > 0:
-                    # Get unique vessels in this zone
-                    unique_vessels = in_zone['MMSI'].unique()
-                    
-                    # Create an anomaly record for each unique vessel
-                    for mmsi in unique_vessels:
-                        vessel_in_zone = in_zone[in_zone['MMSI'] == mmsi]
-                        if len(vessel_in_zone) > 0:
-                            anomaly_record = vessel_in_zone.iloc[0].copy()
-                            anomaly_record['AnomalyType'] = 'Zone_Violation'
-                            anomaly_record['SpeedAnomaly'] = False
-                            anomaly_record['PositionAnomaly'] = True
-                            anomaly_record['CourseAnomaly'] = False
-                            anomaly_record['ZoneName'] = zone_name
-                            anomaly_record['ZoneLatMin'] = lat_min
-                            anomaly_record['ZoneLatMax'] = lat_max
-                            anomaly_record['ZoneLonMin'] = lon_min
-                            anomaly_record['ZoneLonMax'] = lon_max
-                            anomaly_record['Date'] = current_date
-                            anomaly_record['ReportDate'] = report_date
-                            
-                            zone_violation_anomalies.append(anomaly_record)
+            # Update previous day reference for next iteration
+            df_previous_day = df_current_day
+            vessel_state.update(df_current_day, current_date, loitering_carried, loitering_duration_hours, zone_index)
             
-            if zone_violation_anomalies:
-                zone_violation_anomalies_dicts = [record.to_dict() if isinstance(record, pd.Series) else record for record in zone_violation_anomalies]
-                anomalies.extend(zone_violation_anomalies_dicts)
-                logger.info(f"Found {len(zone_violation_anomalies)} zone violation anomalies.")
+            stage_timer.add('detect', time.perf_counter() - detect_start)
         
-        # Update previous day reference for next iteration
-        df_previous_day = df_current_day
-        
-        # Add this day's anomalies to the overall list
-        all_anomalies.extend(anomalies)
-        logger.info(f"Total anomalies detected for {report_date}: {len(anomalies)}")
+        if pair_pool is not None:
+            for day, (day_anomalies, track_lengths, _) in pair_pool.drain():
+                collect_day(day, day_anomalies, track_lengths)
+    finally:
+        prefetcher.close()
+        if pair_pool is not None:
+            pair_pool.close()
+    logger.info(f"Pipeline stage timings: {stage_timer.report()}")
+    
+    try:
+        vessel_state.save(vessel_state_dir(config))
+    except Exception as e:
+        logger.error(f"Error saving vessel state: {e}")
     
     # Process all anomalies
-    if all_anomalies:
-        # Create DataFrame from all detected anomalies
-        all_anomalies_df = pd.DataFrame(all_anomalies)
-        
-        # Filter anomalies by selected anomaly types
-        if 'AnomalyType' in all_anomalies_df.columns:
-            # Map AnomalyType values to config keys
-            anomaly_type_mapping = {
-                'AIS_Beacon_Off': 'ais_beacon_off',
-                'AIS_Beacon_On': 'ais_beacon_on',
-                'Speed': 'excessive_travel_distance_fast',  # Speed anomalies are fast travel
-                'Course': 'cog-heading_inconsistency',
-                'Loitering': 'loitering',
-                'Rendezvous': 'rendezvous',
-                'Identity_Spoofing': 'identity_spoofing',
-                'Zone_Violation': 'zone_violations'
-            }
-            
-            # Build list of enabled anomaly types
-            enabled_anomaly_types = []
-            for anomaly_type, config_key in anomaly_type_mapping.items():
-                # Check if this anomaly type is enabled in config
-                if config.get(config_key, True):  # Default to True if not specified
-                    enabled_anomaly_types.append(anomaly_type)
-            
-            # Filter to only include enabled anomaly types
-            if enabled_anomaly_types:
-                original_count = len(all_anomalies_df)
-                all_anomalies_df = all_anomalies_df[all_anomalies_df['AnomalyType'].isin(enabled_anomaly_types)]
-                filtered_count = len(all_anomalies_df)
-                logger.info(f"Filtered anomalies by type: {filtered_count} of {original_count} anomalies retained (enabled types: {', '.join(enabled_anomaly_types)})")
-            else:
-                logger.warning("No anomaly types are enabled. All anomalies will be filtered out.")
-                all_anomalies_df = pd.DataFrame()  # Return empty DataFrame
+    if len(anomaly_builder):
+        # Assemble all detected anomalies into one typed DataFrame
+        all_anomalies_df = anomaly_builder.finalize()
         
-        # Apply filters based on ANALYSIS_FILTERS settings
-        logger.info("Applying analysis filters to detected anomalies")
-        all_anomalies_df = filter_anomalies_by_settings(all_anomalies_df, config)
+        # Keep the enabled anomaly types and apply the analysis filters
+        all_anomalies_df = _select_reported_anomalies(all_anomalies_df, config)
         
         # Create output directory if it doesn't exist
         # First, check if a normalized OUTPUT_DIRECTORY or output_directory key exists
@@ -3693,6 +3511,26 @@ def _process_anomaly_detection(file_paths, dates_in_order, config, use_dask=True
             all_anomalies_df.to_csv(summary_path, index=False)
             logger.info(f"Debug: Successfully saved CSV to: {summary_path}")
             
+            # Typed copy sorted by MMSI, preferred by the analysis loaders; a
+            # summary from an earlier run must not outlive a failed write
+            parquet_path = os.path.join(config['OUTPUT_DIRECTORY'], SUMMARY_PARQUET)
+            try:
+                if not write_anomaly_parquet(all_anomalies_df, parquet_path,
+                                             geometry=config.get('generate_geoparquet', False)):
+                    if os.path.exists(parquet_path):
+                        os.remove(parquet_path)
+            except Exception as e:
+                logger.error(f"Error saving parquet anomaly summary: {e}")
+                if os.path.exists(parquet_path):
+                    os.remove(parquet_path)
+            
+            # Daily track length of every vessel, for reports that need more
+            # than the flagged vessels
+            if daily_travel:
+                travel_path = os.path.join(config['OUTPUT_DIRECTORY'], "AIS_Daily_Travel.csv")
+                pd.concat(daily_travel, ignore_index=True).to_csv(travel_path, index=False)
+                logger.info(f"Saved daily travel distances to: {travel_path}")
+            
             # Calculate global boundaries for all maps
             calculate_global_boundaries(all_anomalies_df)
         except Exception as e:
@@ -3789,19 +3627,28 @@ def _process_anomaly_detection(file_paths, dates_in_order, config, use_dask=True
         # Save the consolidated dataframe for future use
         try:
             logger.info("Saving consolidated dataframe for future analysis...")
-            consolidated_path = save_concatenated_dataframe(all_daily_data, config)
+            consolidated_path = save_concatenated_dataframe(all_daily_data, config, daily_source_files)
             if consolidated_path:
                 logger.info(f"Consolidated dataframe saved to: {consolidated_path}")
             else:
                 logger.warning("Failed to save consolidated dataframe")
         except Exception as e:
             logger.error(f"Error while saving consolidated dataframe: {e}")
-            
-        logger.info(f"AIS Fraud Detection Complete. Found {len(all_anomalies)} anomalies across {len(dates_in_order)} days.")
-        return all_anomalies_df
+        
+        logger.info(f"AIS Fraud Detection Complete. Found {len(anomaly_builder)} anomalies across {len(dates_in_order)} days.")
     else:
         logger.info(f"AIS Fraud Detection Complete. No anomalies detected.")
-        return pd.DataFrame()
+        all_anomalies_df = pd.DataFrame()
+    
+    # Keep the cache within its byte budget after every run; the days just
+    # used are evicted last
+    if not config.get('DISABLE_CACHE', False):
+        try:
+            enforce_cache_budget(config)
+        except Exception as e:
+            logger.error(f"Error while enforcing the cache budget: {e}")
+    
+    return all_anomalies_df
 
 
 def get_config_key_case_insensitive(config, key):
@@ -3919,43 +3766,24 @@ def filter_anomalies_by_settings(anomalies_df, config):
     return filtered_df
 
 
-def detect_shipping_anomalies_by_date_range(start_date, end_date, config_input='config.ini', use_dask=True):
+def _resolve_data_directory(config):
     """
-    Main function to orchestrate the loading, processing, and anomaly detection using date range.
+    Data directory of a run, local or S3.
+    
+    S3 is used when USE_S3 is set and the URI and AWS credentials are valid;
+    otherwise the local DATA_DIRECTORY is used when there is one.
     
     Args:
-        start_date (date or str): Start date for analysis
-        end_date (date or str): End date for analysis
-        config_input (str or dict): Path to configuration file or configuration dictionary
-        use_dask (bool): Whether to use Dask for large data processing
-        
+        config (dict): Configuration dictionary (USE_S3 is cleared on fallback)
+    
     Returns:
-        DataFrame: Detected anomalies
+        str or None: Data directory or S3 URI, None if no usable source is configured
     """
-    # Parse date strings if provided
-    if isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-    if isinstance(end_date, str):
-        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-    
-    # Load configuration
-    if isinstance(config_input, dict):
-        config = config_input
-    else:
-        config = load_config(config_input)
-    
-    # Store the start and end dates in the config dictionary
-    # Convert dates to string format for consistent handling
-    config['START_DATE'] = start_date.strftime('%Y-%m-%d')
-    config['END_DATE'] = end_date.strftime('%Y-%m-%d')
-    logger.info(f"Set date range in config: {config['START_DATE']} to {config['END_DATE']}")
-    
-    # Get the data directory (local or S3)
     data_dir_key = get_config_key_case_insensitive(config, 'data_directory')
     
     if data_dir_key is None:
         logger.error("No data_directory key found in configuration")
-        return pd.DataFrame()
+        return None
     
     if config.get('USE_S3', False):
         data_dir = config.get('S3_DATA_URI', '')
@@ -3970,7 +3798,7 @@ def detect_shipping_anomalies_by_date_range(start_date, end_date, config_input='
                 config['USE_S3'] = False
             else:
                 logger.error("No valid data directory found in config")
-                return pd.DataFrame()
+                return None
         else:
             # Test if AWS credentials work properly
             logger.info(f"Using S3 data from: {data_dir}")
@@ -3983,10 +3811,49 @@ def detect_shipping_anomalies_by_date_range(start_date, end_date, config_input='
                     config['USE_S3'] = False
                 else:
                     logger.error("No valid local data directory found as fallback")
-                    return pd.DataFrame()
+                    return None
     else:
         data_dir = config[data_dir_key]
     
+    return data_dir
+
+
+def detect_shipping_anomalies_by_date_range(start_date, end_date, config_input='config.ini', use_dask=True):
+    """
+    Main function to orchestrate the loading, processing, and anomaly detection using date range.
+    
+    Args:
+        start_date (date or str): Start date for analysis
+        end_date (date or str): End date for analysis
+        config_input (str or dict): Path to configuration file or configuration dictionary
+        use_dask (bool): Whether to use Dask for large data processing
+        
+    Returns:
+        DataFrame: Detected anomalies
+    """
+    # Parse date strings if provided
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    
+    # Load configuration
+    if isinstance(config_input, dict):
+        config = config_input
+    else:
+        config = load_config(config_input)
+    
+    # Store the start and end dates in the config dictionary
+    # Convert dates to string format for consistent handling
+    config['START_DATE'] = start_date.strftime('%Y-%m-%d')
+    config['END_DATE'] = end_date.strftime('%Y-%m-%d')
+    logger.info(f"Set date range in config: {config['START_DATE']} to {config['END_DATE']}")
+    
+    # Get the data directory (local or S3)
+    data_dir = _resolve_data_directory(config)
+    if data_dir is None:
+        return pd.DataFrame()
+    
     # Find files for the date range
     file_paths, dates_in_order = get_files_for_date_range(data_dir, start_date, end_date, config)
     
@@ -3997,6 +3864,99 @@ def detect_shipping_anomalies_by_date_range(start_date, end_date, config_input='
     return _process_anomaly_detection(file_paths, dates_in_order, config, use_dask)
 
 
+def detect_shipping_anomalies_incremental(day, config_input='config.ini', use_dask=True):
+    """
+    Analyse one new day against the saved per-vessel state.
+    
+    Only the new day is loaded. Cross-day checks compare it with the state left
+    by the last day analysed (see vessel_state), by this function or at the end
+    of a full run. The day's anomalies are appended to the anomaly summary and
+    its track lengths to AIS_Daily_Travel.csv in the output directory, and the
+    state moves on to the day. Without saved state the day only seeds the
+    state, like the first day of a full run. Maps, charts and statistics are
+    not regenerated, and max_anomalies_per_vessel applies to the day alone.
+    
+    Args:
+        day (date or str): Day to analyse
+        config_input (str or dict): Path to configuration file or configuration dictionary
+        use_dask (bool): Whether to use Dask for large data processing
+    
+    Returns:
+        DataFrame: The day's anomalies
+    """
+    if isinstance(day, str):
+        day = datetime.strptime(day, '%Y-%m-%d').date()
+    
+    if isinstance(config_input, dict):
+        config = config_input
+    else:
+        config = load_config(config_input)
+    report_date = day.strftime('%Y-%m-%d')
+    config['START_DATE'] = report_date
+    config['END_DATE'] = report_date
+    
+    state_dir = vessel_state_dir(config)
+    vessel_state = VesselState.load(state_dir)
+    if not vessel_state.empty and day <= vessel_state.last_date:
+        logger.error(f"Vessel state in {state_dir} already covers {vessel_state.last_date}; "
+                     f"run a full analysis to redo {report_date}")
+        return pd.DataFrame()
+    
+    data_dir = _resolve_data_directory(config)
+    if data_dir is None:
+        return pd.DataFrame()
+    file_paths, _ = get_files_for_date_range(data_dir, day, day, config)
+    if not file_paths:
+        logger.error(f"No data file found for {report_date}.")
+        return pd.DataFrame()
+    
+    df_current_day = load_and_preprocess_day(file_paths[0], config, use_dask)
+    if df_current_day is None or df_current_day.empty:
+        logger.error(f"No usable data for {report_date} ({file_paths[0]}).")
+        return pd.DataFrame()
+    
+    zone_index = _build_zone_index(config)
+    loitering_duration_hours = config.get('LOITERING_DURATION_HOURS', 24.0)
+    if vessel_state.empty:
+        vessel_state.update(df_current_day, day, None, loitering_duration_hours, zone_index)
+        vessel_state.save(state_dir)
+        logger.info(f"No vessel state in {state_dir}; {report_date} starts it. No comparisons possible yet.")
+        return pd.DataFrame()
+    
+    logger.info(f"Processing {report_date} against the vessel state as of {vessel_state.last_date}")
+    loitering_carried = vessel_state.loitering if config.get('loitering', True) else None
+    day_anomalies, track_lengths, loitering_carried = _detect_day_anomalies(
+        df_current_day, day, vessel_state.previous_day_last(), vessel_state.last_date, vessel_state.vessels,
+        loitering_carried, config, zone_index)
+    
+    anomaly_builder = AnomalyBuilder()
+    for frame in day_anomalies:
+        anomaly_builder.add(frame)
+    day_anomalies_df = anomaly_builder.finalize()
+    if not day_anomalies_df.empty:
+        day_anomalies_df = _select_reported_anomalies(day_anomalies_df, config)
+    
+    output_dir = config.get('OUTPUT_DIRECTORY', 'output')
+    os.makedirs(output_dir, exist_ok=True)
+    append_anomaly_summary(day_anomalies_df, output_dir, report_date,
+                           geometry=config.get('generate_geoparquet', False))
+    
+    if track_lengths is not None:
+        travel_path = os.path.join(output_dir, "AIS_Daily_Travel.csv")
+        travel = track_lengths.reset_index().assign(Date=day, ReportDate=report_date)
+        if os.path.exists(travel_path):
+            earlier = pd.read_csv(travel_path)
+            travel = pd.concat([earlier[earlier['ReportDate'] != report_date], travel], ignore_index=True)
+        travel.to_csv(travel_path, index=False)
+    
+    # Saved last, so a failed run leaves the state on the previous day
+    vessel_state.update(df_current_day, day, loitering_carried, loitering_duration_hours, zone_index)
+    vessel_state.save(state_dir)
+    
+    logger.info(f"AIS Fraud Detection Complete. Found {len(day_anomalies_df)} anomalies on {report_date}.")
+    return day_anomalies_df
+
+
 def test_aws_credentials(config):
     """
     Test if the AWS credentials in config are valid by making a simple API call
@@ -4158,6 +4118,33 @@ def check_aws_configuration(config):
         logger.info(f"  AWS environment variables found: {', '.join(env_vars_present)}")
 
 
+def run_cache_maintenance(config, show_stats=False, collect=False):
+    """
+    Report on and/or garbage collect the data cache.
+    
+    Args:
+        config (dict): Configuration parameters (CACHE_MAX_SIZE_GB sets the budget)
+        show_stats (bool, optional): Print cache statistics
+        collect (bool, optional): Evict outdated and least recently used entries
+        
+    Returns:
+        int: Exit code
+    """
+    try:
+        manager = CacheManager(max_bytes=cache_budget_bytes(config))
+        if collect:
+            result = manager.gc()
+            print(f"Evicted {len(result['removed'])} cache entries, freed {format_file_size(result['freed_bytes'])}; "
+                  f"cache now {format_file_size(result['total_bytes'])}")
+        if show_stats:
+            print(format_cache_stats(manager.stats()))
+        return 0
+    except Exception as e:
+        logger.error(f"Cache maintenance failed: {e}")
+        print(f"ERROR: Cache maintenance failed: {e}")
+        return 1
+
+
 def main():
     """
     Main entry point for the script.
@@ -4177,6 +4164,15 @@ def main():
     parser.add_argument('--output-directory', type=str, help='Directory to save analysis output files')
     parser.add_argument('--data-directory', type=str, help='Directory containing input data files')
     parser.add_argument('--disable-cache', action='store_true', help='Disable data caching')
+    parser.add_argument('--prefetch-depth', type=int, help='Number of days to load ahead of anomaly detection (0 disables prefetch)')
+    parser.add_argument('--workers', type=int, help='Number of processes detecting day pairs in parallel (1 detects them serially)')
+    parser.add_argument('--cache-stats', action='store_true', help='Print data cache size and usage statistics and exit')
+    parser.add_argument('--cache-gc', action='store_true', help='Evict outdated and least recently used cache entries down to the cache budget and exit')
+    parser.add_argument('--cache-max-gb', type=float, help='Data cache budget in GB (0 for no limit)')
+    parser.add_argument('--hot-cache', action='store_true', help='Keep memory-mapped Arrow copies of cached days for fast reloads')
+    parser.add_argument('--incremental', action='store_true', help='Analyse only --date against the saved vessel state and append its anomalies')
+    parser.add_argument('--date', type=str, help='Day to analyse with --incremental, in format YYYY-MM-DD')
+    parser.add_argument('--state-directory', type=str, help='Directory of the vessel state used by incremental runs (default: vessel_state in the output directory)')
     
     # Analysis filter options
     parser.add_argument('--min-latitude', type=float, help='Minimum latitude for geographic filtering')
@@ -4257,6 +4253,13 @@ def main():
         # Load configuration
         config = load_config(args.config)
         
+        if args.cache_max_gb is not None:
+            config['CACHE_MAX_SIZE_GB'] = args.cache_max_gb
+        
+        # Cache maintenance runs on its own, without an analysis
+        if args.cache_stats or args.cache_gc:
+            return run_cache_maintenance(config, show_stats=args.cache_stats, collect=args.cache_gc)
+        
         # Check AWS configuration for S3 access
         check_aws_configuration(config)
         
@@ -4373,12 +4376,25 @@ def main():
             config['USE_GPU'] = True
             logger.info("GPU processing forced via command line (may cause errors if GPU libraries not available)")
             
+        # Handle prefetch options
+        if args.prefetch_depth is not None:
+            config['PREFETCH_DEPTH'] = max(0, args.prefetch_depth)
+            logger.info(f"Prefetch depth set to: {config['PREFETCH_DEPTH']}")
+        
+        # Handle parallel detection options
+        if args.workers is not None:
+            config['WORKERS'] = max(1, args.workers)
+            logger.info(f"Day-pair detection workers set to: {config['WORKERS']}")
+            
         # Handle caching options
         if args.disable_cache:
             config['DISABLE_CACHE'] = True
             logger.info("Data caching disabled via command line")
         else:
             config['DISABLE_CACHE'] = False
+        if args.hot_cache:
+            config['HOT_CACHE'] = True
+            logger.info("Memory-mapped hot cache enabled via command line")
             
         # No more filter toggle processing
         
@@ -4531,6 +4547,19 @@ def main():
                 print(f"ERROR: Advanced analysis failed: {e}")
                 return 1
         
+        if args.state_directory:
+            config['STATE_DIRECTORY'] = os.path.normpath(args.state_directory)
+        
+        # Incremental run: one new day against the saved vessel state
+        if args.incremental:
+            if args.date is None:
+                logger.error("--incremental requires --date YYYY-MM-DD.")
+                return 1
+            logger.info(f"Running incremental fraud detection for {args.date}")
+            detect_shipping_anomalies_incremental(args.date, config, not args.no_dask)
+            logger.info("Incremental analysis completed. Exiting...")
+            return 0
+        
         # Run anomaly detection (only if dates provided)
         if args.start_date is None or args.end_date is None:
             logger.error("Start date and end date are required. Please provide them as command-line arguments or in the config file.")
@@ -42,22 +42,34 @@ except ImportError:
     # Logger not yet initialized, use print instead
     print("Warning: Advanced analysis module not available. Install required dependencies.")
 import requests
-import zipfile
 from urllib.parse import urljoin
 import concurrent.futures
 
+# Streaming ZIP to parquet conversion
+from ais_ingest import convert_zip_to_parquet
+from cache_manager import record_cache_entry, touch_cache_entry, MANIFEST_NAME
+from file_staging import stage_file, INDEPENDENT_STAGING_METHODS
+
+# Concurrent, resumable NOAA downloads
+from noaa_downloader import (NOAADownloader, DownloadJob, NOAA_BASE_URL,
+                             DEFAULT_DOWNLOAD_WORKERS, noaa_zip_filename, noaa_url_for_date)
+
 class DataManager:
     """Handles data download, processing, and management for various data sources"""
     
-    def __init__(self, logger, progress_callback=None):
+    def __init__(self, logger, progress_callback=None, base_url=None, download_workers=None):
         """Initialize the data manager
         
         Args:
             logger: Logger instance for recording messages
             progress_callback: Optional function to report progress
+            base_url: Optional NOAA base URL (may contain {year}); a local server can be used for testing
+            download_workers: Optional number of simultaneous downloads
         """
         self.logger = logger
         self.progress_callback = progress_callback
+        self.base_url = base_url or NOAA_BASE_URL
+        self.download_workers = download_workers or DEFAULT_DOWNLOAD_WORKERS
         self.base_temp_dir = None
         self.parquet_dir = None
         self._validate_dependencies()
@@ -109,14 +121,11 @@ class DataManager:
             bool: True if download was successful, False otherwise
         """
         try:
-            response = requests.get(url, stream=True)
-            if response.status_code == 200:
-                with open(target_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                return True
-            return False
+            downloader = NOAADownloader(max_workers=1, log=self.log)
+            try:
+                return downloader.download_file(url, target_path).success
+            finally:
+                downloader.close()
         except Exception:
             return False
     
@@ -176,6 +185,7 @@ class DataManager:
         cached_path = os.path.join(cache_dir, parquet_filename)
         
         if os.path.exists(cached_path) and os.path.getsize(cached_path) > 0:
+            touch_cache_entry(cached_path, cache_dir)
             return cached_path
         return None
     
@@ -193,76 +203,25 @@ class DataManager:
             self.log("Cannot process CSV: pandas not available")
             return False
             
+        # Stream each CSV member out of the archive; nothing is extracted to disk
+        self.log(f"EXTRACTING: {os.path.basename(zip_path)} (streaming CSV members)...")
         try:
-            import pandas as pd
-            # Extract the zip file to a temporary directory within AISDataTemp
-            temp_base = self._get_temp_dir()
-            extract_dir = os.path.join(temp_base, "extract")
-            os.makedirs(extract_dir, exist_ok=True)
-            self.log(f"EXTRACTING: {os.path.basename(zip_path)}...")
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            
-            # Find all CSV files
-            csv_files = [os.path.join(extract_dir, f) for f in os.listdir(extract_dir) 
-                        if f.lower().endswith('.csv')]
-            
-            if not csv_files:
-                self.log(f"No CSV files found in {os.path.basename(zip_path)}")
-                shutil.rmtree(extract_dir)
-                return False
-            
-            # Process each CSV file
-            success = True
-            for csv_file in csv_files:
-                csv_filename = os.path.basename(csv_file)
-                
-                # Extract date from filename like AIS_YYYY_MM_DD.csv to create compliant format
-                # First try to extract from the format AIS_YYYY_MM_DD.csv
-                date_match = re.search(r'AIS_(\d{4})_(\d{2})_(\d{2})\.csv', csv_filename, re.IGNORECASE)
-                
-                if date_match:
-                    year, month, day = date_match.groups()
-                    # Format to ais-YYYY-MM-DD.parquet (preferred SFD.py format)
-                    parquet_filename = f"ais-{year}-{month}-{day}.parquet"
-                else:
-                    # Fallback to original name if pattern doesn't match
-                    parquet_filename = csv_filename.replace('.csv', '.parquet')
-                    self.log(f"Warning: Could not extract date from {csv_filename}, using default name")
-                    
-                parquet_path = os.path.join(output_dir, parquet_filename)
-                
-                self.log(f"CONVERTING: {csv_filename} to parquet format...")
-                try:
-                    # Show progress on large files
-                    filesize = os.path.getsize(csv_file) / (1024 * 1024)  # Size in MB
-                    self.log(f"   - File size: {filesize:.1f} MB")
-                    
-                    df = pd.read_csv(csv_file)
-                    self.log(f"   - Loaded {len(df)} records from CSV")
-                    df.to_parquet(parquet_path, index=False)
-                    self.log(f"   - Conversion complete: {os.path.basename(parquet_path)}")
-                except Exception as e:
-                    self.log(f"Error converting {csv_filename}: {str(e)}")
-                    success = False
-            
-            # Clean up extraction directory (but keep AISDataTemp base directory)
-            try:
-                shutil.rmtree(extract_dir, ignore_errors=True)
-            except Exception as e:
-                self.log(f"Warning: Could not clean up extract directory: {e}")
-            
-            # Remove the zip file
-            try:
-                os.remove(zip_path)
-            except Exception as e:
-                self.log(f"Warning: Could not remove zip file: {e}")
-            
-            return success
+            convert_zip_to_parquet(zip_path, output_dir, log=self.log)
+        except ValueError as e:
+            # Archive without CSV members
+            self.log(str(e))
+            return False
         except Exception as e:
             self.log(f"Error processing zip file: {str(e)}")
             return False
+        
+        # Remove the zip file
+        try:
+            os.remove(zip_path)
+        except Exception as e:
+            self.log(f"Warning: Could not remove zip file: {e}")
+        
+        return True
     
     def download_noaa_data(self, start_date, end_date):
         """Download NOAA AIS data for the specified date range
@@ -295,10 +254,12 @@ class DataManager:
         self.log(f"STARTING DOWNLOAD PROCESS: NOAA AIS data from {start_date} to {end_date}")
         self.log("Download phase will be followed by extraction and conversion.")
         
-        # Construct and validate base URL
-        base_url = f"https://coast.noaa.gov/htdata/CMSP/AISDataHandler/{year}/"
-        if not self._verify_url(base_url):
+        # Construct and validate base URL; one pooled session serves every transfer
+        base_url = self.base_url.format(year=year)
+        downloader = NOAADownloader(max_workers=self.download_workers, log=self.log)
+        if not downloader.verify_url(base_url):
             self.log(f"NOAA URL not accessible: {base_url}")
+            downloader.close()
             return False, None
         
         # Generate list of dates to download
@@ -328,61 +289,76 @@ class DataManager:
         if total_files > 0:
             self.log(f"Total files to process: {total_files} ({len(cached_files)} cached, {len(files_to_download)} to download)")
         
-        # Report cached files found and copy them to output directory
+        # Report cached files found and stage them in the output directory
         cached_success_count = 0
         if cached_files:
             self.log(f"Found {len(cached_files)} cached file(s), skipping download for those dates")
             for idx, (date, cached_path) in enumerate(cached_files):
                 file_num = idx + 1
-                self.log(f"   Using cached: ais-{date.year}-{date.month:02d}-{date.day:02d}.parquet ({file_num}/{total_files})")
-                # Copy cached file to output directory
+                # Link the cached file into the output directory (copy only as a fallback)
                 parquet_filename = f"ais-{date.year}-{date.month:02d}-{date.day:02d}.parquet"
                 target_path = os.path.join(self.parquet_dir, parquet_filename)
                 try:
-                    shutil.copy2(cached_path, target_path)
+                    method = stage_file(cached_path, target_path)
+                    self.log(f"   Using cached: {parquet_filename} ({file_num}/{total_files}, {method})")
                     cached_success_count += 1
                 except Exception as e:
-                    self.log(f"Error: Could not copy cached file {parquet_filename}: {e}")
-                    # Don't count failed copies as successes
+                    self.log(f"Error: Could not stage cached file {parquet_filename}: {e}")
+                    # Don't count failed staging as successes
         
         # Download and process files that aren't cached
         success_count = cached_success_count
         
         if files_to_download:
-            self.log(f"Downloading {len(files_to_download)} file(s) that are not cached...")
-        
-        # Track current file number (including cached files)
-        current_file_num = len(cached_files)
+            self.log(f"Downloading {len(files_to_download)} file(s) that are not cached "
+                     f"({min(self.download_workers, len(files_to_download))} at a time)...")
         
+        # Queue every transfer; file numbers continue after the cached files
+        jobs = []
         for i, date in enumerate(files_to_download):
-            # Construct filename and URL
-            filename = f"AIS_{date.year}_{date.month:02d}_{date.day:02d}.zip"
-            url = urljoin(base_url, filename)
-            zip_path = os.path.join(download_dir, filename)
-            
-            # Download the file (use absolute file number including cached)
-            current_file_num += 1
-            self.log(f"DOWNLOADING: {filename} ({current_file_num}/{total_files})")
-            if self._download_file(url, zip_path):
-                self.log(f"Download complete: {filename} ({current_file_num}/{total_files})")
-                if self._process_zip_file(zip_path, self.parquet_dir):
-                    success_count += 1
-                    self.log(f"Successfully processed {filename}")
-                    
-                    # Save to cache for future use
-                    parquet_filename = f"ais-{date.year}-{date.month:02d}-{date.day:02d}.parquet"
-                    parquet_path = os.path.join(self.parquet_dir, parquet_filename)
-                    if os.path.exists(parquet_path):
-                        cache_path = os.path.join(cache_dir, parquet_filename)
-                        try:
-                            shutil.copy2(parquet_path, cache_path)
-                            self.log(f"Cached: {parquet_filename} for future use")
-                        except Exception as e:
-                            self.log(f"Warning: Could not cache {parquet_filename}: {e}")
-                else:
-                    self.log(f"Failed to process {filename}")
+            filename = noaa_zip_filename(date)
+            file_num = len(cached_files) + i + 1
+            jobs.append(DownloadJob(noaa_url_for_date(date, self.base_url),
+                                    os.path.join(download_dir, filename),
+                                    label=filename, context=(date, file_num)))
+            self.log(f"DOWNLOADING: {filename} ({file_num}/{total_files})")
+        
+        def convert_completed(job):
+            """Convert a finished download while the remaining transfers continue"""
+            nonlocal success_count
+            date, file_num = job.context
+            if not job.success:
+                self.log(f"Failed to download {job.label}: {job.error}")
+                return
+            
+            size_mb = os.path.getsize(job.target_path) / (1024 * 1024)
+            resumed = f", resumed at {job.resumed_from / (1024 * 1024):.1f} MB" if job.resumed_from else ""
+            self.log(f"Download complete: {job.label} ({file_num}/{total_files}) "
+                     f"- {size_mb:.1f} MB in {job.elapsed:.1f}s{resumed}")
+            if self._process_zip_file(job.target_path, self.parquet_dir):
+                success_count += 1
+                self.log(f"Successfully processed {job.label}")
+                
+                # Save to cache for future use
+                parquet_filename = f"ais-{date.year}-{date.month:02d}-{date.day:02d}.parquet"
+                parquet_path = os.path.join(self.parquet_dir, parquet_filename)
+                if os.path.exists(parquet_path):
+                    cache_path = os.path.join(cache_dir, parquet_filename)
+                    try:
+                        # The temp directory is removed after the download, so never symlink into it
+                        method = stage_file(parquet_path, cache_path, methods=INDEPENDENT_STAGING_METHODS)
+                        record_cache_entry(cache_path, cache_dir=cache_dir)
+                        self.log(f"Cached: {parquet_filename} for future use ({method})")
+                    except Exception as e:
+                        self.log(f"Warning: Could not cache {parquet_filename}: {e}")
             else:
-                self.log(f"Failed to download {filename}")
+                self.log(f"Failed to process {job.label}")
+        
+        # Partial downloads are kept as .part files so a rerun resumes them
+        try:
+            downloader.download_all(jobs, on_complete=convert_completed)
+        finally:
+            downloader.close()
         
         if success_count == 0:
             self.log("No files were successfully downloaded and processed")
@@ -1514,7 +1490,8 @@ class SDFGUI:
         if cache_dir and os.path.exists(cache_dir):
             try:
                 # Check if there are files in the cache directory
-                files_exist = any(os.path.isfile(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir))
+                # Cached days live in subfolders; the manifest alone does not count
+                files_exist = any(name != MANIFEST_NAME for _, _, names in os.walk(cache_dir) for name in names)
                 if files_exist:
                     # Ask user if they want to delete cached files
                     cache_response = messagebox.askyesno(
@@ -1820,7 +1797,9 @@ class SDFGUI:
             # Show latitude/longitude grid lines on maps
             'show_lat_long_grid': tk.BooleanVar(value=True),
             # Show vessel heatmaps
-            'show_anomaly_heatmap': tk.BooleanVar(value=True)
+            'show_anomaly_heatmap': tk.BooleanVar(value=True),
+            # Point geometry in the parquet anomaly summary, for GIS tools
+            'generate_geoparquet': tk.BooleanVar(value=False)
         }
         
         # Processing options
@@ -3504,7 +3483,7 @@ Select the time period on this tab and press the Run Analysis button to execute
         
         # Group the controls by type for better organization
         groups = {
-            "Reports": ["generate_statistics_excel", "generate_statistics_csv"],
+            "Reports": ["generate_statistics_excel", "generate_statistics_csv", "generate_geoparquet"],
             "Maps": ["generate_overall_map", "generate_vessel_path_maps", "show_lat_long_grid", "show_anomaly_heatmap"],
             "Charts": ["generate_charts", "generate_anomaly_type_chart", "generate_vessel_anomaly_chart", "generate_date_anomaly_chart"],
             "Filtering": ["filter_to_anomaly_vessels_only"]
@@ -4525,6 +4504,10 @@ Select the time period on this tab and press the Run Analysis button to execute
                             'lon_max': float(config['ZONE_VIOLATIONS'].get(f'{zone_key}_lon_max', '0')),
                             'is_selected': config['ZONE_VIOLATIONS'].getboolean(f'{zone_key}_is_selected', True)
                         }
+                        # Polygon zones keep their vertex list ("lat,lon; lat,lon; ...")
+                        polygon = config['ZONE_VIOLATIONS'].get(f'{zone_key}_polygon', '').strip()
+                        if polygon:
+                            zone['polygon'] = polygon
                         self.zone_violations.append(zone)
                     except (ValueError, KeyError, configparser.NoOptionError):
                         continue
@@ -4842,6 +4825,10 @@ Select the time period on this tab and press the Run Analysis button to execute
                 config['ZONE_VIOLATIONS'][f'{zone_key}_lon_min'] = str(zone['lon_min'])
                 config['ZONE_VIOLATIONS'][f'{zone_key}_lon_max'] = str(zone['lon_max'])
                 config['ZONE_VIOLATIONS'][f'{zone_key}_is_selected'] = str(zone.get('is_selected', True))
+                if zone.get('polygon'):
+                    config['ZONE_VIOLATIONS'][f'{zone_key}_polygon'] = zone['polygon']
+                else:
+                    config['ZONE_VIOLATIONS'].pop(f'{zone_key}_polygon', None)
             
             # Only delete keys for zones that no longer exist (removed zones)
             zones_to_remove = existing_zone_indices - current_zone_indices
@@ -4851,7 +4838,7 @@ Select the time period on this tab and press the Run Analysis button to execute
                 keys_to_delete = [
                     f'{zone_key}_name', f'{zone_key}_lat_min', f'{zone_key}_lat_max',
                     f'{zone_key}_lon_min', f'{zone_key}_lon_max', 
-                    f'{zone_key}_is_selected'
+                    f'{zone_key}_is_selected', f'{zone_key}_polygon'
                 ]
                 for key in keys_to_delete:
                     try:
@@ -4980,6 +4967,10 @@ Select the time period on this tab and press the Run Analysis button to execute
                 config['ZONE_VIOLATIONS'][f'{zone_key}_lon_min'] = str(zone.get('lon_min', 0.0))
                 config['ZONE_VIOLATIONS'][f'{zone_key}_lon_max'] = str(zone.get('lon_max', 0.0))
                 config['ZONE_VIOLATIONS'][f'{zone_key}_is_selected'] = str(zone.get('is_selected', True))
+                if zone.get('polygon'):
+                    config['ZONE_VIOLATIONS'][f'{zone_key}_polygon'] = str(zone['polygon'])
+                else:
+                    config['ZONE_VIOLATIONS'].pop(f'{zone_key}_polygon', None)
             
             # Only delete keys for zones that no longer exist (removed zones)
             zones_to_remove = existing_zone_indices - current_zone_indices
@@ -4989,7 +4980,7 @@ Select the time period on this tab and press the Run Analysis button to execute
                 keys_to_delete = [
                     f'{zone_key}_name', f'{zone_key}_lat_min', f'{zone_key}_lat_max',
                     f'{zone_key}_lon_min', f'{zone_key}_lon_max', 
-                    f'{zone_key}_is_selected'
+                    f'{zone_key}_is_selected', f'{zone_key}_polygon'
                 ]
                 for key in keys_to_delete:
                     try:
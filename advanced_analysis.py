@@ -35,6 +35,10 @@ import subprocess
 
 # Import local utility modules
 from utils import get_cache_dir, check_dependencies, format_file_size, log_memory_usage
+from ais_schema import read_ais_parquet, concat_ais_frames
+from day_cache import find_cached_days, read_cached_days, filter_by_ship_types, preprocess_settings
+from geo_kernels import haversine, bearing, destination_point, EARTH_RADIUS_M
+from anomaly_summary import find_anomaly_summary, read_anomaly_summary
 
 # Set up logging
 logger = logging.getLogger("Advanced_Analysis")
@@ -94,6 +98,7 @@ try:
     from ml_prediction_integration import (
         MLPredictionIntegrator, 
         MLPredictionError, 
+        load_vessel_history,
         is_available as ml_prediction_available
     )
     ML_PREDICTION_AVAILABLE = ml_prediction_available()
@@ -190,7 +195,8 @@ def validate_data_availability(run_info):
             start_date,
             end_date,
             ship_types,
-            cache_dir
+            cache_dir,
+            run_info.get('cache_settings')
         )
         
         if not cache_files:
@@ -203,8 +209,7 @@ def validate_data_availability(run_info):
         warnings.append(f"Error locating cache files: {str(e)}")
         cache_files = []
     
-    anomaly_summary_path = os.path.join(output_dir, "AIS_Anomalies_Summary.csv")
-    if not os.path.exists(anomaly_summary_path):
+    if find_anomaly_summary(output_dir) is None:
         warnings.append("Anomaly summary file not found. Some features may be limited.")
     
     return True, None, warnings
@@ -336,7 +341,7 @@ def map_anomaly_type_gui_to_data(gui_name):
         "AIS Beacon Off": "AIS_Beacon_Off",
         "AIS Beacon On": "AIS_Beacon_On",
         "Excessive Travel Distance (Fast)": "Speed",
-        "Excessive Travel Distance (Slow)": "Speed",
+        "Excessive Travel Distance (Slow)": "Slow_Travel",
         "Course over Ground-Heading Inconsistency": "Course",
         "Loitering": "Loitering",
         "Rendezvous": "Rendezvous",
@@ -352,6 +357,7 @@ def map_anomaly_type_data_to_gui(data_name):
         "AIS_Beacon_Off": "AIS Beacon Off",
         "AIS_Beacon_On": "AIS Beacon On",
         "Speed": "Excessive Travel Distance (Fast)",
+        "Slow_Travel": "Excessive Travel Distance (Slow)",
         "Course": "Course over Ground-Heading Inconsistency",
         "Loitering": "Loitering",
         "Rendezvous": "Rendezvous",
@@ -483,6 +489,22 @@ def get_last_run_info(config_path='config.ini'):
     else:
         ship_types = []
     
+    # Filters the run preprocessed with, so cache lookups accept the days it cached
+    mmsi_list_str = get_config_value('ANALYSIS_FILTERS', 'filter_mmsi_list', fallback='')
+    try:
+        mmsi_list = [int(mmsi.strip()) for mmsi in mmsi_list_str.split(',') if mmsi.strip()]
+    except ValueError:
+        mmsi_list = []
+    cache_settings = preprocess_settings({
+        'SELECTED_SHIP_TYPES': ship_types,
+        'min_latitude': get_config_value('ANALYSIS_FILTERS', 'min_latitude', fallback=-90.0, value_type='float'),
+        'max_latitude': get_config_value('ANALYSIS_FILTERS', 'max_latitude', fallback=90.0, value_type='float'),
+        'min_longitude': get_config_value('ANALYSIS_FILTERS', 'min_longitude', fallback=-180.0, value_type='float'),
+        'max_longitude': get_config_value('ANALYSIS_FILTERS', 'max_longitude', fallback=180.0, value_type='float'),
+        'filter_mmsi_list': mmsi_list,
+        'SPEED_THRESHOLD': get_config_value('Parameters', 'SPEED_THRESHOLD', fallback=102, value_type='float'),
+    })
+    
     anomaly_types = {
         'ais_beacon_off': get_config_value('ANOMALY_TYPES', 'ais_beacon_off', fallback=False, value_type='boolean'),
         'ais_beacon_on': get_config_value('ANOMALY_TYPES', 'ais_beacon_on', fallback=False, value_type='boolean'),
@@ -501,12 +523,13 @@ def get_last_run_info(config_path='config.ini'):
         'end_date': end_date,
         'ship_types': ship_types,
         'anomaly_types': anomaly_types,
-        'data_directory': data_dir
+        'data_directory': data_dir,
+        'cache_settings': cache_settings
     }
 
 
-def find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir=None):
-    """Find all cache files that match the date range and ship types."""
+def find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir=None, settings=None):
+    """Find all cache files that match the date range, ship types and run filters (settings)."""
     if cache_dir is None:
         cache_dir = get_cache_dir()
     
@@ -514,6 +537,16 @@ def find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir=
         logger.warning(f"Cache directory does not exist: {cache_dir}")
         return []
     
+    # Per-day cache entries resolve any range, whichever run produced them
+    try:
+        day_files = find_cached_days(start_date, end_date, ship_types, cache_dir, settings)
+        if day_files:
+            logger.info(f"Found {len(day_files)} cached days for date range {start_date} to {end_date}")
+            return list(day_files.values())
+    except Exception as e:
+        logger.warning(f"Error resolving per-day cache entries: {e}")
+    
+    # Otherwise look for caches written before the per-day layout
     # Format dates for subfolder name (YYYYMMDD-YYYYMMDD)
     try:
         # Ensure we have valid date strings
@@ -564,10 +597,8 @@ def find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir=
                 continue
             
             # Read the full file only if the sample check passes
-            df_check = pd.read_parquet(cache_file)
+            df_check = read_ais_parquet(cache_file)
             if 'BaseDateTime' in df_check.columns:
-                # Ensure datetime format for comparison
-                df_check['BaseDateTime'] = pd.to_datetime(df_check['BaseDateTime'])
                 file_dates = df_check['BaseDateTime'].dt.date.unique()
                 
                 # Check if file contains data within the date range
@@ -616,9 +647,9 @@ def find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir=
     return matching_files
 
 
-def load_cached_data_for_date_range(start_date, end_date, ship_types, cache_dir=None):
-    """Load all cached parquet files matching the date range and ship types."""
-    cache_files = find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir)
+def load_cached_data_for_date_range(start_date, end_date, ship_types, cache_dir=None, settings=None):
+    """Load all cached parquet files matching the date range, ship types and run filters (settings)."""
+    cache_files = find_cache_files_for_date_range(start_date, end_date, ship_types, cache_dir, settings)
     
     if not cache_files:
         logger.warning("No matching cache files found")
@@ -627,13 +658,11 @@ def load_cached_data_for_date_range(start_date, end_date, ship_types, cache_dir=
     dataframes = []
     for cache_file in cache_files:
         try:
-            df = pd.read_parquet(cache_file)
+            df = read_ais_parquet(cache_file)
             
-            if ship_types and 'VesselType' in df.columns:
-                df = df[df['VesselType'].isin(ship_types)]
+            df = filter_by_ship_types(df, ship_types)
             
             if 'BaseDateTime' in df.columns:
-                df['BaseDateTime'] = pd.to_datetime(df['BaseDateTime'])
                 start_dt = datetime.strptime(start_date, '%Y-%m-%d')
                 end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
                 df = df[(df['BaseDateTime'] >= start_dt) & (df['BaseDateTime'] < end_dt)]
@@ -649,34 +678,32 @@ def load_cached_data_for_date_range(start_date, end_date, ship_types, cache_dir=
         logger.warning("No data loaded from cache files")
         return pd.DataFrame()
     
-    combined_df = pd.concat(dataframes, ignore_index=True)
+    combined_df = concat_ais_frames(dataframes, ignore_index=True)
     logger.info(f"Total records loaded: {len(combined_df)}")
     return combined_df
 
 
 def load_anomaly_summary(output_dir):
-    """Load the AIS_Anomalies_Summary.csv file if it exists."""
+    """Load the anomaly summary (typed parquet, else AIS_Anomalies_Summary.csv) if it exists."""
     # First, try the given output directory
-    summary_path = os.path.join(output_dir, "AIS_Anomalies_Summary.csv")
+    summary_path = find_anomaly_summary(output_dir)
     
     # If not found, try alternative locations
-    if not os.path.exists(summary_path):
-        logger.warning(f"Anomaly summary file not found: {summary_path}")
+    if summary_path is None:
+        logger.warning(f"Anomaly summary file not found in: {output_dir}")
         
         # Try looking in C:/AIS_Data/Output directory
-        alt_path = "C:/AIS_Data/Output/AIS_Anomalies_Summary.csv"
-        if os.path.exists(alt_path):
-            logger.info(f"Found anomaly summary file in alternate location: {alt_path}")
-            summary_path = alt_path
+        summary_path = find_anomaly_summary("C:/AIS_Data/Output")
+        if summary_path is not None:
+            logger.info(f"Found anomaly summary file in alternate location: {summary_path}")
         else:
             # Try looking in the script directory's output folder
             script_dir = os.path.dirname(os.path.abspath(__file__))
-            alt_path = os.path.join(script_dir, "output", "AIS_Anomalies_Summary.csv")
-            if os.path.exists(alt_path):
-                logger.info(f"Found anomaly summary file in script output directory: {alt_path}")
-                summary_path = alt_path
+            summary_path = find_anomaly_summary(os.path.join(script_dir, "output"))
+            if summary_path is not None:
+                logger.info(f"Found anomaly summary file in script output directory: {summary_path}")
     
-    if not os.path.exists(summary_path):
+    if summary_path is None:
         logger.warning(f"Anomaly summary file not found in any location")
         # Create an empty dataframe with the expected columns
         columns = ['MMSI', 'VesselName', 'BaseDateTime', 'AnomalyType', 'Confidence', 
@@ -684,8 +711,8 @@ def load_anomaly_summary(output_dir):
         return pd.DataFrame(columns=columns)
     
     try:
-        df = pd.read_csv(summary_path)
-        logger.info(f"Loaded {len(df)} anomalies from summary file")
+        df = read_anomaly_summary(summary_path)
+        logger.info(f"Loaded {len(df)} anomalies from summary file {os.path.basename(summary_path)}")
         return df
     except Exception as e:
         logger.error(f"Error loading anomaly summary: {e}")
@@ -798,7 +825,15 @@ class AdvancedAnalysis:
             
             logger.info(f"Searching for cached data with: date range={start_date} to {end_date}, vessel types={ship_types}")
         
-            # First try to find the consolidated dataframe
+            # First scan the range from the date-partitioned day cache
+            day_frames = self._load_cached_days(start_date, end_date, ship_types, cache_dir,
+                                                self.run_info.get('cache_settings'))
+            if day_frames:
+                self._cached_data = day_frames[0]
+                logger.info(f"Successfully loaded {len(self._cached_data)} records from the day cache")
+                return self._cached_data
+        
+            # Then try a consolidated dataframe written before the per-day layout
             consolidated_found = False
             
             # Check if date-specific subfolder might exist
@@ -812,7 +847,7 @@ class AdvancedAnalysis:
                 # Try to load from the date subfolder first
                 if os.path.exists(consolidated_path):
                     logger.info(f"Found consolidated dataframe at: {consolidated_path}")
-                    self._cached_data = pd.read_parquet(consolidated_path)
+                    self._cached_data = read_ais_parquet(consolidated_path)
                     
                     # If ship_types are specified, filter the dataframe
                     if ship_types and len(ship_types) > 0:
@@ -838,7 +873,7 @@ class AdvancedAnalysis:
                     consolidated_path = os.path.join(cache_dir, "consolidated_data.parquet")
                     if os.path.exists(consolidated_path):
                         logger.info(f"Found consolidated dataframe in root cache: {consolidated_path}")
-                        self._cached_data = pd.read_parquet(consolidated_path)
+                        self._cached_data = read_ais_parquet(consolidated_path)
                         
                         # Filter by vessel type if needed
                         if ship_types and len(ship_types) > 0:
@@ -870,7 +905,8 @@ class AdvancedAnalysis:
                     start_date,
                     end_date,
                     ship_types,
-                    cache_dir
+                    cache_dir,
+                    self.run_info.get('cache_settings')
                 )
                 
                 if not cache_files:
@@ -884,7 +920,7 @@ class AdvancedAnalysis:
                 dataframes = []
                 for file_path in cache_files:
                     try:
-                        df = pd.read_parquet(file_path)
+                        df = read_ais_parquet(file_path)
                         if df is not None and not df.empty:
                             dataframes.append(df)
                             logger.info(f"Loaded {len(df)} records from {os.path.basename(file_path)}")
@@ -912,7 +948,7 @@ class AdvancedAnalysis:
                         logger.error(f"Failed to show warning dialog: {e}")
                 else:
                     # Combine all the dataframes
-                    self._cached_data = pd.concat(dataframes, ignore_index=True)
+                    self._cached_data = concat_ais_frames(dataframes, ignore_index=True)
                     logger.info(f"Combined {len(self._cached_data)} records from {len(dataframes)} cache files")
                     
                     # Remove duplicates if any
@@ -930,6 +966,34 @@ class AdvancedAnalysis:
             self._cached_data = pd.DataFrame()
             return self._cached_data
 
+    def _load_cached_days(self, start_date, end_date, ship_types, cache_dir, settings=None):
+        """
+        Scan the date-partitioned day cache for a date range.
+        
+        Partitions are read lazily with the ship type filter pushed down, so
+        entries from a broader ship type selection are narrowed while scanning.
+        
+        Args:
+            start_date (str): Start date (YYYY-MM-DD)
+            end_date (str): End date (YYYY-MM-DD)
+            ship_types (list): Selected ship types
+            cache_dir (str): Cache directory
+            settings (dict, optional): Run filters the days were cached with
+                (run_info['cache_settings']); rows outside them are dropped
+            
+        Returns:
+            list: The loaded DataFrame, or an empty list when nothing is cached
+        """
+        try:
+            df = read_cached_days(start_date, end_date, ship_types, cache_dir=cache_dir, settings=settings)
+        except Exception as e:
+            logger.warning(f"Error scanning the per-day cache: {e}")
+            return []
+        if df.empty:
+            return []
+        logger.info(f"Scanned {len(df)} records for {start_date} to {end_date} from the day cache")
+        return [df]
+    
     def load_full_daily_datasets(self, start_date=None, end_date=None):
         """
         Load full daily datasets from cache directory for ML prediction.
@@ -959,15 +1023,18 @@ class AdvancedAnalysis:
             
             logger.info(f"Loading full daily datasets for date range: {start_date} to {end_date}")
             
-            # Check date-specific subfolder first
+            # Per-day cache entries cover any range
+            dataframes = self._load_cached_days(start_date, end_date,
+                                                self.run_info.get('ship_types', []), cache_dir,
+                                                self.run_info.get('cache_settings'))
+            
+            # Fall back to a date-specific subfolder written before the per-day layout
             start_fmt = datetime.strptime(start_date, '%Y-%m-%d').strftime('%Y%m%d')
             end_fmt = datetime.strptime(end_date, '%Y-%m-%d').strftime('%Y%m%d')
             date_subfolder = f"{start_fmt}-{end_fmt}"
             date_cache_dir = os.path.join(cache_dir, date_subfolder)
             
-            dataframes = []
-            
-            if os.path.exists(date_cache_dir):
+            if not dataframes and os.path.exists(date_cache_dir):
                 # Load all parquet files from date subfolder, excluding consolidated_data.parquet
                 logger.info(f"Loading daily datasets from: {date_cache_dir}")
                 for filename in os.listdir(date_cache_dir):
@@ -977,11 +1044,10 @@ class AdvancedAnalysis:
                     if filename.endswith('.parquet'):
                         file_path = os.path.join(date_cache_dir, filename)
                         try:
-                            df = pd.read_parquet(file_path)
+                            df = read_ais_parquet(file_path)
                             
                             # Filter by date range if BaseDateTime exists
                             if 'BaseDateTime' in df.columns:
-                                df['BaseDateTime'] = pd.to_datetime(df['BaseDateTime'], errors='coerce')
                                 start_dt = datetime.strptime(start_date, '%Y-%m-%d')
                                 end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
                                 df = df[(df['BaseDateTime'] >= start_dt) & (df['BaseDateTime'] < end_dt)]
@@ -1003,11 +1069,10 @@ class AdvancedAnalysis:
                     if filename.endswith('.parquet'):
                         file_path = os.path.join(cache_dir, filename)
                         try:
-                            df = pd.read_parquet(file_path)
+                            df = read_ais_parquet(file_path)
                             
                             # Filter by date range if BaseDateTime exists
                             if 'BaseDateTime' in df.columns:
-                                df['BaseDateTime'] = pd.to_datetime(df['BaseDateTime'], errors='coerce')
                                 start_dt = datetime.strptime(start_date, '%Y-%m-%d')
                                 end_dt = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
                                 df = df[(df['BaseDateTime'] >= start_dt) & (df['BaseDateTime'] < end_dt)]
@@ -1024,7 +1089,7 @@ class AdvancedAnalysis:
                 return pd.DataFrame()
             
             # Combine all dataframes
-            combined_df = pd.concat(dataframes, ignore_index=True)
+            combined_df = concat_ais_frames(dataframes, ignore_index=True)
             
             # Remove duplicates if any
             if 'BaseDateTime' in combined_df.columns and 'MMSI' in combined_df.columns:
@@ -5271,18 +5336,21 @@ class AdvancedAnalysisGUI:
         progress = ProgressDialog(self.window, "ML Course Prediction", 
                                  f"Predicting course for vessel {mmsi}...")
         try:
-            self.status_var.set(f"Loading full daily datasets for vessel {mmsi}...")
+            self.status_var.set(f"Loading cached history for vessel {mmsi}...")
             
-            # Load full daily datasets from cache (not filtered/consolidated data)
-            df = self.analysis.load_full_daily_datasets()
+            # Read only this vessel from the day cache, then fall back to the full daily datasets
+            run_info = self.analysis.run_info
+            df = load_vessel_history(mmsi, run_info.get('start_date'), run_info.get('end_date'),
+                                     run_info.get('ship_types', []), run_info.get('cache_settings'))
+            if df.empty:
+                df = self.analysis.load_full_daily_datasets()
             if df.empty:
                 progress.close()
                 messagebox.showerror("Error", 
                     "No daily datasets found in cache directory.\n\n"
                     "Please ensure that:\n"
                     "1. AIS data has been downloaded and cached\n"
-                    "2. Cache directory contains parquet files for the date range\n"
-                    "3. Files are in the correct date subfolder (YYYYMMDD-YYYYMMDD)")
+                    "2. SFD.py has been run for the date range, so the day cache holds it")
                 return
             
             self.status_var.set(f"Initializing ML prediction...")
@@ -5585,47 +5653,6 @@ class AdvancedAnalysisGUI:
                     # Calculate perpendicular confidence intervals (cone shape)
                     # Uncertainty should be perpendicular to the predicted course (heading), forming an expanding cone
                     # Uses predicted course and speed from the model if available
-                    def calculate_bearing(lat1, lon1, lat2, lon2):
-                        """Calculate bearing (azimuth) from point 1 to point 2 in degrees"""
-                        lat1_rad = math.radians(lat1)
-                        lat2_rad = math.radians(lat2)
-                        dlon_rad = math.radians(lon2 - lon1)
-                        
-                        y = math.sin(dlon_rad) * math.cos(lat2_rad)
-                        x = math.cos(lat1_rad) * math.sin(lat2_rad) - \
-                            math.sin(lat1_rad) * math.cos(lat2_rad) * math.cos(dlon_rad)
-                        
-                        bearing = math.degrees(math.atan2(y, x))
-                        return (bearing + 360) % 360  # Normalize to 0-360
-                    
-                    def offset_point_by_bearing(lat, lon, bearing_deg, distance_nm):
-                        """Offset a point in a given bearing direction by a distance in nautical miles"""
-                        # Convert distance to degrees
-                        # 1 degree latitude ≈ 60 nautical miles
-                        # 1 degree longitude ≈ 60 * cos(latitude) nautical miles
-                        lat_offset = (distance_nm / 60.0) * math.cos(math.radians(bearing_deg))
-                        lon_offset = (distance_nm / (60.0 * math.cos(math.radians(lat)))) * math.sin(math.radians(bearing_deg))
-                        return lat + lat_offset, lon + lon_offset
-                    
-                    def haversine_distance_meters(lat1, lon1, lat2, lon2):
-                        """Calculate the great-circle distance between two points in meters using Haversine formula"""
-                        # Earth radius in meters
-                        R = 6371000.0  # meters
-                        
-                        # Convert to radians
-                        lat1_rad = math.radians(lat1)
-                        lat2_rad = math.radians(lat2)
-                        dlat_rad = math.radians(lat2 - lat1)
-                        dlon_rad = math.radians(lon2 - lon1)
-                        
-                        # Haversine formula
-                        a = math.sin(dlat_rad / 2)**2 + \
-                            math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon_rad / 2)**2
-                        c = 2 * math.asin(math.sqrt(a))
-                        
-                        distance_meters = R * c
-                        return distance_meters
-                    
                     # Get predicted course and speed arrays if available
                     pred_courses = None
                     pred_speeds = None
@@ -5688,13 +5715,13 @@ class AdvancedAnalysisGUI:
                                     if last_known_cog is not None:
                                         predicted_course = last_known_cog
                                     else:
-                                        predicted_course = calculate_bearing(path_points[i][0], path_points[i][1], 
-                                                                           curr_lat, curr_lon)
+                                        predicted_course = bearing(path_points[i][0], path_points[i][1], 
+                                                                   curr_lat, curr_lon)
                                 else:
                                     # From previous predicted point to current predicted point
                                     # Bearing represents the COG (actual movement direction)
-                                    predicted_course = calculate_bearing(path_points[i][0], path_points[i][1], 
-                                                                       curr_lat, curr_lon)
+                                    predicted_course = bearing(path_points[i][0], path_points[i][1], 
+                                                               curr_lat, curr_lon)
                             
                             # Priority 3: Fallback to last known COG (not Heading)
                             if predicted_course is None and last_known_cog is not None:
@@ -5786,7 +5813,7 @@ class AdvancedAnalysisGUI:
                             logger.info(f"  Calculated Variables:")
                             logger.info(f"    projection_distance_nm = predicted_speed × time_hours = {projection_distance_nm:.2f} nm")
                             
-                            left_lat, left_lon = offset_point_by_bearing(prev_left_lat, prev_left_lon, left_bound_course, projection_distance_nm)
+                            left_lat, left_lon = destination_point(prev_left_lat, prev_left_lon, left_bound_course, projection_distance_nm)
                             
                             logger.info(f"  Left Bound (Port):")
                             logger.info(f"    left_bound_course = (predicted_course - angular_offset) % 360 = ({predicted_course:.3f} - {angular_offset:.6f}) % 360 = {left_bound_course:.3f}°")
@@ -5812,7 +5839,7 @@ class AdvancedAnalysisGUI:
                                 # For subsequent points, project from previous bound point
                                 prev_right_lat, prev_right_lon = upper_points[-1]
                             
-                            right_lat, right_lon = offset_point_by_bearing(prev_right_lat, prev_right_lon, right_bound_course, projection_distance_nm)
+                            right_lat, right_lon = destination_point(prev_right_lat, prev_right_lon, right_bound_course, projection_distance_nm)
                             
                             logger.info(f"  Right Bound (Starboard):")
                             logger.info(f"    right_bound_course = (predicted_course + angular_offset) % 360 = ({predicted_course:.3f} + {angular_offset:.6f}) % 360 = {right_bound_course:.3f}°")
@@ -6038,8 +6065,8 @@ class AdvancedAnalysisGUI:
                                     upper_lat, upper_lon = upper_bound_point[0], upper_bound_point[1]
                                     
                                     # Calculate distance between upper and lower bounds
-                                    distance_between_bounds_meters = haversine_distance_meters(
-                                        lower_lat, lower_lon, upper_lat, upper_lon
+                                    distance_between_bounds_meters = haversine(
+                                        lower_lat, lower_lon, upper_lat, upper_lon, radius=EARTH_RADIUS_M
                                     )
                                     
                                     # If distance is 0 or very small (e.g., due to zero projection distance),
@@ -6089,13 +6116,13 @@ class AdvancedAnalysisGUI:
                                             # Calculate course from position_mean array
                                             if i == 0:
                                                 # From last known position to first predicted point
-                                                predicted_course_for_calc = calculate_bearing(last_lat, last_lon, lat, lon)
+                                                predicted_course_for_calc = bearing(last_lat, last_lon, lat, lon)
                                             elif i > 0:
                                                 # From previous predicted point to current predicted point
                                                 prev_lat = float(position_mean[i - 1, 0])
                                                 prev_lon = float(position_mean[i - 1, 1])
                                                 if not (np.isnan(prev_lat) or np.isnan(prev_lon)):
-                                                    predicted_course_for_calc = calculate_bearing(prev_lat, prev_lon, lat, lon)
+                                                    predicted_course_for_calc = bearing(prev_lat, prev_lon, lat, lon)
                                             # Fallback to last known COG if available
                                             if predicted_course_for_calc is None and last_cog is not None:
                                                 predicted_course_for_calc = last_cog
@@ -6110,12 +6137,12 @@ class AdvancedAnalysisGUI:
                                             right_bound_course_calc = angular_offset_for_calc % 360
                                         
                                         # Calculate bounds positions from predicted point
-                                        calc_lower_lat, calc_lower_lon = offset_point_by_bearing(lat, lon, left_bound_course_calc, base_distance_nm)
-                                        calc_upper_lat, calc_upper_lon = offset_point_by_bearing(lat, lon, right_bound_course_calc, base_distance_nm)
+                                        calc_lower_lat, calc_lower_lon = destination_point(lat, lon, left_bound_course_calc, base_distance_nm)
+                                        calc_upper_lat, calc_upper_lon = destination_point(lat, lon, right_bound_course_calc, base_distance_nm)
                                         
                                         # Calculate distance between these calculated bounds
-                                        distance_between_bounds_meters = haversine_distance_meters(
-                                            calc_lower_lat, calc_lower_lon, calc_upper_lat, calc_upper_lon
+                                        distance_between_bounds_meters = haversine(
+                                            calc_lower_lat, calc_lower_lon, calc_upper_lat, calc_upper_lon, radius=EARTH_RADIUS_M
                                         )
                                         
                                         logger.info(f"  [Distance Calculation] Bounds were at same location, calculated from angular separation:")
@@ -6219,8 +6246,8 @@ class AdvancedAnalysisGUI:
                                     upper_lon = upper_bound_point[1]
                                     
                                     # Calculate distance between upper and lower bounds
-                                    distance_between_bounds_meters = haversine_distance_meters(
-                                        lower_lat, lower_lon, upper_lat, upper_lon
+                                    distance_between_bounds_meters = haversine(
+                                        lower_lat, lower_lon, upper_lat, upper_lon, radius=EARTH_RADIUS_M
                                     )
                                     
                                     # If distance is 0 or very small, calculate from angular separation
@@ -6239,18 +6266,18 @@ class AdvancedAnalysisGUI:
                                         if last_point_idx > 0:
                                             prev_lat = float(position_mean[last_point_idx - 1, 0])
                                             prev_lon = float(position_mean[last_point_idx - 1, 1])
-                                            predicted_course_for_calc = calculate_bearing(prev_lat, prev_lon, last_pred_lat, last_pred_lon)
+                                            predicted_course_for_calc = bearing(prev_lat, prev_lon, last_pred_lat, last_pred_lon)
                                         else:
                                             predicted_course_for_calc = 0.0
                                         
                                         left_bound_course_calc = (predicted_course_for_calc - angular_offset_for_calc) % 360
                                         right_bound_course_calc = (predicted_course_for_calc + angular_offset_for_calc) % 360
                                         
-                                        calc_lower_lat, calc_lower_lon = offset_point_by_bearing(last_pred_lat, last_pred_lon, left_bound_course_calc, base_distance_nm)
-                                        calc_upper_lat, calc_upper_lon = offset_point_by_bearing(last_pred_lat, last_pred_lon, right_bound_course_calc, base_distance_nm)
+                                        calc_lower_lat, calc_lower_lon = destination_point(last_pred_lat, last_pred_lon, left_bound_course_calc, base_distance_nm)
+                                        calc_upper_lat, calc_upper_lon = destination_point(last_pred_lat, last_pred_lon, right_bound_course_calc, base_distance_nm)
                                         
-                                        distance_between_bounds_meters = haversine_distance_meters(
-                                            calc_lower_lat, calc_lower_lon, calc_upper_lat, calc_upper_lon
+                                        distance_between_bounds_meters = haversine(
+                                            calc_lower_lat, calc_lower_lon, calc_upper_lat, calc_upper_lon, radius=EARTH_RADIUS_M
                                         )
                                     
                                     # Base uncertainty = 1/2 the distance between bounds (same as uncertainty circles)
@@ -6370,7 +6397,7 @@ class AdvancedAnalysisGUI:
         
         # Convert GUI anomaly type names to data format
         selected_anomaly_types = [map_anomaly_type_gui_to_data(gui_name) for gui_name in selected_anomalies_gui]
-        # Remove duplicates (e.g., "Excessive Travel Distance (Fast)" and "Excessive Travel Distance (Slow)" both map to "Speed")
+        # Remove duplicates (several GUI names may map to one data type)
         selected_anomaly_types = list(set(selected_anomaly_types))
         
         # Get selected vessel types from Vessel Selection tab
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+AIS Ingest Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module converts the daily NOAA AIS ZIP archives to parquet. The CSV member
+is streamed straight out of the archive through the multithreaded pyarrow CSV
+reader in fixed-size blocks, and row groups are written as they fill up, so
+peak memory depends on the block and row group sizes rather than the size of
+the day and no extracted CSV is ever written to disk. Output files are written
+in the canonical AIS schema (see ais_schema.py).
+"""
+
+import os
+import re
+import logging
+import zipfile
+
+from ais_schema import csv_column_types, conform_table, write_ais_parquet
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Bytes of CSV text decoded per block
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Rows buffered before a parquet row group is written
+DEFAULT_ROW_GROUP_SIZE = 250000
+
+def parquet_name_for_csv(csv_filename):
+    """
+    Name of the parquet file produced for a NOAA CSV member.
+
+    Args:
+        csv_filename (str): Member name like AIS_2024_10_01.csv
+
+    Returns:
+        tuple: (parquet_filename, matched) where matched is False when the
+            date could not be read from the name and the CSV name was reused
+    """
+    base_name = os.path.basename(csv_filename)
+    date_match = re.search(r'AIS_(\d{4})_(\d{2})_(\d{2})\.csv', base_name, re.IGNORECASE)
+    if date_match:
+        year, month, day = date_match.groups()
+        # ais-YYYY-MM-DD.parquet is the preferred SFD.py format
+        return f"ais-{year}-{month}-{day}.parquet", True
+    return re.sub(r'\.csv$', '.parquet', base_name, flags=re.IGNORECASE), False
+
+
+def _convert_options():
+    """pyarrow CSV convert options with the explicit NOAA column types."""
+    return pa_csv.ConvertOptions(column_types=csv_column_types(), strings_can_be_null=True)
+
+
+def stream_csv_to_parquet(csv_stream, parquet_path, block_size=DEFAULT_BLOCK_SIZE,
+                          row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Convert a CSV byte stream to a parquet file block by block.
+
+    The parquet file is written to a temporary name and renamed when complete,
+    so an interrupted conversion never leaves a truncated file behind.
+
+    Args:
+        csv_stream (file-like): Binary stream of CSV text (e.g. ZipFile.open())
+        parquet_path (str): Output parquet path
+        block_size (int, optional): Bytes of CSV decoded per block
+        row_group_size (int, optional): Rows per parquet row group
+
+    Returns:
+        int: Number of rows written
+    """
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=block_size)
+    reader = pa_csv.open_csv(csv_stream, read_options=read_options,
+                             convert_options=_convert_options())
+
+    temp_path = parquet_path + ".tmp"
+    writer = None
+    pending = []
+    pending_rows = 0
+    total_rows = 0
+
+    def flush():
+        """Write the buffered batches as one row group in the canonical schema."""
+        nonlocal writer
+        table = conform_table(pa.Table.from_batches(pending, schema=reader.schema))
+        if writer is None:
+            writer = pq.ParquetWriter(temp_path, table.schema)
+        writer.write_table(table, row_group_size=row_group_size)
+        return table.num_rows
+
+    try:
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= row_group_size:
+                total_rows += flush()
+                pending = []
+                pending_rows = 0
+        if pending or writer is None:
+            # The final partial row group (or an empty file with just the schema)
+            total_rows += flush()
+        writer.close()
+        writer = None
+        os.replace(temp_path, parquet_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return total_rows
+
+
+def convert_zip_to_parquet(zip_path, output_dir, block_size=DEFAULT_BLOCK_SIZE,
+                           row_group_size=DEFAULT_ROW_GROUP_SIZE, log=None):
+    """
+    Convert every CSV member of a NOAA ZIP archive to parquet without extracting it.
+
+    Args:
+        zip_path (str): Path to the ZIP archive
+        output_dir (str): Directory receiving the parquet files
+        block_size (int, optional): Bytes of CSV decoded per block
+        row_group_size (int, optional): Rows per parquet row group
+        log (callable, optional): Function receiving progress messages
+
+    Returns:
+        list: (parquet_path, row_count) for each converted member; members that
+            fail to convert are logged and skipped
+
+    Raises:
+        ValueError: If the archive contains no CSV files
+    """
+    log = log or logger.info
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = [info for info in zip_ref.infolist()
+                   if not info.is_dir() and info.filename.lower().endswith('.csv')]
+        if not members:
+            raise ValueError(f"No CSV files found in {os.path.basename(zip_path)}")
+
+        results = []
+        for info in members:
+            csv_filename = os.path.basename(info.filename)
+            parquet_filename, matched = parquet_name_for_csv(csv_filename)
+            if not matched:
+                log(f"Warning: Could not extract date from {csv_filename}, using default name")
+            parquet_path = os.path.join(output_dir, parquet_filename)
+
+            log(f"CONVERTING: {csv_filename} to parquet format...")
+            log(f"   - File size: {info.file_size / (1024 * 1024):.1f} MB (streamed from archive)")
+
+            try:
+                with zip_ref.open(info) as csv_stream:
+                    if PYARROW_AVAILABLE:
+                        row_count = stream_csv_to_parquet(csv_stream, parquet_path,
+                                                          block_size, row_group_size)
+                    else:
+                        # Without pyarrow fall back to a single pandas read of the member
+                        import pandas as pd
+                        df = pd.read_csv(csv_stream)
+                        write_ais_parquet(df, parquet_path)
+                        row_count = len(df)
+            except Exception as e:
+                # One unreadable member does not cost the rest of the archive
+                log(f"Error converting {csv_filename}: {str(e)}")
+                continue
+
+            log(f"   - Wrote {row_count} records")
+            log(f"   - Conversion complete: {parquet_filename}")
+            results.append((parquet_path, row_count))
+
+    return results
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+AIS Schema Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module defines the canonical, compact column types for AIS position
+reports and applies them at ingest. Every loader conforms its frames to this
+schema and every cache file is written in it, so MMSI is a uint32, positions
+and kinematics are float32, vessel codes are small integers, repeated strings
+are dictionary encoded and BaseDateTime is parsed once into a native
+timestamp instead of on every load.
+
+The schema is versioned. Parquet files written through write_ais_parquet carry
+the version in their metadata so caches written with an older layout can be
+recognised and rebuilt.
+"""
+
+import os
+import logging
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Bump whenever a column type below changes
+AIS_SCHEMA_VERSION = 1
+
+# Parquet key/value metadata entry holding the schema version
+SCHEMA_VERSION_KEY = b'sfd.ais_schema_version'
+
+# MMSI is a 9-digit identifier; anything outside uint32 is not a valid MMSI
+MMSI_COLUMN = 'MMSI'
+TIMESTAMP_COLUMN = 'BaseDateTime'
+FLOAT32_COLUMNS = ['LAT', 'LON', 'SOG', 'COG', 'Heading', 'Length', 'Width', 'Draft']
+INT16_COLUMNS = ['VesselType', 'Status', 'Cargo']
+DICTIONARY_COLUMNS = ['VesselName', 'IMO', 'CallSign', 'TransceiverClass']
+
+# pandas dtypes of the canonical schema
+PANDAS_DTYPES = {MMSI_COLUMN: 'uint32', TIMESTAMP_COLUMN: 'datetime64[ns]'}
+PANDAS_DTYPES.update({col: 'float32' for col in FLOAT32_COLUMNS})
+PANDAS_DTYPES.update({col: 'Int16' for col in INT16_COLUMNS})
+PANDAS_DTYPES.update({col: 'category' for col in DICTIONARY_COLUMNS})
+
+# Types used when parsing NOAA CSV text. Integer codes are read as floats
+# because some files write them as "70.0"; conform_table narrows them.
+CSV_COLUMN_TYPES = {MMSI_COLUMN: 'int64', TIMESTAMP_COLUMN: 'timestamp[ns]'}
+CSV_COLUMN_TYPES.update({col: 'float' for col in FLOAT32_COLUMNS})
+CSV_COLUMN_TYPES.update({col: 'double' for col in INT16_COLUMNS})
+CSV_COLUMN_TYPES.update({col: 'string' for col in DICTIONARY_COLUMNS})
+
+_INT16_MIN = np.iinfo(np.int16).min
+_INT16_MAX = np.iinfo(np.int16).max
+_UINT32_MAX = np.iinfo(np.uint32).max
+
+
+def arrow_type(column):
+    """
+    Canonical Arrow type of a column.
+
+    Args:
+        column (str): Column name
+
+    Returns:
+        pyarrow.DataType or None: Type, or None for columns outside the schema
+    """
+    if column == MMSI_COLUMN:
+        return pa.uint32()
+    if column == TIMESTAMP_COLUMN:
+        return pa.timestamp('ns')
+    if column in FLOAT32_COLUMNS:
+        return pa.float32()
+    if column in INT16_COLUMNS:
+        return pa.int16()
+    if column in DICTIONARY_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    return None
+
+
+def csv_column_types():
+    """
+    Arrow column types for pyarrow.csv.ConvertOptions when reading NOAA CSV files.
+
+    Returns:
+        dict: Mapping of column name to pyarrow.DataType
+    """
+    return {name: pa.type_for_alias(alias) for name, alias in CSV_COLUMN_TYPES.items()}
+
+
+def conform_table(table):
+    """
+    Cast an Arrow table to the canonical AIS schema.
+
+    Rows without a valid MMSI are dropped. Columns outside the schema are kept
+    unchanged. The schema version is recorded in the table metadata.
+
+    Args:
+        table (pyarrow.Table): Table to conform
+
+    Returns:
+        pyarrow.Table: Conformed table
+    """
+    import pyarrow.compute as pc
+
+    metadata = dict(table.schema.metadata or {})
+    changed = False
+
+    if MMSI_COLUMN in table.column_names:
+        mmsi = table.column(MMSI_COLUMN)
+        if mmsi.type != pa.uint32():
+            if not pa.types.is_integer(mmsi.type):
+                mmsi = pc.cast(mmsi, pa.float64())
+            valid = pc.and_(pc.greater_equal(mmsi, 0), pc.less_equal(mmsi, _UINT32_MAX))
+            valid = pc.fill_null(valid, False)
+            dropped = len(table) - pc.sum(valid).as_py() if len(table) else 0
+            if dropped:
+                logger.info(f"Dropping {dropped} rows with missing or invalid MMSI")
+                table = table.filter(valid)
+                mmsi = mmsi.filter(valid)
+            table = table.set_column(table.schema.get_field_index(MMSI_COLUMN), MMSI_COLUMN,
+                                     pc.cast(mmsi, pa.uint32(), safe=False))
+            changed = True
+
+    for index, field in enumerate(table.schema):
+        target = arrow_type(field.name)
+        if target is None or field.name == MMSI_COLUMN or field.type == target:
+            continue
+        column = table.column(index)
+        if field.name in DICTIONARY_COLUMNS:
+            if pa.types.is_dictionary(field.type) and pa.types.is_string(field.type.value_type):
+                # Any index width is fine (pandas categoricals use int8/int16)
+                continue
+            column = pc.cast(column, pa.string()).dictionary_encode()
+        elif field.name in INT16_COLUMNS:
+            # Out-of-range codes become null rather than wrapping around
+            in_range = pc.and_(pc.greater_equal(column, _INT16_MIN), pc.less_equal(column, _INT16_MAX))
+            column = pc.if_else(in_range, column, pa.scalar(None, type=column.type))
+            if pa.types.is_floating(column.type):
+                column = pc.round(column)
+            column = pc.cast(column, target, safe=False)
+        elif field.name == TIMESTAMP_COLUMN and pa.types.is_timestamp(field.type) and field.type.tz:
+            # Keep timezone-aware timestamps aware, only normalise the unit
+            column = pc.cast(column, pa.timestamp('ns', tz=field.type.tz))
+        else:
+            column = pc.cast(column, target)
+        table = table.set_column(index, field.name, column)
+        changed = True
+
+    if changed:
+        # The pandas metadata would restore the pre-cast dtypes on to_pandas()
+        metadata.pop(b'pandas', None)
+    metadata[SCHEMA_VERSION_KEY] = str(AIS_SCHEMA_VERSION).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def conform_dataframe(df):
+    """
+    Cast a pandas DataFrame to the canonical AIS dtypes.
+
+    Columns already in their canonical dtype are left untouched, so calling this
+    on a conformed frame is cheap. Rows without a valid MMSI are dropped and
+    BaseDateTime values that cannot be parsed become NaT.
+
+    Args:
+        df (DataFrame): Frame to conform
+
+    Returns:
+        DataFrame: Conformed frame
+    """
+    if df is None or len(df.columns) == 0:
+        return df
+
+    if MMSI_COLUMN in df.columns and df[MMSI_COLUMN].dtype != np.uint32:
+        mmsi = pd.to_numeric(df[MMSI_COLUMN], errors='coerce')
+        valid = mmsi.notna() & (mmsi >= 0) & (mmsi <= _UINT32_MAX)
+        if not valid.all():
+            logger.info(f"Dropping {(~valid).sum()} rows with missing or invalid MMSI")
+            df = df[valid]
+            mmsi = mmsi[valid]
+        df = df.assign(**{MMSI_COLUMN: mmsi.astype(np.uint32)})
+
+    converted = {}
+    for column in df.columns:
+        target = PANDAS_DTYPES.get(column)
+        if target is None or column == MMSI_COLUMN:
+            continue
+        values = df[column]
+
+        if column == TIMESTAMP_COLUMN:
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                values = pd.to_datetime(values, errors='coerce')
+                converted[column] = values
+            # Newer pandas parses strings to microseconds; the schema uses nanoseconds
+            if getattr(values.dt, 'tz', None) is None and values.dtype != 'datetime64[ns]':
+                converted[column] = values.astype('datetime64[ns]')
+        elif target == 'float32':
+            if values.dtype != np.float32:
+                converted[column] = pd.to_numeric(values, errors='coerce').astype(np.float32)
+        elif target == 'Int16':
+            if values.dtype != 'Int16':
+                numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+                numbers = numbers.where((numbers >= _INT16_MIN) & (numbers <= _INT16_MAX)).round()
+                converted[column] = numbers.astype('Int16')
+        elif target == 'category':
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                converted[column] = values.astype('category')
+
+    if converted:
+        df = df.assign(**converted)
+    return df
+
+
+def concat_ais_frames(frames, **kwargs):
+    """
+    Concatenate conformed frames and restore the canonical dtypes.
+
+    pandas falls back to object dtype when categoricals with different
+    categories are concatenated; this re-encodes them once for the result.
+
+    Args:
+        frames (list): DataFrames to concatenate
+        **kwargs: Passed to pandas.concat
+
+    Returns:
+        DataFrame: Concatenated, conformed frame
+    """
+    return conform_dataframe(pd.concat(frames, **kwargs))
+
+
+def table_to_dataframe(table, **kwargs):
+    """
+    Convert a conformed Arrow table to pandas, keeping nullable int16 codes.
+
+    Args:
+        table (pyarrow.Table): Conformed table
+        **kwargs: Passed to pyarrow.Table.to_pandas (e.g. split_blocks=True to
+            avoid consolidating memory-mapped columns into new blocks)
+
+    Returns:
+        DataFrame: Frame in the canonical dtypes
+    """
+    return table.to_pandas(types_mapper={pa.int16(): pd.Int16Dtype()}.get, **kwargs)
+
+
+def read_ais_parquet(path, columns=None, filters=None):
+    """
+    Read an AIS parquet file into a DataFrame in the canonical schema.
+
+    Args:
+        path (str): Parquet file path
+        columns (list, optional): Columns to read
+        filters (list, optional): pyarrow row filters
+
+    Returns:
+        DataFrame: Conformed frame
+    """
+    if not PYARROW_AVAILABLE:
+        return conform_dataframe(pd.read_parquet(path, columns=columns, filters=filters))
+    table = pq.read_table(path, columns=columns, filters=filters)
+    return table_to_dataframe(conform_table(table))
+
+
+def write_ais_parquet(df, path, metadata=None, **kwargs):
+    """
+    Write a DataFrame as parquet in the canonical schema, tagged with its version.
+
+    Args:
+        df (DataFrame): Data to write
+        path (str): Output path
+        metadata (dict, optional): Extra string key/value pairs stored in the file metadata
+        **kwargs: Passed to pyarrow.parquet.write_table (e.g. compression)
+    """
+    if not PYARROW_AVAILABLE:
+        conform_dataframe(df).to_parquet(path, index=False)
+        return
+    table = conform_table(pa.Table.from_pandas(conform_dataframe(df), preserve_index=False))
+    if metadata:
+        merged = dict(table.schema.metadata or {})
+        merged.update({str(key).encode(): str(value).encode() for key, value in metadata.items()})
+        table = table.replace_schema_metadata(merged)
+    pq.write_table(table, path, **kwargs)
+
+
+def read_parquet_metadata(path):
+    """
+    String key/value metadata stored in a parquet file.
+
+    Args:
+        path (str): Parquet file path
+
+    Returns:
+        dict: Decoded metadata (empty if unavailable); the pandas entry is omitted
+    """
+    if not PYARROW_AVAILABLE or not os.path.exists(path):
+        return {}
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except Exception as e:
+        logger.debug(f"Could not read parquet metadata of {path}: {e}")
+        return {}
+    return {key.decode(): value.decode() for key, value in metadata.items() if key != b'pandas'}
+
+
+def parquet_schema_version(path):
+    """
+    Schema version recorded in a parquet file.
+
+    Args:
+        path (str): Parquet file path
+
+    Returns:
+        int or None: Version, or None for files written without one
+    """
+    value = read_parquet_metadata(path).get(SCHEMA_VERSION_KEY.decode())
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def memory_usage_mb(df):
+    """Deep memory footprint of a DataFrame in MB."""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Anomaly Builder Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module collects the anomaly records produced over a run. The detectors in
+anomaly_detectors return whole DataFrames of records; AnomalyBuilder keeps
+those blocks as they are and assembles them once at the end of the run into a
+single frame with a fixed schema, instead of converting every record to a dict
+and rebuilding a DataFrame from the dicts.
+
+The finished frame has AnomalyType as a categorical (in ANOMALY_TYPES order)
+and the anomaly flags as bool, False where a detector does not set a flag. The
+other columns keep the dtypes the detectors produced, and the column order is
+the order in which columns first appear, as before.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Optional Arrow output
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+# AnomalyType values, in the order used for the categorical
+ANOMALY_TYPES = [
+    'AIS_Beacon_On',
+    'AIS_Beacon_Off',
+    'Speed',
+    'Slow_Travel',
+    'Course',
+    'Loitering',
+    'Rendezvous',
+    'Identity_Spoofing',
+    'Zone_Violation',
+]
+
+# Boolean flag columns carried by every record
+ANOMALY_FLAGS = ['SpeedAnomaly', 'PositionAnomaly', 'CourseAnomaly', 'BeaconAnomaly']
+
+
+class AnomalyBuilder:
+    """
+    Columnar collector for anomaly records.
+
+    Blocks of records (DataFrames, or dicts of equal-length columns) are added
+    as they are detected and concatenated once by finalize().
+    """
+
+    def __init__(self):
+        self._blocks = []
+        self._count = 0
+        self._frame = None
+
+    def __len__(self):
+        return self._count
+
+    def add(self, records):
+        """
+        Add a block of anomaly records.
+
+        Args:
+            records (DataFrame or dict): Records with an AnomalyType column, or
+                a dict of equal-length columns
+
+        Returns:
+            int: Number of records added
+        """
+        if records is None:
+            return 0
+        if not isinstance(records, pd.DataFrame):
+            records = pd.DataFrame(records)
+        if records.empty:
+            return 0
+
+        self._blocks.append(records)
+        self._count += len(records)
+        self._frame = None
+        return len(records)
+
+    def finalize(self):
+        """
+        Assemble every added block into one DataFrame.
+
+        Returns:
+            DataFrame: All records in the order they were added, with the fixed
+                AnomalyType and flag dtypes (empty if nothing was added)
+        """
+        if self._frame is not None:
+            return self._frame
+        if not self._blocks:
+            return pd.DataFrame()
+
+        frame = pd.concat(self._blocks, ignore_index=True, sort=False)
+
+        for flag in ANOMALY_FLAGS:
+            if flag in frame.columns:
+                frame[flag] = frame[flag].fillna(False).astype(bool)
+            else:
+                frame[flag] = np.zeros(len(frame), dtype=bool)
+
+        anomaly_types = frame['AnomalyType'].astype(str)
+        present = set(anomaly_types.unique())
+        categories = [name for name in ANOMALY_TYPES if name in present]
+        categories += sorted(present.difference(categories))
+        frame['AnomalyType'] = pd.Categorical(anomaly_types, categories=categories)
+
+        # Keep the assembled frame as the only block, so finalize() is cheap
+        # to call again and later add() calls extend it
+        self._blocks = [frame]
+        self._frame = frame
+        logger.info(f"Assembled {len(frame)} anomaly records from detector output")
+        return frame
+
+    def to_arrow(self):
+        """
+        Assemble the records into an Arrow table.
+
+        Returns:
+            pyarrow.Table: The finalize() frame, with AnomalyType as a dictionary column
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for Arrow output")
+        return pa.Table.from_pandas(self.finalize(), preserve_index=False)
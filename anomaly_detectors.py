@@ -0,0 +1,1093 @@
+#!/usr/bin/env python3
+"""
+Anomaly Detectors Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module holds the vectorized anomaly detectors used by the day-pair loop in
+SFD._process_anomaly_detection. Each detector works on whole columns of a day's
+data instead of looping over vessels, and returns its anomalies as a DataFrame
+with the same record layout the loop has always produced (the report columns of
+the triggering position plus AnomalyType, the anomaly flags, Date and
+ReportDate).
+
+Daily frames arrive sorted by MMSI and BaseDateTime (see
+day_cache.normalize_partition), so every vessel's reports form one contiguous,
+time-ordered run and first/last positions can be read off the run boundaries.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from geo_kernels import haversine, EARTH_RADIUS_NM
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# AIS true heading value meaning "not available"
+HEADING_NOT_AVAILABLE = 511
+
+# Columns carried between days for the rolling loitering windows
+LOITERING_COLUMNS = ['MMSI', 'BaseDateTime', 'LAT', 'LON']
+
+# Columns the last-seen table (VesselState.vessels) adds to each vessel's last report
+LAST_SEEN_COLUMNS = ['LastSeenDate', 'LastZone']
+
+# Largest number of positions gathered at once for exact window checks
+_WINDOW_CHUNK = 4_000_000
+
+# Shortest track, in hours of reports, judged by the slow travel check
+TRAVEL_MIN_TRACK_HOURS = 12.0
+
+# Mean SOG in knots below which a vessel counts as stationary (moored or at
+# anchor) and is not judged by the slow travel check
+TRAVEL_STATIONARY_SOG_KNOTS = 1.0
+
+# Identity columns that must not change within one MMSI, with the
+# SpoofingIssue name used when they do
+IDENTITY_COLUMNS = {
+    'VesselName': 'multiple_vessel_names',
+    'IMO': 'multiple_imos',
+    'CallSign': 'multiple_call_signs',
+    'VesselType': 'multiple_vessel_types',
+}
+
+# Shortest jump between consecutive reports checked for impossible speed
+TELEPORT_MIN_DISTANCE_NM = 5.0
+
+# Rendezvous positions are averaged over time slots of this many minutes
+RENDEZVOUS_SLOT_MINUTES = 10
+
+# Grid cells are indexed with 21 bits per axis of the Earth-centred cube
+_CELL_BITS = 21
+_CELL_BIAS = 1 << (_CELL_BITS - 1)
+
+# Neighbouring cells visited from each cell; together with the cell itself
+# every pair of adjacent cells is visited exactly once
+_HALF_NEIGHBOURS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                    if (dx, dy, dz) > (0, 0, 0)]
+
+
+def _sort_order(df):
+    """
+    Row order that sorts a day by MMSI and BaseDateTime.
+
+    Args:
+        df (DataFrame): Day of AIS reports
+
+    Returns:
+        numpy.ndarray or None: Positional order, or None if already sorted
+    """
+    mmsi = df['MMSI'].to_numpy()
+    times = df['BaseDateTime'].to_numpy().view('int64')
+    if len(mmsi) < 2:
+        return None
+    same_vessel = mmsi[1:] == mmsi[:-1]
+    if (mmsi[1:] >= mmsi[:-1]).all() and (times[1:] >= times[:-1])[same_vessel].all():
+        return None
+    # NaT sorts last, as with sort_values
+    times = np.where(df['BaseDateTime'].isna().to_numpy(), np.iinfo(np.int64).max, times)
+    return np.lexsort((times, mmsi))
+
+
+def first_last_positions(df):
+    """
+    First and last report of every vessel in a day.
+
+    Args:
+        df (DataFrame): Day of AIS reports
+
+    Returns:
+        tuple: (first, last) DataFrames with one row per MMSI, in MMSI order
+    """
+    if df is None or df.empty:
+        return df, df
+
+    order = _sort_order(df)
+    mmsi = df['MMSI'].to_numpy()
+    if order is not None:
+        mmsi = mmsi[order]
+
+    starts = np.flatnonzero(np.r_[True, mmsi[1:] != mmsi[:-1]])
+    ends = np.r_[starts[1:] - 1, len(mmsi) - 1]
+    if order is not None:
+        starts, ends = order[starts], order[ends]
+
+    first = df.iloc[starts].reset_index(drop=True)
+    last = df.iloc[ends].reset_index(drop=True)
+    return first, last
+
+
+def angle_difference(angle1, angle2):
+    """
+    Signed difference between two angles, normalized to [-180, 180) degrees.
+
+    Inputs are widened to float64 first, so the result is exact for float32
+    columns.
+
+    Args:
+        angle1 (array-like): Angles in degrees
+        angle2 (array-like): Angles in degrees
+
+    Returns:
+        numpy.ndarray: angle1 - angle2, wrapped into [-180, 180)
+    """
+    diff = np.asarray(angle1, dtype=np.float64) - np.asarray(angle2, dtype=np.float64)
+    return ((diff + 180) % 360) - 180
+
+
+class _WindowIndexer(BaseIndexer):
+    """Rolling window bounds given as explicit start/end row arrays."""
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        return self.start, self.end
+
+
+def tag_anomalies(rows, anomaly_type, current_date, report_date, **values):
+    """
+    Turn triggering positions into anomaly records.
+
+    Args:
+        rows (DataFrame): Positions that triggered the anomaly
+        anomaly_type (str): AnomalyType value
+        current_date (date): Day being analysed
+        report_date (str): Day being analysed as YYYY-MM-DD
+        **values: Anomaly flags and extra columns (scalars or arrays aligned
+            with rows), in record order
+
+    Returns:
+        DataFrame: Anomaly records
+    """
+    columns = {'AnomalyType': anomaly_type}
+    columns.update(values)
+    columns['Date'] = current_date
+    columns['ReportDate'] = report_date
+    return rows.assign(**columns)
+
+
+def _join_last_seen(last_seen, mmsi):
+    """
+    Rows of the last-seen table holding the given vessels.
+
+    The table is in MMSI order, so the join is one binary search per vessel.
+
+    Args:
+        last_seen (DataFrame or None): Last report of every vessel, in MMSI order
+        mmsi (array-like): MMSIs to look up
+
+    Returns:
+        tuple: (positions, found) arrays aligned with mmsi; positions are only
+            meaningful where found is True
+    """
+    mmsi = np.asarray(mmsi)
+    if last_seen is None or last_seen.empty:
+        return np.zeros(len(mmsi), dtype=np.intp), np.zeros(len(mmsi), dtype=bool)
+
+    known = last_seen['MMSI'].to_numpy()
+    positions = np.minimum(np.searchsorted(known, mmsi), len(known) - 1)
+    return positions, known[positions] == mmsi
+
+
+def detect_beacon_on(first_current, last_seen, current_date, report_date, threshold_minutes):
+    """
+    Vessels whose AIS comes back on after a gap, however many days it spans.
+
+    The gap runs from the vessel's last report before the current day to its
+    first report on it. Vessels never seen before have no last report; for
+    them the gap is measured from the start of the current day.
+
+    Args:
+        first_current (DataFrame): First report of each vessel on the current day
+        last_seen (DataFrame or None): Last report of every vessel seen before
+            the current day, in MMSI order (VesselState.vessels)
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        threshold_minutes (float): Minimum gap in minutes
+
+    Returns:
+        DataFrame: AIS_Beacon_On records
+    """
+    positions, found = _join_last_seen(last_seen, first_current['MMSI'].to_numpy())
+    logger.info(f"Found {int((~found).sum())} vessels reporting for the first time and "
+                f"{int(found.sum())} returning vessels")
+
+    day_start = pd.Timestamp(current_date).replace(hour=0, minute=0, second=0)
+    since = np.full(len(first_current), day_start.to_datetime64(), dtype='datetime64[ns]')
+    if found.any():
+        since[found] = last_seen['BaseDateTime'].to_numpy()[positions[found]]
+    gap = (first_current['BaseDateTime'].to_numpy() - since) / np.timedelta64(1, 'm')
+    confirmed = gap >= threshold_minutes
+
+    logger.info(f"Confirmed {int(confirmed.sum())} vessels with AIS beacon on "
+                f"(gap >= {threshold_minutes/60:.1f} hours)")
+    return tag_anomalies(first_current[confirmed], 'AIS_Beacon_On', current_date, report_date,
+                         SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False, BeaconAnomaly=True,
+                         BeaconGapMinutes=gap[confirmed])
+
+
+def detect_beacon_off(last_seen, current_mmsi, previous_date, current_date, report_date,
+                      threshold_minutes):
+    """
+    Vessels whose AIS has been off for threshold_minutes by the end of the current day.
+
+    Silence is measured from each vessel's last report, on whichever day that
+    was, to the end of the current day, so a vessel that stays dark for whole
+    days is still caught. A vessel is reported once, on the first analysed day
+    its silence reaches the threshold: when it was last seen on the previous
+    day, or when its silence at the end of the previous day was still short of
+    the threshold.
+
+    Args:
+        last_seen (DataFrame or None): Last report of every vessel seen before
+            the current day, in MMSI order, with a LastSeenDate column
+            (VesselState.vessels)
+        current_mmsi (array-like): MMSIs seen on the current day
+        previous_date (date): Previous day analysed
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        threshold_minutes (float): Minimum gap in minutes
+
+    Returns:
+        DataFrame: AIS_Beacon_Off records (the last report of each vessel)
+    """
+    if last_seen is None or last_seen.empty:
+        return pd.DataFrame()
+
+    positions, found = _join_last_seen(last_seen, current_mmsi)
+    absent = np.ones(len(last_seen), dtype=bool)
+    absent[positions[found]] = False
+    logger.info(f"Found {int(absent.sum())} known vessels without reports on the current day")
+
+    last_report = last_seen['BaseDateTime'].to_numpy()
+    current_end = pd.Timestamp(current_date).replace(hour=23, minute=59, second=59).to_datetime64()
+    previous_end = pd.Timestamp(previous_date).replace(hour=23, minute=59, second=59).to_datetime64()
+    gap = (current_end - last_report) / np.timedelta64(1, 'm')
+    previous_gap = (previous_end - last_report) / np.timedelta64(1, 'm')
+    # Vessels absent on the previous day were already checked against it
+    newly_dark = (last_seen['LastSeenDate'] == previous_date).to_numpy() | (previous_gap < threshold_minutes)
+    confirmed = absent & newly_dark & (gap >= threshold_minutes)
+
+    logger.info(f"Confirmed {int(confirmed.sum())} vessels with AIS beacon off "
+                f"(gap >= {threshold_minutes/60:.1f} hours)")
+    disappeared = last_seen[confirmed].drop(columns=LAST_SEEN_COLUMNS, errors='ignore')
+    return tag_anomalies(disappeared.reset_index(drop=True), 'AIS_Beacon_Off', current_date, report_date,
+                         SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False, BeaconAnomaly=True,
+                         BeaconGapMinutes=gap[confirmed])
+
+
+def detect_position_jumps(last_previous, first_current, current_date, report_date,
+                          time_threshold_minutes, speed_threshold, haversine):
+    """
+    Vessels whose position jumps implausibly far across midnight.
+
+    The last report of each vessel on the previous day is joined with its first
+    report on the current day. Pairs further apart than time_threshold_minutes
+    are skipped as data gaps; the rest are flagged when the implied speed
+    between the two positions exceeds speed_threshold.
+
+    Args:
+        last_previous (DataFrame): Last report of each vessel on the previous day
+        first_current (DataFrame): First report of each vessel on the current day
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        time_threshold_minutes (float): Maximum time between the two reports
+        speed_threshold (float): Implied speed in knots above which a jump is flagged
+        haversine (callable): Takes a DataFrame with LAT1, LON1, LAT2, LON2
+            columns and returns distances in nautical miles
+
+    Returns:
+        DataFrame: Speed records (the current day's first report of each vessel)
+    """
+    previous = last_previous[['MMSI', 'BaseDateTime', 'LAT', 'LON']]
+    pairs = first_current.merge(previous, on='MMSI', how='inner', suffixes=('', '_prev'))
+
+    # Skip if positions are too far apart in time (e.g., data gaps)
+    time_diff = (pairs['BaseDateTime'] - pairs['BaseDateTime_prev']).dt.total_seconds() / 60
+    in_window = (time_diff <= time_threshold_minutes).to_numpy()
+    pairs = pairs[in_window]
+    time_diff = time_diff.to_numpy()[in_window]
+    if pairs.empty:
+        return first_current.iloc[0:0]
+
+    distance = haversine(pd.DataFrame({
+        'LAT1': pairs['LAT_prev'].to_numpy(),
+        'LON1': pairs['LON_prev'].to_numpy(),
+        'LAT2': pairs['LAT'].to_numpy(),
+        'LON2': pairs['LON'].to_numpy(),
+    })).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied_speed = distance / (time_diff / 60)  # Convert minutes to hours for knots
+    jumps = implied_speed > speed_threshold
+
+    return tag_anomalies(pairs.loc[jumps, first_current.columns], 'Speed', current_date, report_date,
+                         SpeedAnomaly=True, PositionAnomaly=False, CourseAnomaly=False,
+                         Distance=distance[jumps], TimeDiff=time_diff[jumps],
+                         ImpliedSpeed=implied_speed[jumps])
+
+
+def track_segments(df):
+    """
+    Every segment between consecutive reports of the same vessel.
+
+    One haversine pass over the day sorted by MMSI and BaseDateTime; segments
+    touching a report without a time are left out.
+
+    Args:
+        df (DataFrame): Day of AIS reports
+
+    Returns:
+        tuple: (rows, mmsi, pair, distance, time_diff, implied_speed) where rows
+            maps sorted positions to positional rows of df, mmsi is in sorted
+            order, and segment k runs from sorted position pair[k] to
+            pair[k] + 1 with its distance in nautical miles, time difference
+            in minutes and implied speed in knots (inf for a move between
+            reports at the same instant)
+    """
+    order = _sort_order(df)
+    rows = np.arange(len(df)) if order is None else order
+    mmsi = df['MMSI'].to_numpy()[rows]
+    times = df['BaseDateTime'].to_numpy()[rows]
+    pair = np.flatnonzero((mmsi[1:] == mmsi[:-1]) & ~np.isnat(times[1:]) & ~np.isnat(times[:-1]))
+
+    lat = df['LAT'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    lon = df['LON'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    distance = haversine(lat[pair], lon[pair], lat[pair + 1], lon[pair + 1])
+    time_diff = (times[pair + 1] - times[pair]) / np.timedelta64(1, 'm')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        implied_speed = distance / (time_diff / 60)  # Convert minutes to hours for knots
+    return rows, mmsi, pair, distance, time_diff, implied_speed
+
+
+def detect_speed_events(df_current, current_date, report_date, time_threshold_minutes, speed_threshold,
+                        segments=None):
+    """
+    Position jumps between consecutive reports within the current day.
+
+    Every segment of every vessel's track is measured at once (see
+    track_segments). Segments longer than time_threshold_minutes are skipped
+    as data gaps, and segments between reports at the same instant are left
+    to the identity spoofing check. A segment is anomalous when its implied
+    speed exceeds speed_threshold; a run of consecutive anomalous segments of
+    one vessel (a jump away and back, say) is merged into one event, recorded
+    at the report that ends its first segment.
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        time_threshold_minutes (float): Maximum time between the two reports
+        speed_threshold (float): Implied speed in knots above which a jump is flagged
+        segments (tuple, optional): track_segments(df_current), if already computed
+
+    Returns:
+        DataFrame: Speed records with the event's total Distance and TimeDiff,
+            its fastest segment as ImpliedSpeed, SegmentCount and EventEndTime
+    """
+    rows, mmsi, pair, distance, time_diff, implied_speed = segments or track_segments(df_current)
+    with np.errstate(invalid='ignore'):
+        fast = (time_diff > 0) & (time_diff <= time_threshold_minutes) & (implied_speed > speed_threshold)
+    pair, distance, time_diff, implied_speed = pair[fast], distance[fast], time_diff[fast], implied_speed[fast]
+    if len(pair) == 0:
+        return df_current.iloc[0:0]
+
+    # Consecutive segments share a report, so a run continues while pair steps by one
+    event_start = np.flatnonzero(np.r_[True, pair[1:] != pair[:-1] + 1])
+    segment_count = np.diff(np.r_[event_start, len(pair)])
+    event_end = pair[event_start + segment_count - 1] + 1
+    times = df_current['BaseDateTime'].to_numpy()[rows]
+
+    logger.info(f"Found {len(event_start)} intra-day speed events from {len(pair)} segments")
+    return tag_anomalies(df_current.iloc[rows[pair[event_start] + 1]], 'Speed', current_date, report_date,
+                         SpeedAnomaly=True, PositionAnomaly=False, CourseAnomaly=False,
+                         Distance=np.add.reduceat(distance, event_start),
+                         TimeDiff=np.add.reduceat(time_diff, event_start),
+                         ImpliedSpeed=np.maximum.reduceat(implied_speed, event_start),
+                         SegmentCount=segment_count,
+                         EventEndTime=times[event_end])
+
+
+def daily_track_lengths(df, speed_threshold=None, segments=None):
+    """
+    Distance each vessel travelled over the day.
+
+    The segment distances from track_segments are summed per vessel with one
+    bincount over the sorted day. Segments that cannot be sailed (between
+    reports at the same instant, or above speed_threshold) are left out, so a
+    single position glitch does not add hundreds of miles to a track; those
+    are reported by the speed and spoofing checks instead.
+
+    Args:
+        df (DataFrame): Day of AIS reports
+        speed_threshold (float, optional): Implied speed in knots above which a
+            segment is not counted
+        segments (tuple, optional): track_segments(df), if already computed
+
+    Returns:
+        DataFrame: TravelDistanceNM, TrackHours (first to last report),
+            ReportCount and MeanSOG (NaN without SOG reports), indexed by MMSI
+            in MMSI order
+    """
+    rows, mmsi, pair, distance, time_diff, implied_speed = segments or track_segments(df)
+    new_vessel = np.r_[True, mmsi[1:] != mmsi[:-1]][:len(mmsi)]
+    starts = np.flatnonzero(new_vessel)
+    ends = np.r_[starts[1:], len(mmsi)] - 1
+    vessel = np.cumsum(new_vessel) - 1
+
+    with np.errstate(invalid='ignore'):
+        sailed = time_diff > 0
+        if speed_threshold is not None:
+            sailed &= implied_speed <= speed_threshold
+    travelled = np.bincount(vessel[pair[sailed]], weights=distance[sailed], minlength=len(starts))
+
+    mean_sog = np.full(len(starts), np.nan)
+    if 'SOG' in df.columns:
+        sog = df['SOG'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+        reported = ~np.isnan(sog)
+        counts = np.bincount(vessel[reported], minlength=len(starts))
+        totals = np.bincount(vessel[reported], weights=sog[reported], minlength=len(starts))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_sog = totals / counts
+
+    times = df['BaseDateTime'].to_numpy()[rows]
+    return pd.DataFrame({
+        'TravelDistanceNM': travelled,
+        'TrackHours': (times[ends] - times[starts]) / np.timedelta64(1, 'h'),
+        'ReportCount': ends - starts + 1,
+        'MeanSOG': mean_sog,
+    }, index=pd.Index(mmsi[starts], name='MMSI'))
+
+
+def _travel_records(first_current, track_lengths, selected, anomaly_type, current_date, report_date):
+    """Records at each selected vessel's first report carrying its daily track figures."""
+    lengths = track_lengths.reindex(first_current['MMSI'].to_numpy())
+    selected = selected(lengths).to_numpy()
+    lengths = lengths[selected]
+    return tag_anomalies(first_current[selected], anomaly_type, current_date, report_date,
+                         SpeedAnomaly=True, PositionAnomaly=False, CourseAnomaly=False,
+                         TravelDistanceNM=lengths['TravelDistanceNM'].to_numpy(),
+                         TrackHours=lengths['TrackHours'].to_numpy(),
+                         ReportCount=lengths['ReportCount'].to_numpy(),
+                         MeanSOG=lengths['MeanSOG'].to_numpy())
+
+
+def detect_excessive_travel_fast(first_current, track_lengths, current_date, report_date, max_travel_nm):
+    """
+    Vessels that covered more than max_travel_nm over the day.
+
+    Args:
+        first_current (DataFrame): First report of each vessel on the current day
+        track_lengths (DataFrame): daily_track_lengths of the current day
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        max_travel_nm (float): Longest plausible daily track in nautical miles
+
+    Returns:
+        DataFrame: Speed records with TravelDistanceNM, TrackHours and ReportCount
+    """
+    records = _travel_records(first_current, track_lengths,
+                              lambda lengths: lengths['TravelDistanceNM'] > max_travel_nm,
+                              'Speed', current_date, report_date)
+    logger.info(f"Found {len(records)} vessels travelling more than {max_travel_nm} nm")
+    return records
+
+
+def detect_excessive_travel_slow(first_current, track_lengths, current_date, report_date, min_travel_nm,
+                                 min_track_hours=TRAVEL_MIN_TRACK_HOURS,
+                                 stationary_sog=TRAVEL_STATIONARY_SOG_KNOTS):
+    """
+    Underway vessels that covered less than expected for the time they were tracked.
+
+    min_travel_nm is the distance expected over 24 hours; each vessel is held
+    to the share of it matching its track duration, so a vessel tracked for 12
+    hours is expected to cover half of it. Only vessels tracked for at least
+    min_track_hours are judged, and vessels whose mean SOG shows they were
+    stationary (moored or at anchor) are skipped.
+
+    Args:
+        first_current (DataFrame): First report of each vessel on the current day
+        track_lengths (DataFrame): daily_track_lengths of the current day
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        min_travel_nm (float): Shortest expected track over 24 hours in nautical miles
+        min_track_hours (float, optional): Shortest track duration judged
+        stationary_sog (float, optional): Mean SOG in knots below which a
+            vessel is stationary
+
+    Returns:
+        DataFrame: Slow_Travel records with TravelDistanceNM, TrackHours, ReportCount and MeanSOG
+    """
+    def selected(lengths):
+        expected = min_travel_nm * lengths['TrackHours'] / 24
+        stationary = lengths['MeanSOG'] < stationary_sog
+        return (lengths['TravelDistanceNM'] < expected) & (lengths['TrackHours'] >= min_track_hours) & ~stationary
+
+    records = _travel_records(first_current, track_lengths, selected, 'Slow_Travel', current_date, report_date)
+    logger.info(f"Found {len(records)} underway vessels travelling less than {min_travel_nm} nm per 24 hours "
+                f"over at least {min_track_hours} hours")
+    return records
+
+
+def detect_course_heading_mismatch(df, current_date, report_date, min_speed, max_diff):
+    """
+    Reports whose course over ground disagrees with the vessel's heading.
+
+    Only reports at or above min_speed with both COG and Heading available are
+    checked; a Heading of 511 means "not available" and is skipped.
+
+    Args:
+        df (DataFrame): Current day of AIS reports
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        min_speed (float): Minimum SOG in knots for the check
+        max_diff (float): Largest allowed COG/Heading difference in degrees
+
+    Returns:
+        DataFrame: Course records with CourseHeadingDiff
+    """
+    cog = df['COG'].to_numpy(dtype=np.float64, na_value=np.nan)
+    heading = df['Heading'].to_numpy(dtype=np.float64, na_value=np.nan)
+    sog = df['SOG'].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    diff = angle_difference(cog, heading)
+    with np.errstate(invalid='ignore'):
+        anomalous = (sog >= min_speed) & (heading != HEADING_NOT_AVAILABLE) & (np.abs(diff) > max_diff)
+
+    rows = df[anomalous].assign(CourseHeadingDiff=diff[anomalous].astype(df['COG'].dtype))
+    return tag_anomalies(rows, 'Course', current_date, report_date,
+                         SpeedAnomaly=False, PositionAnomaly=False, CourseAnomaly=True)
+
+
+def loitering_carry(positions, cutoff):
+    """
+    Positions to carry into the next day's loitering windows.
+
+    Keeps every report at or after cutoff plus each vessel's last report before
+    it, which is where a window ending early on the next day starts.
+
+    Args:
+        positions (DataFrame): Reports sorted by MMSI and BaseDateTime
+        cutoff (Timestamp): Start of the next day minus the loitering duration
+
+    Returns:
+        DataFrame: LOITERING_COLUMNS of the carried reports, in the same order
+    """
+    positions = positions[LOITERING_COLUMNS]
+    if positions.empty:
+        return positions.reset_index(drop=True)
+
+    mmsi = positions['MMSI'].to_numpy()
+    before = (positions['BaseDateTime'] < cutoff).to_numpy()
+    vessel_end = np.r_[mmsi[1:] != mmsi[:-1], True]
+    last_before = before & (vessel_end | ~np.r_[before[1:], False])
+    return positions[~before | last_before].reset_index(drop=True)
+
+
+def _loitering_positions(df_current, carried):
+    """
+    Carried and current reports merged in MMSI and time order.
+
+    Returns:
+        tuple: (positions with a _row column giving the row in df_current, -1
+            for carried reports; their MMSIs as int64; their times in microseconds)
+    """
+    current = df_current[LOITERING_COLUMNS].assign(_row=np.arange(len(df_current)))
+    frames = [current] if carried is None or carried.empty else [carried.assign(_row=-1), current]
+    positions = pd.concat(frames, ignore_index=True).dropna(subset=['BaseDateTime', 'LAT', 'LON'])
+
+    mmsi = positions['MMSI'].to_numpy().astype(np.int64)
+    times = positions['BaseDateTime'].to_numpy().astype('datetime64[us]').view(np.int64)
+    if _sort_order(df_current) is None:
+        # Both parts are sorted and carried reports precede the current day, so
+        # a stable sort on MMSI only has to merge two runs
+        order = np.argsort(mmsi, kind='stable')
+    else:
+        order = np.lexsort((times, mmsi))
+    return positions.iloc[order].reset_index(drop=True), mmsi[order], times[order]
+
+
+def loitering_tail(df_current, carried, current_date, duration_hours):
+    """
+    Positions detect_loitering carries into the next day, without detecting.
+
+    Lets a caller that runs the detection elsewhere keep the carried positions
+    day by day.
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        carried (DataFrame): Earlier reports from loitering_carry
+        current_date (date): Current day
+        duration_hours (float): Window length in hours
+
+    Returns:
+        DataFrame: The positions detect_loitering would return for the next day
+    """
+    positions, _, _ = _loitering_positions(df_current, carried)
+    cutoff = pd.Timestamp(current_date) + pd.Timedelta(days=1) - pd.Timedelta(hours=duration_hours)
+    return loitering_carry(positions, cutoff)
+
+
+def _window_max_distance(lat, lon, starts, ends, center_lat, center_lon):
+    """Largest distance from each window's center to the positions start..end (inclusive)."""
+    result = np.empty(len(starts))
+    lengths = ends - starts + 1
+    chunk_start = 0
+    while chunk_start < len(starts):
+        # Gather whole windows, at most _WINDOW_CHUNK positions at a time
+        total = np.cumsum(lengths[chunk_start:])
+        chunk_end = chunk_start + max(1, int(np.searchsorted(total, _WINDOW_CHUNK, side='right')))
+        chunk = slice(chunk_start, chunk_end)
+        offsets = np.r_[0, np.cumsum(lengths[chunk])[:-1]]
+        index = np.repeat(starts[chunk] - offsets, lengths[chunk]) + np.arange(lengths[chunk].sum())
+        distance = haversine(np.repeat(center_lat[chunk], lengths[chunk]),
+                             np.repeat(center_lon[chunk], lengths[chunk]), lat[index], lon[index])
+        result[chunk] = np.maximum.reduceat(distance, offsets)
+        chunk_start = chunk_end
+    return result
+
+
+def detect_loitering(df_current, carried, current_date, report_date, radius_nm, duration_hours,
+                     min_records=10):
+    """
+    Vessels that stay within a small area for a full rolling time window.
+
+    Every report on the current day closes a window reaching back to the
+    vessel's last report at least duration_hours earlier, which may lie on an
+    earlier day through the carried positions. A vessel loiters when such a
+    window holds at least min_records reports that all lie within radius_nm of
+    their centroid. Rolling bounding boxes settle most windows without looking
+    at their positions; only windows whose box straddles the radius are
+    checked point by point.
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        carried (DataFrame): Earlier reports from loitering_carry
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        radius_nm (float): Loitering radius in nautical miles
+        duration_hours (float): Window length in hours
+        min_records (int, optional): Minimum reports in a window
+
+    Returns:
+        tuple: (Loitering records, one per vessel at the report where loitering
+            is first confirmed, and the positions to carry into the next day)
+    """
+    duration = pd.Timedelta(hours=duration_hours)
+    positions, mmsi, times = _loitering_positions(df_current, carried)
+    lat = positions['LAT'].to_numpy(dtype=np.float64)
+    lon = positions['LON'].to_numpy(dtype=np.float64)
+    rows = positions['_row'].to_numpy()
+
+    next_carry = loitering_carry(positions, pd.Timestamp(current_date) + pd.Timedelta(days=1) - duration)
+    empty = df_current.iloc[0:0]
+    if positions.empty:
+        return empty, next_carry
+
+    # Window start: the vessel's last report at least `duration` before each report
+    new_vessel = np.r_[True, mmsi[1:] != mmsi[:-1]]
+    vessel = np.cumsum(new_vessel) - 1
+    vessel_first = np.flatnonzero(new_vessel)[vessel]
+    duration_us = int(duration / pd.Timedelta(microseconds=1))
+    elapsed = times - times.min()
+    key = vessel * (elapsed.max() + duration_us + 1) + elapsed
+    starts = np.searchsorted(key, key - duration_us, side='right') - 1
+    complete = starts >= vessel_first
+    starts = np.where(complete, starts, vessel_first)
+    ends = np.arange(len(positions))
+    counts = ends - starts + 1
+
+    candidates = np.flatnonzero(complete & (rows >= 0) & (counts >= min_records))
+    if len(candidates) == 0:
+        return empty, next_carry
+
+    # Rolling bounding box and centroid of every window
+    indexer = _WindowIndexer(start=starts, end=ends + 1)
+    lat_rolling = pd.Series(lat).rolling(indexer, min_periods=1)
+    lon_rolling = pd.Series(lon).rolling(indexer, min_periods=1)
+    lat_min, lat_max = lat_rolling.min().to_numpy()[candidates], lat_rolling.max().to_numpy()[candidates]
+    lon_min, lon_max = lon_rolling.min().to_numpy()[candidates], lon_rolling.max().to_numpy()[candidates]
+    lat_sum, lon_sum = np.r_[0, np.cumsum(lat)], np.r_[0, np.cumsum(lon)]
+    c_starts, c_ends, c_counts = starts[candidates], ends[candidates], counts[candidates]
+    center_lat = (lat_sum[c_ends + 1] - lat_sum[c_starts]) / c_counts
+    center_lon = (lon_sum[c_ends + 1] - lon_sum[c_starts]) / c_counts
+
+    # The box extremes are real reports, so their distance from the meridian
+    # and parallel through the centroid bounds the window radius from below;
+    # the box corners bound it from above
+    lat_reach = np.radians(np.maximum(lat_max - center_lat, center_lat - lat_min))
+    lon_reach = np.radians(np.minimum(np.maximum(lon_max - center_lon, center_lon - lon_min), 90))
+    lower = EARTH_RADIUS_NM * np.maximum(
+        lat_reach, np.arcsin(np.minimum(1.0, np.cos(np.radians(center_lat)) * np.sin(lon_reach))))
+    upper = np.maximum.reduce([haversine(center_lat, center_lon, corner_lat, corner_lon)
+                               for corner_lat in (lat_min, lat_max) for corner_lon in (lon_min, lon_max)])
+
+    loitering = upper < radius_nm
+    straddling = np.flatnonzero(~loitering & (lower < radius_nm))
+    if len(straddling):
+        loitering[straddling] = _window_max_distance(
+            lat, lon, c_starts[straddling], c_ends[straddling],
+            center_lat[straddling], center_lon[straddling]) < radius_nm
+
+    # First confirmed window of each vessel
+    hits = np.flatnonzero(loitering)
+    if len(hits) == 0:
+        return empty, next_carry
+    hits = hits[np.unique(vessel[candidates[hits]], return_index=True)[1]]
+    logger.info(f"Found {len(hits)} vessels loitering within {radius_nm} nm for {duration_hours} hours")
+
+    radius = _window_max_distance(lat, lon, c_starts[hits], c_ends[hits], center_lat[hits], center_lon[hits])
+    span_hours = (times[c_ends[hits]] - times[c_starts[hits]]) / 3.6e9
+    records = tag_anomalies(df_current.iloc[rows[candidates[hits]]], 'Loitering', current_date, report_date,
+                            SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False,
+                            LoiteringRadiusNM=radius, LoiteringDurationHours=span_hours,
+                            LoiteringRecordCount=c_counts[hits])
+    return records, next_carry
+
+
+def _slot_positions(df, day_start, slot_minutes):
+    """
+    Average position of every vessel in every time slot of a day.
+
+    Args:
+        df (DataFrame): Day of AIS reports
+        day_start (Timestamp): Start of the day
+        slot_minutes (float): Slot width in minutes
+
+    Returns:
+        dict: Arrays mmsi, slot, lat, lon, row (position in df of the
+            vessel's first report in the slot) and first/last (report times in
+            ns since day_start), one entry per vessel and slot
+    """
+    valid = (df['LAT'].notna() & df['LON'].notna() & df['BaseDateTime'].notna()).to_numpy()
+    rows = np.flatnonzero(valid)
+    order = _sort_order(df)
+    if order is not None:
+        rows = order[valid[order]]
+
+    mmsi = df['MMSI'].to_numpy()[rows]
+    elapsed = (df['BaseDateTime'].to_numpy()[rows] - np.datetime64(day_start, 'ns')).astype(np.int64)
+    slot = elapsed // int(slot_minutes * 60e9)
+    lat = df['LAT'].to_numpy(dtype=np.float64)[rows]
+    lon = df['LON'].to_numpy(dtype=np.float64)[rows]
+
+    if len(rows) == 0:
+        return {'mmsi': mmsi, 'slot': slot, 'lat': lat, 'lon': lon, 'row': rows,
+                'first': elapsed, 'last': elapsed}
+
+    starts = np.flatnonzero(np.r_[True, (mmsi[1:] != mmsi[:-1]) | (slot[1:] != slot[:-1])])
+    counts = np.diff(np.r_[starts, len(rows)])
+    return {
+        'mmsi': mmsi[starts],
+        'slot': slot[starts],
+        'lat': np.add.reduceat(lat, starts) / counts,
+        'lon': np.add.reduceat(lon, starts) / counts,
+        'row': rows[starts],
+        'first': elapsed[starts],
+        'last': elapsed[np.r_[starts[1:], len(rows)] - 1],
+    }
+
+
+def _cell_pairs(cell_start, cell_count, first_cell, second_cell):
+    """Every pairing of a position in first_cell with a position in second_cell."""
+    sizes = cell_count[first_cell] * cell_count[second_cell]
+    pair = np.repeat(np.arange(len(sizes)), sizes)
+    within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    width = cell_count[second_cell][pair]
+    return (cell_start[first_cell][pair] + within // width,
+            cell_start[second_cell][pair] + within % width)
+
+
+def _grid_pairs(slot, lat, lon, cell_nm):
+    """
+    Candidate pairs of positions in the same slot and in adjacent grid cells.
+
+    Positions are placed on a cubic grid over Earth-centred coordinates with
+    cells at least cell_nm wide. Any two positions less than cell_nm apart lie
+    in the same or adjacent cells, so only those pairs are produced. Each slot
+    is matched on its own so the cell lookups stay small.
+
+    Args:
+        slot (numpy.ndarray): Time slot of each position
+        lat (numpy.ndarray): Latitudes in degrees
+        lon (numpy.ndarray): Longitudes in degrees
+        cell_nm (float): Search distance in nautical miles
+
+    Returns:
+        tuple: (first, second) index arrays of the candidate pairs
+    """
+    cell_nm = max(cell_nm, 2 * EARTH_RADIUS_NM / (1 << (_CELL_BITS - 2)))
+    phi, lam = np.radians(lat), np.radians(lon)
+    xyz = np.stack([np.cos(phi) * np.cos(lam), np.cos(phi) * np.sin(lam), np.sin(phi)])
+    cells = np.floor(xyz * (EARTH_RADIUS_NM / cell_nm)).astype(np.int64) + _CELL_BIAS
+    key = (cells[0] << 2 * _CELL_BITS) | (cells[1] << _CELL_BITS) | cells[2]
+
+    # Group by slot (a radix sort for a day's worth of slots), then sort each
+    # slot by cell
+    slot = slot - slot.min()
+    order = np.argsort(slot.astype(np.int16) if slot.max() < (1 << 15) else slot, kind='stable')
+    slot = slot[order]
+    slot_bounds = np.r_[np.flatnonzero(np.r_[True, slot[1:] != slot[:-1]]), len(slot)]
+    for slot_start, slot_end in zip(slot_bounds[:-1], slot_bounds[1:]):
+        segment = order[slot_start:slot_end]
+        order[slot_start:slot_end] = segment[np.argsort(key[segment])]
+    key = key[order]
+
+    first, second = [], []
+    for slot_start, slot_end in zip(slot_bounds[:-1], slot_bounds[1:]):
+        slot_keys = key[slot_start:slot_end]
+        cell_start = np.flatnonzero(np.r_[True, slot_keys[1:] != slot_keys[:-1]])
+        cell_count = np.diff(np.r_[cell_start, len(slot_keys)])
+        cell_keys = slot_keys[cell_start]
+        cell_start = cell_start + slot_start
+
+        # Pairs within a cell
+        shared = np.flatnonzero(cell_count > 1)
+        a, b = _cell_pairs(cell_start, cell_count, shared, shared)
+        first.append(a[a < b])
+        second.append(b[a < b])
+
+        # Pairs with each neighbouring cell
+        for dx, dy, dz in _HALF_NEIGHBOURS:
+            neighbour = cell_keys + ((dx << 2 * _CELL_BITS) + (dy << _CELL_BITS) + dz)
+            match = np.minimum(np.searchsorted(cell_keys, neighbour), len(cell_keys) - 1)
+            occupied = np.flatnonzero(cell_keys[match] == neighbour)
+            a, b = _cell_pairs(cell_start, cell_count, occupied, match[occupied])
+            first.append(a)
+            second.append(b)
+
+    return order[np.concatenate(first)], order[np.concatenate(second)]
+
+
+def detect_rendezvous(df_current, current_date, report_date, proximity_nm, duration_minutes):
+    """
+    Pairs of vessels that stay close together for a sustained period.
+
+    Reports are averaged per vessel over time slots, candidate pairs within a
+    slot come from a spatial grid hash, and only those are measured. A pair is
+    a rendezvous when it stays within proximity_nm over consecutive slots
+    whose reports span at least duration_minutes. The work grows with the number of
+    positions and close pairs rather than with the square of the fleet.
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        proximity_nm (float): Largest distance between the vessels
+        duration_minutes (float): Shortest co-located time
+
+    Returns:
+        DataFrame: Rendezvous records, one per pair and meeting, at the first
+            report of the lower MMSI when the meeting starts
+    """
+    empty = df_current.iloc[0:0]
+    positions = _slot_positions(df_current, pd.Timestamp(current_date), RENDEZVOUS_SLOT_MINUTES)
+    if len(positions['mmsi']) < 2:
+        return empty
+
+    first, second = _grid_pairs(positions['slot'], positions['lat'], positions['lon'], proximity_nm)
+    lat, lon, mmsi = positions['lat'], positions['lon'], positions['mmsi']
+    distance = haversine(lat[first], lon[first], lat[second], lon[second])
+    close = (distance < proximity_nm) & (mmsi[first] != mmsi[second])
+    first, second, distance = first[close], second[close], distance[close]
+    if len(first) == 0:
+        return empty
+
+    # Order each pair by MMSI, then group consecutive slots into meetings
+    swap = mmsi[first] > mmsi[second]
+    first, second = np.where(swap, second, first), np.where(swap, first, second)
+    slot = positions['slot'][first]
+    order = np.lexsort((slot, mmsi[second], mmsi[first]))
+    first, second, slot, distance = first[order], second[order], slot[order], distance[order]
+    new_meeting = np.r_[True, (mmsi[first][1:] != mmsi[first][:-1]) |
+                        (mmsi[second][1:] != mmsi[second][:-1]) | (np.diff(slot) != 1)]
+    meeting = np.cumsum(new_meeting) - 1
+    meeting_start = np.flatnonzero(new_meeting)
+    meeting_end = np.r_[meeting_start[1:], len(first)] - 1
+
+    # Closest approach of each meeting
+    by_distance = np.lexsort((distance, meeting))
+    closest = by_distance[np.r_[True, meeting[by_distance][1:] != meeting[by_distance][:-1]]]
+
+    # Co-located time runs from the later of the two first reports in the first
+    # slot to the earlier of the two last reports in the last slot
+    began = np.maximum(positions['first'][first[meeting_start]], positions['first'][second[meeting_start]])
+    ended = np.minimum(positions['last'][first[meeting_end]], positions['last'][second[meeting_end]])
+    minutes = np.maximum(ended - began, 0) / 60e9
+    sustained = minutes >= duration_minutes
+    meeting_start, closest, minutes = meeting_start[sustained], closest[sustained], minutes[sustained]
+    if len(meeting_start) == 0:
+        return empty
+    logger.info(f"Found {len(meeting_start)} vessel pairs within {proximity_nm} nm "
+                f"for at least {duration_minutes} minutes")
+
+    a, b = first[closest], second[closest]
+    records = tag_anomalies(df_current.iloc[positions['row'][first[meeting_start]]], 'Rendezvous',
+                            current_date, report_date,
+                            SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False,
+                            RendezvousMMSI2=mmsi[second[meeting_start]],
+                            RendezvousDistanceNM=distance[closest],
+                            RendezvousLat=(lat[a] + lat[b]) / 2,
+                            RendezvousLon=(lon[a] + lon[b]) / 2,
+                            RendezvousDurationMinutes=minutes)
+    return records
+
+
+def detect_identity_spoofing(df_current, current_date, report_date, speed_threshold,
+                             min_distance_nm=TELEPORT_MIN_DISTANCE_NM, segments=None):
+    """
+    Vessels whose identity or track cannot belong to a single transmitter.
+
+    Two checks run over the whole day. The first counts distinct values of each
+    identity column per MMSI with one groupby; an MMSI with more than one
+    VesselName, IMO, CallSign or VesselType yields one record at its first
+    report, SpoofingIssue listing the conflicting fields. The second walks
+    consecutive reports of each MMSI and flags transitions covering at least
+    min_distance_nm at an implied speed above speed_threshold (including
+    reports at the same instant from different places), which is what one
+    MMSI broadcast from two ships looks like. Each such MMSI yields one
+    'position_teleport' record at the report that arrived after its first
+    impossible jump, with the number of such jumps in TeleportCount.
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+        speed_threshold (float): Implied speed in knots above which a jump is impossible
+        min_distance_nm (float, optional): Shortest jump considered, so that
+            position noise between closely spaced reports is not flagged
+        segments (tuple, optional): track_segments(df_current), if already computed
+
+    Returns:
+        DataFrame: Identity_Spoofing records
+    """
+    records = []
+
+    # Identity fields that change within one MMSI
+    fields = [column for column in IDENTITY_COLUMNS if column in df_current.columns]
+    if fields and not df_current.empty:
+        counts = df_current.groupby('MMSI', sort=True)[fields].nunique()
+        conflicts = counts > 1
+        flagged = conflicts.any(axis=1)
+        if flagged.any():
+            counts, conflicts = counts[flagged], conflicts[flagged]
+            first, _ = first_last_positions(df_current[df_current['MMSI'].isin(counts.index)])
+            labels = np.array([IDENTITY_COLUMNS[column] for column in fields])
+            values = {'SpoofingIssue': [', '.join(labels[row]) for row in conflicts.to_numpy()]}
+            if 'VesselName' in fields:
+                # First five names in the order they were broadcast
+                names = (df_current.loc[df_current['MMSI'].isin(counts.index), ['MMSI', 'VesselName']]
+                         .dropna().drop_duplicates())
+                names = names.groupby('MMSI', sort=True).head(5).astype({'VesselName': str})
+                values['NameCount'] = counts['VesselName'].to_numpy()
+                values['VesselNames'] = (names.groupby('MMSI', sort=True)['VesselName'].agg(', '.join)
+                                         .reindex(counts.index).to_numpy())
+            for column in fields:
+                if column != 'VesselName':
+                    values[f'{column}Count'] = counts[column].to_numpy()
+            records.append(tag_anomalies(first, 'Identity_Spoofing', current_date, report_date,
+                                         SpeedAnomaly=False, PositionAnomaly=False, CourseAnomaly=False,
+                                         **values))
+
+    # Same MMSI reported from places no ship could travel between
+    rows, mmsi, pair, distance, time_diff, implied_speed = segments or track_segments(df_current)
+    with np.errstate(invalid='ignore'):
+        jumps = (distance >= min_distance_nm) & (implied_speed > speed_threshold)
+    pair, distance, time_diff, implied_speed = pair[jumps], distance[jumps], time_diff[jumps], implied_speed[jumps]
+    if len(pair):
+        # Pairs are in vessel order, so the first jump of each MMSI comes first
+        _, first_jump, jump_count = np.unique(mmsi[pair + 1], return_index=True, return_counts=True)
+        records.append(tag_anomalies(df_current.iloc[rows[pair[first_jump] + 1]], 'Identity_Spoofing',
+                                     current_date, report_date,
+                                     SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False,
+                                     SpoofingIssue='position_teleport',
+                                     TeleportCount=jump_count,
+                                     Distance=distance[first_jump],
+                                     TimeDiff=time_diff[first_jump],
+                                     ImpliedSpeed=implied_speed[first_jump]))
+
+    logger.info(f"Found {sum(len(part) for part in records)} vessels with identity conflicts or impossible jumps")
+    if not records:
+        return df_current.iloc[0:0]
+    return pd.concat(records, ignore_index=True)
+
+
+def detect_zone_violations(df_current, last_previous, zone_index, current_date, report_date):
+    """
+    Visits of vessels to restricted zones.
+
+    Every position is assigned to its zones with zone_index in one pass. Runs
+    of consecutive reports of a vessel inside a zone form a visit; each visit
+    becomes one record at its first report, with how the vessel got there
+    (ZoneEvent: 'enter' after a report outside the zone, 'already_inside' if
+    the previous day's last report was in the zone, 'appeared_inside' with no
+    earlier report), when it left (ZoneExitTime, the first report outside; NaT
+    if it had not left by the end of the day) and how long it stayed
+    (ZoneDwellMinutes, first to last report inside).
+
+    Args:
+        df_current (DataFrame): Current day of AIS reports
+        last_previous (DataFrame): Last report of each vessel on the previous day
+        zone_index (ZoneIndex): Indexed restricted zones
+        current_date (date): Current day
+        report_date (str): Current day as YYYY-MM-DD
+
+    Returns:
+        DataFrame: Zone_Violation records, ordered by zone, MMSI and entry time
+    """
+    empty = df_current.iloc[0:0]
+    order = _sort_order(df_current)
+    rows = np.arange(len(df_current)) if order is None else order
+    lat = df_current['LAT'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    lon = df_current['LON'].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+    point, zone = zone_index.locate(lat, lon)
+    if len(point) == 0:
+        return empty
+
+    mmsi = df_current['MMSI'].to_numpy().astype(np.int64)[rows]
+    times = df_current['BaseDateTime'].to_numpy()[rows]
+    vessel_start = np.r_[True, mmsi[1:] != mmsi[:-1]]
+
+    # Group memberships by zone; a visit continues while the vessel's next
+    # report is in the same zone
+    by_zone = np.lexsort((point, zone))
+    point, zone = point[by_zone], zone[by_zone]
+    continues = np.r_[False, (zone[1:] == zone[:-1]) & (point[1:] == point[:-1] + 1) & ~vessel_start[point[1:]]]
+    visit_start = np.flatnonzero(~continues)
+    visit_end = np.r_[visit_start[1:], len(point)] - 1
+    first, last, visit_zone = point[visit_start], point[visit_end], zone[visit_start]
+
+    # How the vessel came to be inside
+    event = np.where(vessel_start[first], 'appeared_inside', 'enter').astype(object)
+    if last_previous is not None and not last_previous.empty:
+        prev_point, prev_zone = zone_index.locate(last_previous['LAT'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                                  last_previous['LON'].to_numpy(dtype=np.float64, na_value=np.nan))
+        prev_mmsi = last_previous['MMSI'].to_numpy().astype(np.int64)[prev_point]
+        was_inside = np.isin(mmsi[first] * len(zone_index) + visit_zone, prev_mmsi * len(zone_index) + prev_zone)
+        event[vessel_start[first] & was_inside] = 'already_inside'
+
+    # When and whether the vessel left
+    left = last + 1 < len(mmsi)
+    left[left] = ~vessel_start[last[left] + 1]
+    exit_time = np.full(len(last), np.datetime64('NaT'), dtype=times.dtype)
+    exit_time[left] = times[last[left] + 1]
+    dwell = (times[last] - times[first]) / np.timedelta64(1, 'm')
+
+    logger.info(f"Found {len(first)} zone visits by {len(np.unique(mmsi[first]))} vessels")
+    order = np.lexsort((first, visit_zone))
+    first, visit_zone = first[order], visit_zone[order]
+    zones = zone_index.zones
+    return tag_anomalies(df_current.iloc[rows[first]], 'Zone_Violation', current_date, report_date,
+                         SpeedAnomaly=False, PositionAnomaly=True, CourseAnomaly=False,
+                         ZoneName=[zones[z]['name'] for z in visit_zone],
+                         ZoneLatMin=zone_index.lat_min[visit_zone],
+                         ZoneLatMax=zone_index.lat_max[visit_zone],
+                         ZoneLonMin=zone_index.lon_min[visit_zone],
+                         ZoneLonMax=zone_index.lon_max[visit_zone],
+                         ZoneEvent=event[order],
+                         ZoneExitTime=exit_time[order],
+                         ZoneDwellMinutes=dwell[order])
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Anomaly Summary Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module writes and reads the anomaly summary of a run. Next to
+AIS_Anomalies_Summary.csv the run writes AIS_Anomalies_Summary.parquet, which
+keeps the column types (datetimes, dates, the categorical AnomalyType, the bool
+flags) and is sorted by MMSI with row-group statistics, so readers can load
+one vessel without scanning the file. Loaders prefer the parquet file and fall
+back to the CSV for older output directories. Incremental runs append each new
+day to both files with append_anomaly_summary.
+
+The parquet file can also carry a GeoParquet point geometry column (WKB,
+longitude/latitude in OGC:CRS84) for GIS tools. The points are encoded with
+NumPy, so no geometry library is needed.
+"""
+
+import os
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from anomaly_builder import AnomalyBuilder
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Optional parquet support
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# File names of the anomaly summary in an output directory
+SUMMARY_CSV = "AIS_Anomalies_Summary.csv"
+SUMMARY_PARQUET = "AIS_Anomalies_Summary.parquet"
+
+# Name of the GeoParquet geometry column
+GEOMETRY_COLUMN = 'geometry'
+
+# Rows per parquet row group; MMSI statistics are kept per group
+SUMMARY_ROW_GROUP_SIZE = 100_000
+
+# Columns parsed as datetimes when falling back to the CSV
+SUMMARY_DATETIME_COLUMNS = ['BaseDateTime', 'EventEndTime', 'ZoneExitTime']
+
+# Little-endian WKB point: byte order, geometry type, x, y
+_WKB_POINT = np.dtype([('order', 'u1'), ('type', '<u4'), ('x', '<f8'), ('y', '<f8')])
+
+
+def _wkb_points(lon, lat):
+    """WKB encodings of points, as a list of 21-byte strings."""
+    points = np.empty(len(lon), dtype=_WKB_POINT)
+    points['order'] = 1
+    points['type'] = 1
+    points['x'] = lon
+    points['y'] = lat
+    buffer = points.tobytes()
+    return [buffer[start:start + _WKB_POINT.itemsize] for start in range(0, len(buffer), _WKB_POINT.itemsize)]
+
+
+def _geo_metadata(lon, lat):
+    """GeoParquet 1.0 file metadata for the point column."""
+    column = {'encoding': 'WKB', 'geometry_types': ['Point']}
+    valid = ~(np.isnan(lon) | np.isnan(lat))
+    if valid.any():
+        column['bbox'] = [float(lon[valid].min()), float(lat[valid].min()),
+                          float(lon[valid].max()), float(lat[valid].max())]
+    return {'version': '1.0.0', 'primary_column': GEOMETRY_COLUMN, 'columns': {GEOMETRY_COLUMN: column}}
+
+
+def write_anomaly_parquet(anomalies_df, path, geometry=False):
+    """
+    Write the anomaly summary as typed parquet, sorted by MMSI.
+
+    Records of one vessel keep the order in which they were detected.
+
+    Args:
+        anomalies_df (DataFrame): Anomaly records
+        path (str): Output path
+        geometry (bool, optional): Add a GeoParquet point geometry column built
+            from LON and LAT
+
+    Returns:
+        bool: True if the file was written, False if pyarrow is not installed
+    """
+    if not PYARROW_AVAILABLE:
+        logger.warning("pyarrow is not installed; skipping parquet anomaly summary")
+        return False
+
+    if 'MMSI' in anomalies_df.columns:
+        anomalies_df = anomalies_df.sort_values('MMSI', kind='stable')
+    table = pa.Table.from_pandas(anomalies_df, preserve_index=False)
+
+    if geometry and {'LAT', 'LON'}.issubset(anomalies_df.columns):
+        lon = anomalies_df['LON'].to_numpy(dtype=np.float64, na_value=np.nan)
+        lat = anomalies_df['LAT'].to_numpy(dtype=np.float64, na_value=np.nan)
+        table = table.append_column(GEOMETRY_COLUMN, pa.array(_wkb_points(lon, lat), type=pa.binary()))
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'geo'] = json.dumps(_geo_metadata(lon, lat)).encode()
+        table = table.replace_schema_metadata(metadata)
+
+    pq.write_table(table, path, row_group_size=SUMMARY_ROW_GROUP_SIZE)
+    logger.info(f"Saved typed anomaly summary ({len(anomalies_df)} records) to: {path}")
+    return True
+
+
+def find_anomaly_summary(output_dir):
+    """
+    Anomaly summary file of an output directory, parquet preferred.
+
+    Args:
+        output_dir (str): Output directory of a run
+
+    Returns:
+        str or None: Path of the parquet or CSV summary, None if neither exists
+    """
+    if PYARROW_AVAILABLE:
+        parquet_path = os.path.join(output_dir, SUMMARY_PARQUET)
+        if os.path.exists(parquet_path):
+            return parquet_path
+    csv_path = os.path.join(output_dir, SUMMARY_CSV)
+    return csv_path if os.path.exists(csv_path) else None
+
+
+def read_anomaly_summary(path, columns=None, mmsi=None):
+    """
+    Read an anomaly summary file written by a run.
+
+    Args:
+        path (str): Parquet or CSV summary path
+        columns (list, optional): Columns to read
+        mmsi (list, optional): Only read the records of these vessels
+
+    Returns:
+        DataFrame: Anomaly records, without the geometry column unless it is
+            requested in columns
+    """
+    if path.endswith('.parquet'):
+        filters = [('MMSI', 'in', list(mmsi))] if mmsi is not None else None
+        if columns is None:
+            columns = [name for name in pq.read_schema(path).names if name != GEOMETRY_COLUMN]
+        return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+    df = pd.read_csv(path, usecols=columns)
+    for column in SUMMARY_DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    if mmsi is not None:
+        df = df[df['MMSI'].isin(mmsi)]
+    return df
+
+
+def append_anomaly_summary(anomalies_df, output_dir, report_date, geometry=False):
+    """
+    Add one day's anomalies to the summary files of an output directory.
+
+    Records already in the summary for report_date are replaced, so analysing
+    a day again does not duplicate it. Both the CSV and the parquet file are
+    rewritten from the combined records.
+
+    Args:
+        anomalies_df (DataFrame): The day's anomaly records
+        output_dir (str): Output directory
+        report_date (str): The day as YYYY-MM-DD
+        geometry (bool, optional): Add the GeoParquet point geometry column
+
+    Returns:
+        DataFrame: The combined summary
+    """
+    builder = AnomalyBuilder()
+    existing_path = find_anomaly_summary(output_dir)
+    if existing_path is not None:
+        existing = read_anomaly_summary(existing_path)
+        if 'ReportDate' in existing.columns:
+            existing = existing[existing['ReportDate'].astype(str) != report_date]
+        builder.add(existing)
+    builder.add(anomalies_df)
+
+    combined = builder.finalize()
+    if combined.empty:
+        return combined
+
+    os.makedirs(output_dir, exist_ok=True)
+    combined.to_csv(os.path.join(output_dir, SUMMARY_CSV), index=False)
+    parquet_path = os.path.join(output_dir, SUMMARY_PARQUET)
+    if not write_anomaly_parquet(combined, parquet_path, geometry=geometry) and os.path.exists(parquet_path):
+        os.remove(parquet_path)
+    logger.info(f"Anomaly summary in {output_dir} now holds {len(combined)} records")
+    return combined
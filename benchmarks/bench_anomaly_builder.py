@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Anomaly Assembly Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Times the previous way of gathering a run's anomalies (every detector frame
+turned into a list of dicts, one DataFrame built from all the dicts at the end)
+against AnomalyBuilder, which keeps the frames and concatenates them once.
+
+Usage:
+    python benchmarks/bench_anomaly_builder.py --vessels 20000 --days 7
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from anomaly_builder import AnomalyBuilder
+from anomaly_detectors import detect_course_heading_mismatch
+from bench_beacon import make_day
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark anomaly record assembly')
+    parser.add_argument('--vessels', type=int, default=20000, help='Vessels per day')
+    parser.add_argument('--pings', type=int, default=48, help='Reports per vessel')
+    parser.add_argument('--days', type=int, default=7, help='Days of anomalies to gather')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    fleet = 200000000 + np.arange(args.vessels)
+    frames = []
+    for k in range(args.days):
+        day = date(2024, 10, 1) + timedelta(days=k)
+        # Random COG and Heading make about half of the reports Course anomalies
+        frames.append(detect_course_heading_mismatch(make_day(day, fleet, args.pings, rng),
+                                                     day, day.isoformat(), 10, 45))
+    print(f"Anomalies: {sum(len(frame) for frame in frames):,} over {args.days} days")
+
+    start = time.perf_counter()
+    records = []
+    for frame in frames:
+        records.extend(frame.to_dict('records'))
+    legacy = pd.DataFrame(records)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    builder = AnomalyBuilder()
+    for frame in frames:
+        builder.add(frame)
+    built = builder.finalize()
+    builder_time = time.perf_counter() - start
+
+    print(f"dict records {legacy_time:8.3f} s ({legacy.memory_usage(deep=True).sum() / 2**20:,.0f} MB), "
+          f"builder {builder_time:8.3f} s ({built.memory_usage(deep=True).sum() / 2**20:,.0f} MB)")
+
+
+if __name__ == '__main__':
+    main()
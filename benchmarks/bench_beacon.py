@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Beacon Detector Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Compares AIS beacon on/off detection over a run of synthetic days done two
+ways: a per-MMSI loop that looks every vessel's last report up by scanning all
+earlier days again, and the vectorized detectors in anomaly_detectors, which
+join each new day against the last-seen table kept in VesselState. Both measure
+gaps from a vessel's actual last report, however many days back it was, and
+must produce the same records. Each vessel reports on a random 70% of the days.
+
+Usage:
+    python benchmarks/bench_beacon.py --vessels 20000 --pings 20 --days 5
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ais_schema import conform_dataframe
+from day_cache import normalize_partition
+from anomaly_detectors import first_last_positions, detect_beacon_on, detect_beacon_off
+from vessel_state import VesselState
+
+
+def make_day(day, mmsis, pings, rng):
+    """Random reports for the given vessels, sorted like a cached day partition."""
+    n = len(mmsis) * pings
+    seconds = rng.integers(0, 86400, n)
+    df = pd.DataFrame({
+        'MMSI': np.repeat(mmsis, pings),
+        'BaseDateTime': pd.Timestamp(day) + pd.to_timedelta(seconds, unit='s'),
+        'LAT': rng.uniform(20, 50, n),
+        'LON': rng.uniform(-130, -60, n),
+        'SOG': rng.uniform(0, 25, n),
+        'COG': rng.uniform(0, 360, n),
+        'Heading': rng.uniform(0, 360, n),
+        'VesselType': rng.choice([30, 60, 70, 80], n),
+        'VesselName': np.repeat([f"V{m}" for m in mmsis], pings),
+    })
+    return normalize_partition(conform_dataframe(df))
+
+
+def reference_beacon(days, threshold):
+    """Per-MMSI loop that rescans every earlier day for each vessel's last report."""
+    records = []
+    for k in range(1, len(days)):
+        current_date, df_current_day = days[k]
+        previous_date = days[k - 1][0]
+        history = pd.concat([df for _, df in days[:k]])
+        history_grouped = history.groupby('MMSI')
+        current_grouped = df_current_day.groupby('MMSI')
+        day_start = pd.Timestamp(current_date).replace(hour=0, minute=0, second=0)
+        day_end = pd.Timestamp(current_date).replace(hour=23, minute=59, second=59)
+        previous_end = pd.Timestamp(previous_date).replace(hour=23, minute=59, second=59)
+        seen = set(history['MMSI'].unique())
+
+        for mmsi in df_current_day['MMSI'].unique():
+            vessel_curr = current_grouped.get_group(mmsi).sort_values('BaseDateTime')
+            since = day_start
+            if mmsi in seen:
+                since = history_grouped.get_group(mmsi)['BaseDateTime'].max()
+            gap = (vessel_curr.iloc[0]['BaseDateTime'] - since).total_seconds() / 60
+            if gap >= threshold:
+                record = vessel_curr.iloc[0].copy()
+                record['AnomalyType'] = 'AIS_Beacon_On'
+                record['BeaconGapMinutes'] = gap
+                records.append(record)
+
+        for mmsi in seen - set(df_current_day['MMSI'].unique()):
+            vessel_hist = history_grouped.get_group(mmsi).sort_values('BaseDateTime')
+            last_appearance = vessel_hist.iloc[-1]['BaseDateTime']
+            gap = (day_end - last_appearance).total_seconds() / 60
+            previous_gap = (previous_end - last_appearance).total_seconds() / 60
+            newly_dark = last_appearance.date() == previous_date or previous_gap < threshold
+            if gap >= threshold and newly_dark:
+                record = vessel_hist.iloc[-1].copy()
+                record['AnomalyType'] = 'AIS_Beacon_Off'
+                record['BeaconGapMinutes'] = gap
+                records.append(record)
+
+    return pd.DataFrame([record.to_dict() for record in records])
+
+
+def vectorized_beacon(days, threshold):
+    """The detectors used by SFD._process_anomaly_detection, fed from VesselState."""
+    state = VesselState()
+    frames = []
+    for current_date, df_current_day in days:
+        if not state.empty:
+            report_date = current_date.strftime('%Y-%m-%d')
+            first_current, _ = first_last_positions(df_current_day)
+            frames.append(detect_beacon_on(first_current, state.vessels, current_date, report_date, threshold))
+            frames.append(detect_beacon_off(state.vessels, first_current['MMSI'], state.last_date,
+                                            current_date, report_date, threshold))
+        # No loitering tail is needed here
+        state.update(df_current_day, current_date, loitering_positions=df_current_day.iloc[:0])
+    return pd.concat([frame for frame in frames if not frame.empty], ignore_index=True)
+
+
+def canonical(df):
+    """Key columns of a result, in a fixed order, for comparison."""
+    df = df[['AnomalyType', 'MMSI', 'BaseDateTime', 'LAT', 'LON', 'BeaconGapMinutes']]
+    df = df.astype({'MMSI': 'int64', 'LAT': 'float64', 'LON': 'float64'})
+    return df.sort_values(['AnomalyType', 'MMSI', 'BaseDateTime']).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the AIS beacon on/off detectors')
+    parser.add_argument('--vessels', type=int, default=20000, help='Vessels in the fleet')
+    parser.add_argument('--pings', type=int, default=20, help='Reports per vessel and day')
+    parser.add_argument('--days', type=int, default=5, help='Days in the run')
+    parser.add_argument('--threshold-hours', type=float, default=6, help='Beacon gap threshold')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    fleet = 200000000 + np.arange(args.vessels)
+    days = []
+    for k in range(args.days):
+        day = date(2024, 10, 1) + timedelta(days=k)
+        days.append((day, make_day(day, fleet[rng.random(len(fleet)) < 0.7], args.pings, rng)))
+    threshold = args.threshold_hours * 60
+    print(f"{args.days} days, {sum(len(df) for _, df in days):,} reports from {len(fleet):,} vessels")
+
+    results = {}
+    for name, detector in (('per-MMSI loop', reference_beacon), ('vectorized', vectorized_beacon)):
+        start = time.perf_counter()
+        results[name] = detector(days, threshold)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {elapsed:8.3f} s  ({len(results[name]):,} anomalies)")
+
+    reference, vectorized = (canonical(df) for df in results.values())
+    if reference.equals(vectorized):
+        print("Results are identical")
+    else:
+        print("Results DIFFER")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Day Pair Pool Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Times the day-pair detection of a run of synthetic days done serially and on
+DayPairPool with a given number of worker processes, keeping the day-to-day
+state the same way SFD._process_anomaly_detection does, and checks that both
+give the same anomaly records.
+
+Usage:
+    python benchmarks/bench_day_pairs.py --vessels 5000 --days 10 --workers 4
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import SFD
+from anomaly_detectors import loitering_carry, loitering_tail
+from day_pair_pool import DayPairPool
+from vessel_state import VesselState
+from bench_beacon import make_day
+
+
+def run_pairs(days, config, workers):
+    """Detect every day pair, serially for workers=1, and return the records."""
+    duration_hours = config['LOITERING_DURATION_HOURS']
+    pool = DayPairPool(workers, SFD._detect_day_pair, config) if workers > 1 else None
+    state = VesselState()
+    frames = []
+    carried = None
+    try:
+        state.update(days[0][1], days[0][0], None, duration_hours)
+        for (previous_date, df_previous), (current_date, df_current) in zip(days, days[1:]):
+            if carried is None:
+                carried = loitering_carry(df_previous, pd.Timestamp(current_date) - pd.Timedelta(hours=duration_hours))
+            if pool is None:
+                anomalies, _, carried = SFD._detect_day_pair(df_current, df_previous, current_date, previous_date,
+                                                             state.vessels, carried, config, None)
+                frames.extend(anomalies)
+            else:
+                pool.submit(df_current, df_previous, current_date, previous_date, state.vessels, carried)
+                carried = loitering_tail(df_current, carried, current_date, duration_hours)
+                for _, (anomalies, _, _) in pool.ready():
+                    frames.extend(anomalies)
+            state.update(df_current, current_date, carried, duration_hours)
+        if pool is not None:
+            for _, (anomalies, _, _) in pool.drain():
+                frames.extend(anomalies)
+    finally:
+        if pool is not None:
+            pool.close()
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel day-pair detection')
+    parser.add_argument('--vessels', type=int, default=5000, help='Vessels in the fleet')
+    parser.add_argument('--pings', type=int, default=48, help='Reports per vessel and day')
+    parser.add_argument('--days', type=int, default=10, help='Days in the run')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    fleet = 200000000 + np.arange(args.vessels)
+    days = []
+    for k in range(args.days):
+        day = date(2024, 10, 1) + timedelta(days=k)
+        days.append((day, make_day(day, fleet[rng.random(len(fleet)) < 0.9], args.pings, rng)))
+    print(f"{args.days} days, {sum(len(df) for _, df in days):,} reports from {len(fleet):,} vessels")
+
+    config = SFD.load_config('/nonexistent.ini')
+    config.update({'USE_GPU': False, 'zone_violations': False, 'LOITERING_DURATION_HOURS': 6})
+
+    results = {}
+    for workers in sorted({1, args.workers}):
+        start = time.perf_counter()
+        results[workers] = run_pairs(days, config, workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>3} workers: {elapsed:8.3f} s  ({len(results[workers]):,} anomalies)")
+
+    if all(result.equals(results[1]) for result in results.values()):
+        print("Results are identical")
+    else:
+        print("Results DIFFER")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Loitering Detector Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Times the previous single-day loitering loop (iterrows over every position,
+one single-row DataFrame and distance call per point) against the rolling-window detector
+in anomaly_detectors on a synthetic day pair. The old loop only ever looked at
+one calendar day, so with the default 24 hour duration it could not flag
+anything; use a shorter --duration-hours to see it do the full per-point work.
+
+Usage:
+    python benchmarks/bench_loitering.py --vessels 2000 --pings 20 --duration-hours 6
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from anomaly_detectors import detect_loitering, loitering_carry
+from geo_kernels import haversine
+from bench_beacon import make_day
+
+
+def legacy_loitering(df_current_day, radius_nm, duration_hours):
+    """The per-vessel loop previously used by SFD._process_anomaly_detection."""
+    found = []
+    for mmsi, vessel_data in df_current_day.groupby('MMSI'):
+        if len(vessel_data) < 10:
+            continue
+        vessel_data = vessel_data.sort_values('BaseDateTime').copy()
+        time_span = (vessel_data['BaseDateTime'].max() - vessel_data['BaseDateTime'].min()).total_seconds() / 3600
+        if time_span < duration_hours:
+            continue
+        center_lat = vessel_data['LAT'].mean()
+        center_lon = vessel_data['LON'].mean()
+        max_dist = 0
+        for _, row in vessel_data.iterrows():
+            # One single-row DataFrame per point, as before
+            distance_df = pd.DataFrame({'LAT1': [center_lat], 'LON1': [center_lon],
+                                        'LAT2': [row['LAT']], 'LON2': [row['LON']]})
+            dist_nm = haversine(distance_df['LAT1'], distance_df['LON1'],
+                                distance_df['LAT2'], distance_df['LON2'])[0]
+            max_dist = max(max_dist, dist_nm)
+        if max_dist < radius_nm:
+            found.append(mmsi)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the loitering detectors')
+    parser.add_argument('--vessels', type=int, default=2000, help='Vessels per day')
+    parser.add_argument('--pings', type=int, default=20, help='Reports per vessel')
+    parser.add_argument('--radius-nm', type=float, default=5.0, help='Loitering radius')
+    parser.add_argument('--duration-hours', type=float, default=24.0, help='Loitering duration')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    previous_date, current_date = date(2024, 10, 1), date(2024, 10, 2)
+    fleet = 200000000 + np.arange(args.vessels)
+    df_previous = make_day(previous_date, fleet, args.pings, rng)
+    df_current = make_day(current_date, fleet, args.pings, rng)
+    print(f"Day pair: {len(df_previous):,} + {len(df_current):,} reports")
+
+    start = time.perf_counter()
+    legacy = legacy_loitering(df_current, args.radius_nm, args.duration_hours)
+    print(f"  per-point loop: {time.perf_counter() - start:8.3f} s  ({len(legacy):,} vessels)")
+
+    start = time.perf_counter()
+    duration = pd.Timedelta(hours=args.duration_hours)
+    carried = loitering_carry(df_previous, pd.Timestamp(current_date) - duration)
+    records, _ = detect_loitering(df_current, carried, current_date, current_date.isoformat(),
+                                  args.radius_nm, args.duration_hours)
+    print(f"rolling windows: {time.perf_counter() - start:8.3f} s  ({len(records):,} vessels)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Rendezvous Detector Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Times the previous rendezvous loop (hour-of-day buckets, every vessel pair
+compared in nested Python loops with a one-row DataFrame per pair) on a small
+fleet, then the grid-indexed detector in anomaly_detectors on growing fleets
+to show how it scales with the number of positions.
+
+Usage:
+    python benchmarks/bench_rendezvous.py --legacy-vessels 100 --vessels 10000 50000 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from anomaly_detectors import detect_rendezvous
+from geo_kernels import haversine
+from bench_beacon import make_day
+
+
+def legacy_rendezvous(df_current_day, proximity_nm):
+    """The pairwise loop previously used by SFD._process_anomaly_detection."""
+    found = 0
+    df = df_current_day.sort_values('BaseDateTime').copy()
+    df['TimeWindow'] = df['BaseDateTime'].dt.hour
+    for _, window_group in df.groupby('TimeWindow'):
+        vessel_positions = {}
+        for mmsi, vessel_group in window_group.groupby('MMSI'):
+            if len(vessel_group) >= 3:
+                vessel_positions[mmsi] = (vessel_group['LAT'].mean(), vessel_group['LON'].mean())
+        vessel_list = list(vessel_positions)
+        for i in range(len(vessel_list)):
+            for j in range(i + 1, len(vessel_list)):
+                lat1, lon1 = vessel_positions[vessel_list[i]]
+                lat2, lon2 = vessel_positions[vessel_list[j]]
+                distance_df = pd.DataFrame({'LAT1': [lat1], 'LON1': [lon1], 'LAT2': [lat2], 'LON2': [lon2]})
+                distance = haversine(distance_df['LAT1'], distance_df['LON1'],
+                                     distance_df['LAT2'], distance_df['LON2'])[0]
+                found += distance < proximity_nm
+    return found
+
+
+def make_fleet(vessels, pings, rng):
+    """A day of reports squeezed into a 10 x 10 degree box so close pairs occur."""
+    df = make_day(date(2024, 10, 2), 200000000 + np.arange(vessels), pings, rng)
+    df['LAT'] = rng.uniform(30, 40, len(df)).astype(np.float32)
+    df['LON'] = rng.uniform(-80, -70, len(df)).astype(np.float32)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the rendezvous detectors')
+    parser.add_argument('--legacy-vessels', type=int, default=100, help='Fleet size for the old loop (0 to skip)')
+    parser.add_argument('--vessels', type=int, nargs='+', default=[10000, 50000, 100000],
+                        help='Fleet sizes for the grid detector')
+    parser.add_argument('--pings', type=int, default=144, help='Reports per vessel')
+    parser.add_argument('--proximity-nm', type=float, default=0.5, help='Rendezvous distance')
+    parser.add_argument('--duration-minutes', type=float, default=30, help='Rendezvous duration')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    if args.legacy_vessels:
+        df = make_fleet(args.legacy_vessels, args.pings, rng)
+        start = time.perf_counter()
+        legacy_rendezvous(df, args.proximity_nm)
+        legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        detect_rendezvous(df, date(2024, 10, 2), '2024-10-02', args.proximity_nm, args.duration_minutes)
+        print(f"{args.legacy_vessels:>7,} vessels: pair loop {legacy:8.3f} s, "
+              f"grid {time.perf_counter() - start:8.3f} s")
+
+    for vessels in args.vessels:
+        df = make_fleet(vessels, args.pings, rng)
+        start = time.perf_counter()
+        records = detect_rendezvous(df, date(2024, 10, 2), '2024-10-02', args.proximity_nm, args.duration_minutes)
+        elapsed = time.perf_counter() - start
+        print(f"{vessels:>7,} vessels: grid {elapsed:8.3f} s for {len(df):,} reports "
+              f"({len(df) / elapsed / 1e6:.2f}M reports/s, {len(records):,} meetings)")
+
+
+if __name__ == '__main__':
+    main()
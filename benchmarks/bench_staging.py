@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Staging Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Compares staging cached daily parquet files into a working directory with
+shutil.copy2 (the previous behaviour of DataManager.download_noaa_data) against
+file_staging.stage_file. Files of the requested size are created in a scratch
+directory, so no AIS data is needed.
+
+Usage:
+    python benchmarks/bench_staging.py --days 30 --size-mb 200 [--dir PATH]
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from file_staging import stage_file, STAGING_METHODS
+
+
+def make_cache(cache_dir, days, size_mb):
+    """Write `days` files of `size_mb` MB of random bytes."""
+    paths = []
+    block = os.urandom(1024 * 1024)
+    for day in range(days):
+        path = os.path.join(cache_dir, f"ais-2024-10-{day + 1:02d}.parquet")
+        with open(path, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(block)
+        paths.append(path)
+    return paths
+
+
+def time_staging(paths, target_dir, stage):
+    """Stage every path into target_dir; returns (seconds, methods used)."""
+    os.makedirs(target_dir, exist_ok=True)
+    methods = set()
+    start = time.perf_counter()
+    for path in paths:
+        methods.add(stage(path, os.path.join(target_dir, os.path.basename(path))))
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(target_dir)
+    return elapsed, methods
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cache staging methods')
+    parser.add_argument('--days', type=int, default=30, help='Number of daily files')
+    parser.add_argument('--size-mb', type=int, default=100, help='Size of each file in MB')
+    parser.add_argument('--dir', type=str, default=None, help='Scratch directory (on the filesystem to test)')
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='sfd_staging_', dir=args.dir)
+    try:
+        cache_dir = os.path.join(scratch, 'cache')
+        os.makedirs(cache_dir)
+        paths = make_cache(cache_dir, args.days, args.size_mb)
+        total_mb = args.days * args.size_mb
+        print(f"Staging {args.days} files x {args.size_mb} MB ({total_mb} MB) in {scratch}")
+
+        def copy(source, target):
+            shutil.copy2(source, target)
+            return 'copy'
+
+        candidates = [('shutil.copy2', copy), ('stage_file', stage_file)]
+        candidates += [(f"stage_file[{method}]", lambda s, t, m=method: stage_file(s, t, (m,)))
+                       for method in STAGING_METHODS if method != 'copy']
+
+        baseline = None
+        for name, stage in candidates:
+            try:
+                elapsed, methods = time_staging(paths, os.path.join(scratch, 'work'), stage)
+            except OSError as e:
+                print(f"{name:<24} unavailable ({e.__class__.__name__})")
+                shutil.rmtree(os.path.join(scratch, 'work'), ignore_errors=True)
+                continue
+            baseline = baseline or elapsed
+            per_day_ms = elapsed / args.days * 1000
+            print(f"{name:<24} {elapsed:8.3f} s  {per_day_ms:8.2f} ms/day  "
+                  f"{baseline / elapsed:8.1f}x  via {', '.join(sorted(methods))}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
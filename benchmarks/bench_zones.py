@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Zone Violation Benchmark for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Times the previous zone loop (one boolean mask over the whole day per zone,
+then one filter per vessel found inside) against the grid-indexed detector in
+anomaly_detectors, for a growing number of random box and polygon zones.
+
+Usage:
+    python benchmarks/bench_zones.py --vessels 20000 --zones 4 50 500
+"""
+
+import os
+import sys
+import time
+import argparse
+from datetime import date
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from anomaly_detectors import detect_zone_violations, first_last_positions
+from zone_index import ZoneIndex
+from bench_beacon import make_day
+
+
+def legacy_zones(df_current_day, zones):
+    """The per-zone mask loop previously used by SFD._process_anomaly_detection."""
+    found = 0
+    for zone in zones:
+        in_zone = df_current_day[
+            (df_current_day['LAT'] >= zone['lat_min']) &
+            (df_current_day['LAT'] <= zone['lat_max']) &
+            (df_current_day['LON'] >= zone['lon_min']) &
+            (df_current_day['LON'] <= zone['lon_max'])
+        ]
+        for mmsi in in_zone['MMSI'].unique():
+            found += len(in_zone[in_zone['MMSI'] == mmsi].iloc[:1])
+    return found
+
+
+def make_zones(count, rng):
+    """Random boxes of up to 5 x 5 degrees; every third zone is a hexagon."""
+    zones = []
+    for k in range(count):
+        lat, lon = rng.uniform(-60, 55), rng.uniform(-180, 175)
+        if k % 3 == 2:
+            angles = np.linspace(0, 2 * np.pi, 7)[:-1]
+            zones.append({'name': f'Zone {k}',
+                          'polygon': np.c_[lat + 2.5 + 2.5 * np.sin(angles), lon + 2.5 + 2.5 * np.cos(angles)]})
+        else:
+            zones.append({'name': f'Zone {k}', 'lat_min': lat, 'lat_max': lat + rng.uniform(1, 5),
+                          'lon_min': lon, 'lon_max': lon + rng.uniform(1, 5)})
+    return zones
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the zone violation detectors')
+    parser.add_argument('--vessels', type=int, default=20000, help='Vessels per day')
+    parser.add_argument('--pings', type=int, default=48, help='Reports per vessel')
+    parser.add_argument('--zones', type=int, nargs='+', default=[4, 50, 500], help='Zone counts to time')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    previous_date, current_date = date(2024, 10, 1), date(2024, 10, 2)
+    fleet = 200000000 + np.arange(args.vessels)
+    df_previous = make_day(previous_date, fleet, args.pings, rng)
+    df_current = make_day(current_date, fleet, args.pings, rng)
+    _, last_previous = first_last_positions(df_previous)
+    print(f"Day: {len(df_current):,} reports")
+
+    for count in args.zones:
+        zones = make_zones(count, rng)
+        start = time.perf_counter()
+        # The old loop only understood boxes
+        legacy_zones(df_current, [zone for zone in zones if 'polygon' not in zone])
+        legacy = time.perf_counter() - start
+        start = time.perf_counter()
+        records = detect_zone_violations(df_current, last_previous, ZoneIndex(zones),
+                                         current_date, current_date.isoformat())
+        print(f"{count:>5} zones: mask loop {legacy:8.3f} s, index {time.perf_counter() - start:8.3f} s "
+              f"({len(records):,} visits)")
+
+
+if __name__ == '__main__':
+    main()
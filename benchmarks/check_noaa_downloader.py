@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+NOAA Downloader Check for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+Runs NOAADownloader against a local http.server that honours Range requests
+and checks the resume and size verification paths: a partial file left by an
+earlier run is resumed, a connection dropped mid-transfer is resumed on the
+retry, and a file whose size does not match what the server reported is
+rejected without producing the final file.
+
+Usage:
+    python benchmarks/check_noaa_downloader.py
+"""
+
+import os
+import re
+import sys
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from noaa_downloader import NOAADownloader, PARTIAL_SUFFIX
+
+PAYLOAD = os.urandom(256 * 1024)
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD with Range support and optional misbehaviour."""
+
+    # Bytes sent before the connection is dropped on the next full request
+    drop_after = None
+    # Total size claimed in Content-Range instead of the real one
+    reported_total = None
+    # Range headers received, in order
+    ranges = []
+
+    def do_GET(self):
+        handler = type(self)
+        total = len(PAYLOAD) if handler.reported_total is None else handler.reported_total
+        requested = self.headers.get('Range')
+        handler.ranges.append(requested)
+
+        if requested:
+            start = int(re.match(r'bytes=(\d+)-', requested).group(1))
+            if start >= len(PAYLOAD):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{total}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = PAYLOAD[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(PAYLOAD) - 1}/{total}')
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if handler.drop_after is not None and not requested:
+            handler.drop_after, cut = None, handler.drop_after
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def reset_server(drop_after=None, reported_total=None):
+    """Set the server behaviour for the next check."""
+    RangeHandler.drop_after = drop_after
+    RangeHandler.reported_total = reported_total
+    RangeHandler.ranges = []
+
+
+def check(name, condition, detail=''):
+    """Print one result and return whether it passed."""
+    print(f"{'ok  ' if condition else 'FAIL'} {name}{': ' + detail if detail and not condition else ''}")
+    return condition
+
+
+def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/AIS_2024_10_01.zip"
+    directory = tempfile.mkdtemp(prefix='sfd_download_check_')
+    results = []
+
+    try:
+        # A partial file from an earlier run is resumed with a Range request
+        reset_server()
+        target = os.path.join(directory, 'resume.zip')
+        with open(target + PARTIAL_SUFFIX, 'wb') as f:
+            f.write(PAYLOAD[:100000])
+        job = download(url, target, retries=0)
+        results.append(check("partial file resumed", job.success and job.resumed_from == 100000, str(job.error)))
+        results.append(check("resume sent a Range request", RangeHandler.ranges == ['bytes=100000-'],
+                             str(RangeHandler.ranges)))
+        results.append(check("resumed file matches", _read(target) == PAYLOAD))
+        results.append(check("partial file removed", not os.path.exists(target + PARTIAL_SUFFIX)))
+
+        # A connection dropped mid-transfer is resumed on the retry
+        reset_server(drop_after=50000)
+        target = os.path.join(directory, 'dropped.zip')
+        job = download(url, target, retries=1)
+        results.append(check("dropped transfer resumed", job.success and job.resumed_from > 0,
+                             f"{job.error}, resumed from {job.resumed_from}"))
+        results.append(check("retry sent a Range request",
+                             RangeHandler.ranges == [None, f'bytes={job.resumed_from}-'], str(RangeHandler.ranges)))
+        results.append(check("dropped transfer file matches", _read(target) == PAYLOAD))
+
+        # A file shorter than the size the server reported is rejected
+        reset_server(reported_total=len(PAYLOAD) + 1000)
+        target = os.path.join(directory, 'short.zip')
+        with open(target + PARTIAL_SUFFIX, 'wb') as f:
+            f.write(PAYLOAD[:100000])
+        job = download(url, target, retries=0)
+        results.append(check("short file rejected",
+                             not job.success and (job.error or '').startswith('Size mismatch'), str(job.error)))
+        results.append(check("no final file for short download", not os.path.exists(target)))
+
+        # A file longer than the size the server reported is rejected and discarded
+        reset_server(reported_total=len(PAYLOAD) - 1000)
+        target = os.path.join(directory, 'long.zip')
+        with open(target + PARTIAL_SUFFIX, 'wb') as f:
+            f.write(PAYLOAD[:100000])
+        job = download(url, target, retries=0)
+        results.append(check("long file rejected",
+                             not job.success and (job.error or '').startswith('Size mismatch'), str(job.error)))
+        results.append(check("no final or partial file for long download",
+                             not os.path.exists(target) and not os.path.exists(target + PARTIAL_SUFFIX)))
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if all(results):
+        print("All download checks passed")
+    else:
+        print("Download checks FAILED")
+        sys.exit(1)
+
+
+def download(url, target, retries):
+    """Download one file with a fresh single-worker downloader."""
+    # Small chunks so the bytes read before a dropped connection reach the partial file
+    downloader = NOAADownloader(max_workers=1, chunk_size=16 * 1024, retries=retries,
+                                log=lambda message: None)
+    try:
+        return downloader.download_file(url, target)
+    finally:
+        downloader.close()
+
+
+def _read(path):
+    """Contents of a file, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+if __name__ == '__main__':
+    main()
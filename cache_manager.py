@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Cache Manager Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module keeps the AIS data cache (~/.ais_data_cache) within a byte budget.
+A SQLite manifest in the cache directory records, for every cached file, its
+size, the fingerprint of the source it was built from, the AIS schema version
+it was written with and when it was last used. Garbage collection first drops
+entries written with an outdated schema, then evicts the least recently used
+entries until the cache fits the budget.
+
+Files that appear in the cache without going through the manager (NOAA
+downloads, older range folders) are picked up by sync() with their
+modification time standing in for the last access.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+
+from utils import get_cache_dir, format_file_size
+from ais_schema import AIS_SCHEMA_VERSION, parquet_schema_version
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Manifest database kept at the root of the cache directory
+MANIFEST_NAME = "cache_manifest.db"
+
+# Default byte budget when the configuration does not set one
+DEFAULT_CACHE_MAX_GB = 20.0
+
+# In-progress writes are never tracked or evicted
+_TEMP_SUFFIXES = ('.tmp', '.part')
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    source_fingerprint TEXT NOT NULL DEFAULT '',
+    schema_version INTEGER,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def cache_budget_bytes(config):
+    """
+    Byte budget for the cache from the configuration.
+
+    Args:
+        config (dict): Configuration dictionary (CACHE_MAX_SIZE_GB, 0 for no limit)
+
+    Returns:
+        int or None: Budget in bytes, or None when the cache is unlimited
+    """
+    max_gb = config.get('CACHE_MAX_SIZE_GB', DEFAULT_CACHE_MAX_GB)
+    try:
+        max_gb = float(max_gb)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid CACHE_MAX_SIZE_GB value {max_gb!r}, using {DEFAULT_CACHE_MAX_GB}")
+        max_gb = DEFAULT_CACHE_MAX_GB
+    if max_gb <= 0:
+        return None
+    return int(max_gb * 1024 ** 3)
+
+
+def _category(relative_path):
+    """Kind of cache entry, from its location in the cache directory."""
+    parts = relative_path.replace('\\', '/').split('/')
+    if len(parts) > 1 and parts[0] == 'days':
+        return 'day'
+    if len(parts) == 1 and parts[0].startswith('ais-'):
+        return 'download'
+    if len(parts) > 1 and len(parts[0]) == 17 and parts[0][8] == '-' and parts[0].replace('-', '').isdigit():
+        # YYYYMMDD-YYYYMMDD folders written before the per-day cache
+        return 'range'
+    return 'other'
+
+
+class CacheManager:
+    """
+    Manifest-backed view of the cache directory with LRU garbage collection.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """
+        Initialize the manager.
+
+        Args:
+            cache_dir (str, optional): Cache directory, defaults to utils.get_cache_dir()
+            max_bytes (int, optional): Byte budget used by gc(); None means unlimited
+        """
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_NAME)
+
+    def _connect(self):
+        """Open the manifest, creating it on first use."""
+        connection = sqlite3.connect(self.manifest_path, timeout=30)
+        connection.execute(_SCHEMA_SQL)
+        return connection
+
+    def _relative(self, path):
+        """Manifest key of a path inside the cache directory."""
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.cache_dir)).replace('\\', '/')
+
+    def _is_tracked_file(self, relative_path):
+        """Whether a file belongs in the manifest."""
+        name = os.path.basename(relative_path)
+        return not (name.startswith(MANIFEST_NAME) or name.endswith(_TEMP_SUFFIXES)
+                    or name == 'fingerprint.json')
+
+    def record(self, path, source_fingerprint='', schema_version=None):
+        """
+        Add or refresh the manifest entry of a file just written to the cache.
+
+        Args:
+            path (str): Cached file
+            source_fingerprint (str, optional): Identity of the source it was built from
+            schema_version (int, optional): AIS schema version it was written with
+        """
+        now = time.time()
+        relative_path = self._relative(path)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO entries (path, category, size, source_fingerprint, schema_version, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET size=excluded.size, "
+                "source_fingerprint=excluded.source_fingerprint, "
+                "schema_version=excluded.schema_version, last_access=excluded.last_access",
+                (relative_path, _category(relative_path), os.path.getsize(path),
+                 source_fingerprint or '', schema_version, now, now))
+
+    def touch(self, path):
+        """
+        Mark a cached file as used now.
+
+        Args:
+            path (str): Cached file
+        """
+        with self._connect() as connection:
+            updated = connection.execute("UPDATE entries SET last_access=? WHERE path=?",
+                                         (time.time(), self._relative(path))).rowcount
+        if not updated and os.path.exists(path):
+            self.record(path, schema_version=parquet_schema_version(path) if path.endswith('.parquet') else None)
+
+    def forget(self, path):
+        """
+        Drop a file's manifest entry (the file itself is left alone).
+
+        Args:
+            path (str): Cached file
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries WHERE path=?", (self._relative(path),))
+
+    def sync(self):
+        """
+        Reconcile the manifest with the files actually in the cache directory.
+
+        Untracked files are added using their modification time as last access,
+        entries whose files are gone are removed and changed sizes are updated.
+
+        Returns:
+            tuple: (added, removed) entry counts
+        """
+        on_disk = {}
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                relative_path = self._relative(path)
+                if self._is_tracked_file(relative_path):
+                    on_disk[relative_path] = path
+
+        added = removed = 0
+        with self._connect() as connection:
+            known = {row[0]: row[1] for row in connection.execute("SELECT path, size FROM entries")}
+            for relative_path in set(known) - set(on_disk):
+                connection.execute("DELETE FROM entries WHERE path=?", (relative_path,))
+                removed += 1
+            for relative_path, path in on_disk.items():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if relative_path not in known:
+                    schema_version = parquet_schema_version(path) if path.endswith('.parquet') else None
+                    connection.execute(
+                        "INSERT INTO entries (path, category, size, source_fingerprint, schema_version, created, last_access) "
+                        "VALUES (?, ?, ?, '', ?, ?, ?)",
+                        (relative_path, _category(relative_path), stat.st_size, schema_version,
+                         stat.st_mtime, stat.st_mtime))
+                    added += 1
+                elif known[relative_path] != stat.st_size:
+                    connection.execute("UPDATE entries SET size=? WHERE path=?", (stat.st_size, relative_path))
+        return added, removed
+
+    def entries(self):
+        """
+        All manifest entries, least recently used first.
+
+        Returns:
+            list: Dicts with path, category, size, source_fingerprint, schema_version, created, last_access
+        """
+        with self._connect() as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute("SELECT * FROM entries ORDER BY last_access ASC").fetchall()
+        return [dict(row) for row in rows]
+
+    def _is_stale(self, entry):
+        """Parquet entries written with an older schema are rebuilt on next use anyway."""
+        return (entry['path'].endswith('.parquet') and entry['schema_version'] is not None
+                and entry['schema_version'] != AIS_SCHEMA_VERSION)
+
+    def stats(self):
+        """
+        Summarise the cache contents.
+
+        Returns:
+            dict: total_bytes, entry_count, max_bytes, stale_count, oldest_access,
+                newest_access and per-category {'count', 'bytes'} under 'categories'
+        """
+        self.sync()
+        entries = self.entries()
+        categories = {}
+        for entry in entries:
+            category = categories.setdefault(entry['category'], {'count': 0, 'bytes': 0})
+            category['count'] += 1
+            category['bytes'] += entry['size']
+        return {
+            'cache_dir': self.cache_dir,
+            'total_bytes': sum(entry['size'] for entry in entries),
+            'entry_count': len(entries),
+            'max_bytes': self.max_bytes,
+            'stale_count': sum(1 for entry in entries if self._is_stale(entry)),
+            'oldest_access': entries[0]['last_access'] if entries else None,
+            'newest_access': entries[-1]['last_access'] if entries else None,
+            'categories': categories,
+        }
+
+    def gc(self, max_bytes=None, dry_run=False):
+        """
+        Evict stale entries, then least recently used entries until within budget.
+
+        Args:
+            max_bytes (int, optional): Budget overriding the one given at construction
+            dry_run (bool, optional): Only report what would be removed
+
+        Returns:
+            dict: removed (list of paths), freed_bytes and total_bytes after collection
+        """
+        budget = max_bytes if max_bytes is not None else self.max_bytes
+        self.sync()
+        entries = self.entries()
+        total_bytes = sum(entry['size'] for entry in entries)
+
+        victims = [entry for entry in entries if self._is_stale(entry)]
+        remaining = total_bytes - sum(entry['size'] for entry in victims)
+        if budget is not None:
+            for entry in entries:
+                if remaining <= budget:
+                    break
+                if not self._is_stale(entry):
+                    victims.append(entry)
+                    remaining -= entry['size']
+
+        removed = []
+        freed_bytes = 0
+        for entry in victims:
+            path = os.path.join(self.cache_dir, entry['path'])
+            if not dry_run:
+                try:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self._prune_empty_dirs(os.path.dirname(path))
+                except OSError as e:
+                    logger.warning(f"Could not evict cache entry {entry['path']}: {e}")
+                    continue
+                self.forget(path)
+            removed.append(entry['path'])
+            freed_bytes += entry['size']
+
+        if removed:
+            action = "Would evict" if dry_run else "Evicted"
+            logger.info(f"CACHE: {action} {len(removed)} entries ({format_file_size(freed_bytes)})")
+        return {'removed': removed, 'freed_bytes': freed_bytes, 'total_bytes': total_bytes - freed_bytes}
+
+    def _prune_empty_dirs(self, directory):
+        """Remove directories left without cached files, up to the cache root."""
+        root = os.path.abspath(self.cache_dir)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root):
+            remaining = [name for name in os.listdir(directory) if name != 'fingerprint.json']
+            if remaining:
+                break
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def clear(self):
+        """
+        Remove every cached file, including subfolders, and reset the manifest.
+
+        Returns:
+            int: Number of files removed
+        """
+        self.sync()
+        removed = 0
+        for entry in self.entries():
+            path = os.path.join(self.cache_dir, entry['path'])
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed += 1
+                self._prune_empty_dirs(os.path.dirname(path))
+            except OSError as e:
+                logger.warning(f"Could not remove cache entry {entry['path']}: {e}")
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries")
+        return removed
+
+
+def record_cache_entry(path, source_fingerprint='', schema_version=None, cache_dir=None):
+    """
+    Record a newly written cache file in the manifest.
+
+    Bookkeeping failures are logged and ignored so they never interrupt a run.
+
+    Args:
+        path (str): Cached file
+        source_fingerprint (str, optional): Identity of the source it was built from
+        schema_version (int, optional): AIS schema version it was written with
+        cache_dir (str, optional): Cache directory
+    """
+    try:
+        CacheManager(cache_dir).record(path, source_fingerprint, schema_version)
+    except Exception as e:
+        logger.debug(f"Could not record cache entry {path}: {e}")
+
+
+def touch_cache_entry(path, cache_dir=None):
+    """
+    Mark a cache file as used; failures are logged and ignored.
+
+    Args:
+        path (str): Cached file
+        cache_dir (str, optional): Cache directory
+    """
+    try:
+        CacheManager(cache_dir).touch(path)
+    except Exception as e:
+        logger.debug(f"Could not update cache entry {path}: {e}")
+
+
+def enforce_cache_budget(config, cache_dir=None):
+    """
+    Evict least recently used entries when the cache exceeds the configured budget.
+
+    Args:
+        config (dict): Configuration dictionary
+        cache_dir (str, optional): Cache directory
+
+    Returns:
+        dict or None: gc() result, or None when the cache is unlimited or gc failed
+    """
+    max_bytes = cache_budget_bytes(config)
+    if max_bytes is None:
+        return None
+    try:
+        return CacheManager(cache_dir, max_bytes).gc()
+    except Exception as e:
+        logger.warning(f"Cache garbage collection failed: {e}")
+        return None
+
+
+def format_cache_stats(stats):
+    """
+    Human-readable report of CacheManager.stats().
+
+    Args:
+        stats (dict): Result of CacheManager.stats()
+
+    Returns:
+        str: Multi-line report
+    """
+    budget = format_file_size(stats['max_bytes']) if stats['max_bytes'] else "unlimited"
+    lines = [
+        f"Cache directory: {stats['cache_dir']}",
+        f"Total size:      {format_file_size(stats['total_bytes'])} in {stats['entry_count']} entries (budget {budget})",
+    ]
+    for name, category in sorted(stats['categories'].items()):
+        lines.append(f"  {name:<10} {category['count']:>6} entries  {format_file_size(category['bytes'])}")
+    if stats['stale_count']:
+        lines.append(f"Outdated schema: {stats['stale_count']} entries (removed by --cache-gc)")
+    if stats['oldest_access'] is not None:
+        lines.append(f"Least recently used: {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['oldest_access']))}")
+        lines.append(f"Most recently used:  {time.strftime('%Y-%m-%d %H:%M', time.localtime(stats['newest_access']))}")
+    return "\n".join(lines)
@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+Day Cache Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module implements the per-day preprocessing cache. Each cached day is keyed
+by the source day it came from and by a fingerprint of the preprocessing
+settings that shaped it (ship types, geographic box, MMSI list, speed threshold,
+schema version), not by the date range of the run that produced it. Any later
+run or analysis whose range overlaps reuses the days that are already cached.
+
+Each fingerprint directory is an append-only dataset partitioned by date: runs
+add partitions for new days and never rewrite the history. Within a partition
+rows are deduplicated on (MMSI, BaseDateTime) and sorted by MMSI, so row group
+statistics let readers skip row groups when filtering on vessels. Readers scan
+the partitions lazily through pyarrow.dataset with filters pushed down.
+
+An optional hot tier (HOT_CACHE) keeps an uncompressed Arrow IPC copy of each
+partition. Readers open it memory-mapped, so repeated loads of a day by SFD.py,
+the advanced analysis and the ML prediction cost page faults instead of a
+parquet decode. Hot files are used whenever they are newer than their
+partition, whichever process wrote them.
+
+Layout inside the cache directory:
+
+    days/<fingerprint>/fingerprint.json     settings behind the fingerprint
+    days/<fingerprint>/YYYY-MM-DD.parquet   one preprocessed day (partition)
+    days/<fingerprint>/hot/YYYY-MM-DD.arrow hot copy of the partition
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from utils import get_cache_dir
+from ais_schema import (AIS_SCHEMA_VERSION, read_ais_parquet, write_ais_parquet,
+                        read_parquet_metadata, conform_dataframe, conform_table,
+                        table_to_dataframe, DICTIONARY_COLUMNS)
+from cache_manager import record_cache_entry, touch_cache_entry
+from read_planner import expand_ship_types
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+    import pyarrow.parquet as pq
+    PYARROW_DATASET_AVAILABLE = True
+except ImportError:
+    PYARROW_DATASET_AVAILABLE = False
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Bump when load_and_preprocess_day changes the rows or columns it produces
+PREPROCESS_VERSION = 1
+
+DAY_CACHE_SUBDIR = "days"
+FINGERPRINT_FILE = "fingerprint.json"
+
+# Parquet metadata entry identifying the source file a day was built from
+SOURCE_FINGERPRINT_KEY = "sfd.source_fingerprint"
+
+HOT_CACHE_SUBDIR = "hot"
+HOT_CACHE_SUFFIX = ".arrow"
+
+# Rows per row group within a partition; small enough for MMSI range pruning
+PARTITION_ROW_GROUP_SIZE = 65536
+
+# Requested settings assumed for whatever a cache lookup does not specify
+_UNRESTRICTED_SETTINGS = {
+    'min_latitude': -90.0,
+    'max_latitude': 90.0,
+    'min_longitude': -180.0,
+    'max_longitude': 180.0,
+    'mmsi_list': [],
+    'speed_threshold': None,
+}
+
+_DAY_PATTERN = re.compile(r'(\d{4})[-_](\d{2})[-_](\d{2})')
+
+
+def normalize_partition(df):
+    """
+    Deduplicate a day on (MMSI, BaseDateTime) and sort it by MMSI, then time.
+
+    This is the layout of every partition. load_and_preprocess_day applies it
+    before caching so a day looks the same whether it came from the cache or not.
+
+    Args:
+        df (DataFrame): Preprocessed day
+
+    Returns:
+        DataFrame: Normalised day with a fresh index
+    """
+    if df is None or df.empty or 'MMSI' not in df.columns or 'BaseDateTime' not in df.columns:
+        return df
+    before = len(df)
+    df = df.drop_duplicates(subset=['MMSI', 'BaseDateTime'], keep='first')
+    if len(df) < before:
+        logger.info(f"Removed {before - len(df)} duplicate (MMSI, BaseDateTime) records")
+    return df.sort_values(['MMSI', 'BaseDateTime'], kind='stable').reset_index(drop=True)
+
+
+def preprocess_settings(config):
+    """
+    Normalised preprocessing settings that determine a cached day's contents.
+
+    Args:
+        config (dict): Configuration dictionary from SFD.load_config
+
+    Returns:
+        dict: JSON-serialisable settings
+    """
+    mmsi_list = config.get('filter_mmsi_list', [])
+    if isinstance(mmsi_list, str):
+        mmsi_list = [mmsi.strip() for mmsi in mmsi_list.split(',') if mmsi.strip()]
+    speed_threshold = config.get('SPEED_THRESHOLD', 102)
+
+    return {
+        'ship_types': sorted(int(t) for t in config.get('SELECTED_SHIP_TYPES', []) or []),
+        'min_latitude': float(config.get('min_latitude', -90.0)),
+        'max_latitude': float(config.get('max_latitude', 90.0)),
+        'min_longitude': float(config.get('min_longitude', -180.0)),
+        'max_longitude': float(config.get('max_longitude', 180.0)),
+        'mmsi_list': sorted(int(m) for m in mmsi_list),
+        'speed_threshold': float(speed_threshold) if speed_threshold is not None else None,
+        'schema_version': AIS_SCHEMA_VERSION,
+        'preprocess_version': PREPROCESS_VERSION,
+    }
+
+
+def preprocess_fingerprint(config):
+    """
+    Short hash of the preprocessing settings.
+
+    Args:
+        config (dict): Configuration dictionary
+
+    Returns:
+        str: 12-character hex fingerprint
+    """
+    settings_str = json.dumps(preprocess_settings(config), sort_keys=True)
+    return hashlib.md5(settings_str.encode()).hexdigest()[:12]
+
+
+def source_day(file_path):
+    """
+    Day a source file covers, read from its name (ais-YYYY-MM-DD, AIS_YYYY_MM_DD, ...).
+
+    Args:
+        file_path (str): Local path or S3 URI
+
+    Returns:
+        str or None: Day as YYYY-MM-DD, or None if the name carries no date
+    """
+    match = _DAY_PATTERN.search(os.path.basename(file_path))
+    if not match:
+        return None
+    try:
+        return datetime.strptime('-'.join(match.groups()), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def source_fingerprint(file_path):
+    """
+    Identity of a source file's contents (size and modification time).
+
+    Args:
+        file_path (str): Local path or S3 URI
+
+    Returns:
+        str: Fingerprint, or an empty string when it cannot be determined (e.g. S3)
+    """
+    if file_path.startswith('s3://') or not os.path.exists(file_path):
+        return ''
+    try:
+        stat = os.stat(file_path)
+        return f"{stat.st_size}-{int(stat.st_mtime)}"
+    except OSError:
+        return ''
+
+
+def fingerprint_dir(config, cache_dir=None, create=False):
+    """
+    Directory holding the cached days for the configuration's fingerprint.
+
+    Args:
+        config (dict): Configuration dictionary
+        cache_dir (str, optional): Cache root, defaults to utils.get_cache_dir()
+        create (bool, optional): Create the directory and its fingerprint.json
+
+    Returns:
+        str or None: Directory path, or None if there is no cache directory
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    if not cache_dir:
+        return None
+    directory = os.path.join(cache_dir, DAY_CACHE_SUBDIR, preprocess_fingerprint(config))
+    if create and not os.path.exists(os.path.join(directory, FINGERPRINT_FILE)):
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, FINGERPRINT_FILE), 'w') as f:
+                json.dump(preprocess_settings(config), f, indent=2, sort_keys=True)
+        except OSError as e:
+            logger.warning(f"Failed to create day cache directory {directory}: {e}")
+    return directory
+
+
+def day_cache_path(file_path, config, cache_dir=None):
+    """
+    Cache path for one source file under the current preprocessing settings.
+
+    Args:
+        file_path (str): Source file path or S3 URI
+        config (dict): Configuration dictionary
+        cache_dir (str, optional): Cache root
+
+    Returns:
+        str or None: Path of the cached day
+    """
+    directory = fingerprint_dir(config, cache_dir, create=True)
+    if not directory:
+        return None
+    # Files without a date in their name are cached under their own name
+    name = source_day(file_path) or os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(directory, f"{name}.parquet")
+
+
+def _cache_root(cache_path):
+    """Cache directory holding a cached day (the manifest lives there)."""
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(cache_path))))
+
+
+def load_cached_day(file_path, config, cache_dir=None):
+    """
+    Load a cached preprocessed day for a source file.
+
+    Args:
+        file_path (str): Source file path or S3 URI
+        config (dict): Configuration dictionary
+        cache_dir (str, optional): Cache root
+
+    Returns:
+        tuple: (DataFrame or None, cache_path or None)
+    """
+    cache_path = day_cache_path(file_path, config, cache_dir)
+    if not cache_path or not os.path.exists(cache_path):
+        return None, cache_path
+
+    # A source file that changed since it was cached invalidates the entry
+    cached_source = read_parquet_metadata(cache_path).get(SOURCE_FINGERPRINT_KEY, '')
+    current_source = source_fingerprint(file_path)
+    if cached_source and current_source and cached_source != current_source:
+        logger.info(f"CACHE: Source changed since {os.path.basename(cache_path)} was cached, rebuilding")
+        return None, cache_path
+
+    try:
+        table = open_hot_day(cache_path)
+        if table is not None:
+            return table_to_dataframe(table, split_blocks=True), cache_path
+        df = read_ais_parquet(cache_path)
+        touch_cache_entry(cache_path, _cache_root(cache_path))
+        if config.get('HOT_CACHE', False):
+            write_hot_day(df, cache_path)
+        return df, cache_path
+    except Exception as e:
+        logger.warning(f"Failed to load cached day {cache_path}: {e}")
+        return None, cache_path
+
+
+def hot_cache_path(cache_path):
+    """
+    Path of the hot (Arrow IPC) copy of a partition.
+
+    Args:
+        cache_path (str): Partition path
+
+    Returns:
+        str: Hot file path
+    """
+    directory, name = os.path.split(cache_path)
+    return os.path.join(directory, HOT_CACHE_SUBDIR, os.path.splitext(name)[0] + HOT_CACHE_SUFFIX)
+
+
+def write_hot_day(df, cache_path):
+    """
+    Write the hot copy of a partition as an uncompressed Arrow IPC file.
+
+    Args:
+        df (DataFrame): Day as stored in the partition
+        cache_path (str): Partition path
+
+    Returns:
+        bool: True if written
+    """
+    if not PYARROW_DATASET_AVAILABLE or df is None or df.empty:
+        return False
+    hot_path = hot_cache_path(cache_path)
+    temp_path = hot_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(hot_path), exist_ok=True)
+        table = conform_table(pa.Table.from_pandas(conform_dataframe(df), preserve_index=False))
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, hot_path)
+        record_cache_entry(hot_path, '', AIS_SCHEMA_VERSION, _cache_root(cache_path))
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to write hot cache file {hot_path}: {e}")
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+
+
+def open_hot_day(cache_path):
+    """
+    Open the hot copy of a partition memory-mapped, without copying it.
+
+    Args:
+        cache_path (str): Partition path
+
+    Returns:
+        pyarrow.Table or None: Table backed by the mapped file, or None when
+            there is no hot copy or it is older than the partition
+    """
+    if not PYARROW_DATASET_AVAILABLE:
+        return None
+    hot_path = hot_cache_path(cache_path)
+    try:
+        if not os.path.exists(hot_path) or os.path.getmtime(hot_path) < os.path.getmtime(cache_path):
+            return None
+        # The table's buffers keep the mapping alive after this function returns
+        table = pa.ipc.open_file(pa.memory_map(hot_path, 'r')).read_all()
+    except Exception as e:
+        logger.debug(f"Hot cache file {hot_path} unusable: {e}")
+        return None
+    touch_cache_entry(hot_path, _cache_root(cache_path))
+    touch_cache_entry(cache_path, _cache_root(cache_path))
+    return table
+
+
+def save_cached_day(df, cache_path, file_path, hot=False):
+    """
+    Save a preprocessed day to the cache as a normalised partition.
+
+    Args:
+        df (DataFrame): Preprocessed day
+        cache_path (str): Path from day_cache_path
+        file_path (str): Source file the day was built from
+        hot (bool, optional): Also write the memory-mappable hot copy
+
+    Returns:
+        bool: True if saved
+    """
+    if df is None or df.empty or not cache_path:
+        return False
+    temp_path = cache_path + ".tmp"
+    fingerprint = source_fingerprint(file_path)
+    try:
+        df = normalize_partition(df)
+        write_ais_parquet(df, temp_path, metadata={
+            SOURCE_FINGERPRINT_KEY: fingerprint,
+            'sfd.source_file': os.path.basename(file_path),
+        }, row_group_size=PARTITION_ROW_GROUP_SIZE)
+        os.replace(temp_path, cache_path)
+        record_cache_entry(cache_path, fingerprint, AIS_SCHEMA_VERSION, _cache_root(cache_path))
+        if hot:
+            write_hot_day(df, cache_path)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to save cached day {cache_path}: {e}")
+        if os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+
+
+def list_fingerprint_dirs(cache_dir=None):
+    """
+    All fingerprint directories in the day cache with their settings.
+
+    Args:
+        cache_dir (str, optional): Cache root
+
+    Returns:
+        list: (directory, settings) tuples, newest first
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    days_root = os.path.join(cache_dir, DAY_CACHE_SUBDIR) if cache_dir else None
+    if not days_root or not os.path.isdir(days_root):
+        return []
+
+    entries = []
+    for name in os.listdir(days_root):
+        directory = os.path.join(days_root, name)
+        settings_path = os.path.join(directory, FINGERPRINT_FILE)
+        if not os.path.isfile(settings_path):
+            continue
+        try:
+            with open(settings_path) as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skipping day cache {directory}: {e}")
+            continue
+        entries.append((directory, settings, os.path.getmtime(directory)))
+
+    entries.sort(key=lambda entry: entry[2], reverse=True)
+    return [(directory, settings) for directory, settings, _ in entries]
+
+
+def _ship_type_rank(settings, ship_types):
+    """Preference of a fingerprint for the requested ship types (lower is better, None = unusable)."""
+    cached_types = set(settings.get('ship_types', []))
+    wanted = set(int(t) for t in ship_types or [])
+    if cached_types == wanted:
+        return 0
+    if not cached_types:
+        # Unfiltered days contain every type; callers filter in memory
+        return 1
+    if wanted and wanted <= cached_types:
+        return 2
+    return None
+
+
+def _requested_settings(settings):
+    """Requested preprocessing settings, unrestricted where a setting is not given."""
+    requested = dict(_UNRESTRICTED_SETTINGS)
+    requested.update(settings or {})
+    return requested
+
+
+def _covers(settings, requested):
+    """Whether a fingerprint's days hold every row the requested settings keep."""
+    if (settings.get('schema_version') != AIS_SCHEMA_VERSION
+            or settings.get('preprocess_version') != PREPROCESS_VERSION):
+        return False
+
+    # The cached box must contain the requested one
+    if (settings.get('min_latitude', -90.0) > requested['min_latitude']
+            or settings.get('max_latitude', 90.0) < requested['max_latitude']
+            or settings.get('min_longitude', -180.0) > requested['min_longitude']
+            or settings.get('max_longitude', 180.0) < requested['max_longitude']):
+        return False
+
+    # An MMSI filtered entry only serves requests for some of its vessels
+    cached_mmsi = set(settings.get('mmsi_list', []))
+    wanted_mmsi = set(int(m) for m in requested['mmsi_list'] or [])
+    if cached_mmsi and not (wanted_mmsi and wanted_mmsi <= cached_mmsi):
+        return False
+
+    # Rows above the speed threshold were dropped and cannot be restored
+    speed_threshold = requested['speed_threshold']
+    if speed_threshold is not None and settings.get('speed_threshold') != float(speed_threshold):
+        return False
+    return True
+
+
+def find_cached_days(start_date, end_date, ship_types=None, cache_dir=None, settings=None):
+    """
+    Resolve a date range to cached days, whatever run range produced them.
+
+    Only entries whose preprocessing settings keep every requested row are
+    considered: same schema and preprocess version, a geographic box containing
+    the requested one, no MMSI filter or one covering the requested vessels,
+    and the requested speed threshold. Among those, for each day the entry
+    whose ship type selection matches exactly is used; otherwise an unfiltered
+    or broader entry (to be filtered by the caller).
+
+    Args:
+        start_date (str or date): First day (YYYY-MM-DD)
+        end_date (str or date): Last day (YYYY-MM-DD)
+        ship_types (list, optional): Requested ship types
+        cache_dir (str, optional): Cache root
+        settings (dict, optional): Other requested settings, as in
+            preprocess_settings (min/max latitude and longitude, mmsi_list,
+            speed_threshold); missing ones are unrestricted, and a missing
+            speed_threshold accepts any
+
+    Returns:
+        dict: Mapping of YYYY-MM-DD to cached parquet path, in date order
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+    requested = _requested_settings(settings)
+
+    candidates = []
+    for directory, cached_settings in list_fingerprint_dirs(cache_dir):
+        rank = _ship_type_rank(cached_settings, ship_types)
+        if rank is not None and _covers(cached_settings, requested):
+            candidates.append((rank, directory))
+    # Stable sort keeps newest-first order within the same rank
+    candidates.sort(key=lambda candidate: candidate[0])
+
+    found = {}
+    day = start_date
+    while day <= end_date:
+        day_str = day.strftime('%Y-%m-%d')
+        for _, directory in candidates:
+            path = os.path.join(directory, f"{day_str}.parquet")
+            if os.path.exists(path):
+                found[day_str] = path
+                break
+        day += timedelta(days=1)
+    return found
+
+
+def filter_by_ship_types(df, ship_types):
+    """
+    Keep rows whose vessel type is among the selected ship types.
+
+    Args:
+        df (DataFrame): AIS records
+        ship_types (list): Selected ship types
+
+    Returns:
+        DataFrame: Filtered records
+    """
+    if not ship_types or df is None or df.empty or 'VesselType' not in df.columns:
+        return df
+    return df[df['VesselType'].astype('float64').isin(expand_ship_types(ship_types))]
+
+
+def _dataset_schema(paths):
+    """Common schema of the partitions, with one dictionary index width throughout."""
+    fields = {}
+    for path in paths:
+        for field in pq.read_schema(path):
+            if field.name in DICTIONARY_COLUMNS:
+                field = pa.field(field.name, pa.dictionary(pa.int32(), pa.string()))
+            fields.setdefault(field.name, field)
+    return pa.schema(list(fields.values()))
+
+
+def scan_cached_days(start_date, end_date, ship_types=None, cache_dir=None, settings=None):
+    """
+    Lazy dataset over the cached partitions of a date range.
+
+    Nothing is read until the dataset is scanned; filters and column
+    selections given to the scan are pushed down to the partitions.
+
+    Args:
+        start_date (str): First day (YYYY-MM-DD)
+        end_date (str): Last day (YYYY-MM-DD)
+        ship_types (list, optional): Requested ship types
+        cache_dir (str, optional): Cache root
+        settings (dict, optional): Other requested settings, see find_cached_days
+
+    Returns:
+        pyarrow.dataset.Dataset or None: Dataset, or None when nothing is cached
+    """
+    if not PYARROW_DATASET_AVAILABLE:
+        return None
+    paths = list(find_cached_days(start_date, end_date, ship_types, cache_dir, settings).values())
+    if not paths:
+        return None
+    return pa_ds.dataset(paths, schema=_dataset_schema(paths), format='parquet')
+
+
+def _widen_dictionaries(table):
+    """Cast dictionary columns to int32 indices so days concatenate."""
+    wide = pa.dictionary(pa.int32(), pa.string())
+    for index, field in enumerate(table.schema):
+        if field.name in DICTIONARY_COLUMNS and field.type != wide:
+            table = table.set_column(index, field.name, table.column(index).cast(wide))
+    return table
+
+
+def _box_bounds(requested):
+    """(min_lat, max_lat, min_lon, max_lon) of a requested box, None when unrestricted."""
+    bounds = tuple(float(requested[key]) for key in ('min_latitude', 'max_latitude', 'min_longitude', 'max_longitude'))
+    return None if bounds == (-90.0, 90.0, -180.0, 180.0) else bounds
+
+
+def _concat_tables(tables):
+    """Concatenate day tables whose schemas may differ in optional columns."""
+    try:
+        return pa.concat_tables(tables, promote_options='permissive')
+    except TypeError:
+        # pyarrow before 14 only knows the boolean form
+        return pa.concat_tables(tables, promote=True)
+
+
+def _scan_day(path, columns, codes, mmsi, box=None):
+    """Read one partition (its hot copy when available) with the filters applied."""
+    table = open_hot_day(path)
+    source = table if table is not None else pa_ds.dataset(path, format='parquet')
+    names = source.schema.names
+
+    conditions = []
+    if codes and 'VesselType' in names:
+        conditions.append(pa_ds.field('VesselType').isin(codes))
+    if mmsi:
+        conditions.append(pa_ds.field('MMSI').isin(mmsi))
+    if box is not None:
+        min_lat, max_lat, min_lon, max_lon = box
+        conditions.append((pa_ds.field('LAT') >= min_lat) & (pa_ds.field('LAT') <= max_lat)
+                          & (pa_ds.field('LON') >= min_lon) & (pa_ds.field('LON') <= max_lon))
+    condition = None
+    for part in conditions:
+        condition = part if condition is None else condition & part
+
+    if table is None:
+        touch_cache_entry(path, _cache_root(path))
+        return source.to_table(columns=columns, filter=condition)
+    if condition is not None:
+        table = table.filter(condition)
+    return table.select(columns) if columns else table
+
+
+def read_cached_days(start_date, end_date, ship_types=None, columns=None, mmsi=None, cache_dir=None,
+                     settings=None):
+    """
+    Read the cached rows of a date range, filtered while scanning.
+
+    Each partition is read from its memory-mapped hot copy when one is
+    available, otherwise scanned from parquet with the filters pushed down.
+
+    Args:
+        start_date (str): First day (YYYY-MM-DD)
+        end_date (str): Last day (YYYY-MM-DD)
+        ship_types (list, optional): Keep only these ship types
+        columns (list, optional): Columns to read
+        mmsi (list, optional): Keep only these vessels
+        cache_dir (str, optional): Cache root
+        settings (dict, optional): Other requested settings, see
+            find_cached_days; rows outside the requested box and MMSI list
+            are dropped
+
+    Returns:
+        DataFrame: Cached rows for the range in date order (empty if none are cached)
+    """
+    day_files = find_cached_days(start_date, end_date, ship_types, cache_dir, settings)
+    if not day_files:
+        return pd.DataFrame()
+    requested = _requested_settings(settings)
+    mmsi = mmsi or requested['mmsi_list']
+    mmsi = sorted(int(m) for m in mmsi) if mmsi else None
+    box = _box_bounds(requested)
+
+    if PYARROW_DATASET_AVAILABLE:
+        codes = expand_ship_types(ship_types)
+        tables = [_widen_dictionaries(_scan_day(path, columns, codes, mmsi, box)) for path in day_files.values()]
+        table = _concat_tables(tables)
+        df = table_to_dataframe(conform_table(table), split_blocks=True)
+    else:
+        frames = [read_ais_parquet(path) for path in day_files.values()]
+        df = filter_by_ship_types(conform_dataframe(pd.concat(frames, ignore_index=True)), ship_types)
+        if mmsi:
+            df = df[df['MMSI'].isin(mmsi)]
+        if box is not None:
+            min_lat, max_lat, min_lon, max_lon = box
+            df = df[df['LAT'].between(min_lat, max_lat) & df['LON'].between(min_lon, max_lon)]
+        if columns:
+            df = df[columns]
+        for path in day_files.values():
+            touch_cache_entry(path, _cache_root(path))
+
+    return df.reset_index(drop=True)
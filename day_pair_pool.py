@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Day Pair Pool Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module runs the day-pair anomaly detection of
+SFD._process_anomaly_detection on a pool of worker processes (WORKERS,
+--workers N). The main process still loads the days in order and keeps the
+state that chains from one day to the next (the vessel state and the positions
+carried into the loitering windows); each (previous day, current day) pair is
+then detected by a worker.
+
+Frames are not pickled to the workers. Each one is written once as an
+uncompressed Arrow IPC file in shared memory (/dev/shm where it exists, the
+temporary directory otherwise) and the workers open it memory-mapped. Results
+are handed back in date order, so merging them gives the same records as a
+serial run.
+"""
+
+import os
+import time
+import shutil
+import logging
+import weakref
+import tempfile
+import concurrent.futures
+
+from day_prefetcher import StageTimer
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    PYARROW_AVAILABLE = False
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Directory backed by memory on Linux; shared frames are written there when it exists
+SHARED_MEMORY_DIR = '/dev/shm'
+
+# Day pairs kept in flight per worker before the oldest result is waited for
+PENDING_PAIRS_PER_WORKER = 2
+
+# Worker process state, set by _init_worker
+_worker = {}
+
+
+def share_frame(df, path):
+    """
+    Write a DataFrame as an uncompressed Arrow IPC file for memory-mapped reads.
+
+    The pandas metadata is kept, so open_shared_frame restores the same dtypes
+    (categoricals with their categories, nullable integers, datetime units).
+
+    Args:
+        df (DataFrame): Frame to share
+        path (str): Output path
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def open_shared_frame(path):
+    """
+    Open a frame written by share_frame, memory-mapped.
+
+    Each column gets its own block and the table is released while it is
+    converted, so numeric columns without nulls stay views of the mapping
+    instead of being copied into the worker. They are read-only.
+
+    Args:
+        path (str): File written by share_frame
+
+    Returns:
+        DataFrame: The shared frame
+    """
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _init_worker(detect_func, setup_func, config):
+    """Keep the detector, configuration and setup result for the worker's tasks."""
+    _worker['detect'] = detect_func
+    _worker['config'] = config
+    _worker['context'] = setup_func(config) if setup_func is not None else None
+
+
+def _run_pair(paths, current_date, previous_date):
+    """Detect one day pair in a worker from the shared frame files."""
+    frames = {name: open_shared_frame(path) if path is not None else None for name, path in paths.items()}
+    return _worker['detect'](frames['current'], frames['previous'], current_date, previous_date,
+                             frames['last_seen'], frames['carried'], _worker['config'], _worker['context'])
+
+
+class DayPairPool:
+    """
+    Runs day-pair detection on worker processes and returns results in date order.
+
+    detect_func is called in a worker as
+    detect_func(df_current_day, df_previous_day, current_date, previous_date,
+    last_seen, loitering_carried, config, context), where context is what
+    setup_func(config) returned once in that worker. Both functions must be
+    importable by the workers (module-level functions).
+    """
+
+    def __init__(self, workers, detect_func, config, setup_func=None, timer=None, shared_dir=None):
+        """
+        Start the pool.
+
+        Args:
+            workers (int): Number of worker processes
+            detect_func (callable): Day-pair detector, see the class docstring
+            config (dict): Configuration dictionary passed to the workers
+            setup_func (callable, optional): Per-worker setup taking config
+            timer (StageTimer, optional): Timer receiving 'share' and 'wait' stage times
+            shared_dir (str, optional): Directory for the shared frame files
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for parallel day-pair detection")
+
+        self.workers = max(1, int(workers))
+        self.timer = timer or StageTimer()
+        self.max_pending = self.workers * PENDING_PAIRS_PER_WORKER
+        if shared_dir is None and os.path.isdir(SHARED_MEMORY_DIR):
+            shared_dir = SHARED_MEMORY_DIR
+        self.directory = tempfile.mkdtemp(prefix='sfd_pairs_', dir=shared_dir)
+        # Shared memory is not freed with the process, so make sure the files go
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, True)
+        self.pending = []
+        self.day_files = {}
+        self.day_users = {}
+        self.sequence = 0
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(detect_func, setup_func, config)
+        )
+        logger.info(f"Day-pair detection on {self.workers} worker processes (shared frames in {self.directory})")
+
+    def _share(self, df, name):
+        """Write a frame to the shared directory and return its path."""
+        if df is None:
+            return None
+        start = time.perf_counter()
+        path = os.path.join(self.directory, f"{name}.arrow")
+        share_frame(df, path)
+        self.timer.add('share', time.perf_counter() - start)
+        return path
+
+    def _share_day(self, day, df):
+        """Share a day once, however many pairs use it."""
+        if day not in self.day_files:
+            self.day_files[day] = self._share(df, f"day_{day.strftime('%Y-%m-%d')}")
+            self.day_users[day] = 0
+        self.day_users[day] += 1
+        return self.day_files[day]
+
+    def _release(self, days, pair_paths):
+        """Remove the files of a finished pair and of days no pending pair uses."""
+        for path in pair_paths:
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+        for day in days:
+            self.day_users[day] -= 1
+            if self.day_users[day] == 0:
+                os.remove(self.day_files.pop(day))
+                del self.day_users[day]
+
+    def submit(self, df_current_day, df_previous_day, current_date, previous_date, last_seen,
+               loitering_carried):
+        """
+        Queue one day pair for detection.
+
+        Args:
+            df_current_day (DataFrame): Current day of AIS reports
+            df_previous_day (DataFrame): Previous day of AIS reports
+            current_date (date): Current day
+            previous_date (date): Previous day
+            last_seen (DataFrame): Last-seen table as of the previous day
+            loitering_carried (DataFrame or None): Positions carried into the
+                current day's loitering windows
+        """
+        self.sequence += 1
+        paths = {
+            'current': self._share_day(current_date, df_current_day),
+            'previous': self._share_day(previous_date, df_previous_day),
+            'last_seen': self._share(last_seen, f"last_seen_{self.sequence}"),
+            'carried': self._share(loitering_carried, f"carried_{self.sequence}"),
+        }
+        future = self.executor.submit(_run_pair, paths, current_date, previous_date)
+        self.pending.append((current_date, previous_date, paths, future))
+
+    def _pop(self):
+        """Wait for the oldest pending pair and return (current_date, result)."""
+        current_date, previous_date, paths, future = self.pending.pop(0)
+        start = time.perf_counter()
+        try:
+            result = future.result()
+        finally:
+            self.timer.add('wait', time.perf_counter() - start)
+            self._release([current_date, previous_date], [paths['last_seen'], paths['carried']])
+        return current_date, result
+
+    def ready(self):
+        """
+        Results of the oldest pairs that are finished, in date order.
+
+        Also waits for the oldest pairs while more than the pending limit are
+        in flight, which bounds the shared memory in use.
+
+        Yields:
+            tuple: (current_date, result of detect_func)
+        """
+        while self.pending and (self.pending[0][3].done() or len(self.pending) > self.max_pending):
+            yield self._pop()
+
+    def drain(self):
+        """
+        Results of every pending pair, in date order.
+
+        Yields:
+            tuple: (current_date, result of detect_func)
+        """
+        while self.pending:
+            yield self._pop()
+
+    def close(self):
+        """Cancel pending pairs, stop the workers and remove the shared files."""
+        for _, _, _, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self._cleanup()
+        self.day_files.clear()
+        self.day_users.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Day Prefetcher Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module provides a bounded prefetch pipeline for the day-by-day anomaly
+detection loop. Upcoming daily files are decoded and preprocessed on
+background threads while the current day pair is being analysed, so disk,
+S3 and parquet decode time overlaps with detection.
+"""
+
+import time
+import logging
+import threading
+import concurrent.futures
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Days loaded ahead of the current one unless PREFETCH_DEPTH says otherwise
+DEFAULT_PREFETCH_DEPTH = 2
+
+
+class StageTimer:
+    """
+    Accumulates wall-clock time per pipeline stage.
+
+    Thread-safe so that background loader threads can record their own time.
+    """
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self.totals = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def add(self, stage, seconds):
+        """
+        Record time spent in a stage.
+
+        Args:
+            stage (str): Stage name
+            seconds (float): Elapsed wall-clock seconds
+        """
+        with self.lock:
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def report(self):
+        """
+        Build a summary of the recorded stages.
+
+        Returns:
+            str: One-line summary, e.g. "load=12.3s (3x), wait=1.2s (3x), ... wall=20.1s"
+        """
+        with self.lock:
+            parts = [f"{stage}={total:.2f}s ({self.counts[stage]}x)" for stage, total in self.totals.items()]
+        parts.append(f"wall={time.perf_counter() - self.started:.2f}s")
+        return ", ".join(parts)
+
+
+class DayPrefetcher:
+    """
+    Loads daily files ahead of the consumer on a bounded thread pool.
+
+    Files must be requested in order with get(). With depth=0 every file is
+    loaded synchronously on the calling thread, exactly like a plain loop.
+    """
+
+    def __init__(self, file_paths, load_func, depth=2, timer=None):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            file_paths (list): Files to load, in processing order
+            load_func (callable): Function taking a file path and returning its DataFrame
+            depth (int, optional): Number of files to load ahead of the current one
+            timer (StageTimer, optional): Timer receiving 'load' and 'wait' stage times
+        """
+        self.file_paths = list(file_paths)
+        self.load_func = load_func
+        self.depth = max(0, int(depth or 0))
+        self.timer = timer or StageTimer()
+        self.futures = {}
+        self.next_index = 0
+        self.executor = None
+
+        if self.depth > 0:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.depth,
+                thread_name_prefix="SFD-Prefetch"
+            )
+            logger.info(f"Day prefetch enabled with depth {self.depth}")
+
+    def _timed_load(self, file_path):
+        """Load one file and record its load time."""
+        start = time.perf_counter()
+        try:
+            return self.load_func(file_path)
+        finally:
+            self.timer.add('load', time.perf_counter() - start)
+
+    def _schedule(self, up_to_index):
+        """Submit loads for every file up to and including up_to_index."""
+        while self.next_index <= up_to_index and self.next_index < len(self.file_paths):
+            file_path = self.file_paths[self.next_index]
+            self.futures[self.next_index] = self.executor.submit(self._timed_load, file_path)
+            self.next_index += 1
+
+    def get(self, index):
+        """
+        Return the loaded DataFrame for file_paths[index].
+
+        Args:
+            index (int): Position of the file in file_paths
+
+        Returns:
+            DataFrame or None: Result of load_func for that file
+        """
+        if self.executor is None:
+            return self._timed_load(self.file_paths[index])
+
+        # Keep `depth` files in flight beyond the one being requested
+        self._schedule(index + self.depth)
+        future = self.futures.pop(index)
+
+        start = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            self.timer.add('wait', time.perf_counter() - start)
+
+    def close(self):
+        """Cancel outstanding loads and shut down the worker threads."""
+        if self.executor is None:
+            return
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=True)
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+File Staging Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module places a file at a second path without copying its bytes where the
+filesystem allows it. Cached NOAA parquet files are staged into the working
+parquet directory, and freshly converted files are staged back into the cache,
+with a hard link, a reflink (copy-on-write clone) or a symbolic link. Each of
+these takes constant time regardless of file size. A plain copy is the last
+resort, e.g. across volumes on Windows.
+
+Staged files are treated as read-only: parquet files are only ever replaced
+through a rename, which breaks a link instead of writing through it.
+"""
+
+import os
+import sys
+import shutil
+import logging
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Methods in order of preference
+STAGING_METHODS = ('hardlink', 'reflink', 'symlink', 'copy')
+
+# Methods for targets that must outlive the source (no symlink)
+INDEPENDENT_STAGING_METHODS = ('hardlink', 'reflink', 'copy')
+
+# Linux FICLONE ioctl request number (btrfs, XFS, bcachefs, ...)
+_FICLONE = 0x40049409
+
+
+def _reflink(source, target):
+    """Clone source into target with a copy-on-write reflink (Linux only)."""
+    if not sys.platform.startswith('linux'):
+        raise OSError("reflinks are only supported on Linux")
+    import fcntl
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(target)
+            raise
+    shutil.copystat(source, target)
+
+
+def _stage_with(method, source, target):
+    """Create target from source with one staging method."""
+    if method == 'hardlink':
+        os.link(source, target)
+    elif method == 'reflink':
+        _reflink(source, target)
+    elif method == 'symlink':
+        os.symlink(os.path.abspath(source), target)
+    elif method == 'copy':
+        shutil.copy2(source, target)
+    else:
+        raise ValueError(f"Unknown staging method: {method}")
+
+
+def stage_file(source, target, methods=STAGING_METHODS):
+    """
+    Make source available at target, avoiding a byte copy where possible.
+
+    The methods are tried in order until one succeeds. The result is renamed
+    into place, so target is never seen half-written and an existing target is
+    replaced atomically.
+
+    Args:
+        source (str): Existing file
+        target (str): Path the file should be available at
+        methods (tuple, optional): Staging methods to try, in order
+
+    Returns:
+        str: Method that was used, or 'existing' if target already is source
+
+    Raises:
+        OSError: If every method failed
+    """
+    if os.path.exists(target) and os.path.samefile(source, target):
+        return 'existing'
+
+    temp_path = f"{target}.stage-{os.getpid()}"
+    last_error = None
+    for method in methods:
+        try:
+            if os.path.lexists(temp_path):
+                os.remove(temp_path)
+            _stage_with(method, source, temp_path)
+            os.replace(temp_path, target)
+            return method
+        except (OSError, NotImplementedError) as e:
+            logger.debug(f"Staging {os.path.basename(source)} with {method} failed: {e}")
+            last_error = e
+
+    if os.path.lexists(temp_path):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    raise OSError(f"Could not stage {source} at {target}: {last_error}")
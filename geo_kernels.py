@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Geodesic Kernels Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module holds the spherical-Earth distance and direction functions shared
+by the anomaly detectors, the reports and the course prediction tools:
+haversine distances (pairwise, between consecutive points of a track, and from
+one point to many), initial bearings and destination points.
+
+All functions take scalars or arrays of degrees and compute in float64 unless
+dtype=np.float32 is requested. Small inputs always run in NumPy; arrays of at
+least NUMBA_MIN_SIZE elements use a parallel numba kernel when numba is
+installed. Callers that can move work to a GPU should only do so for batches of
+at least GPU_MIN_SIZE elements, below which the host-device transfer costs more
+than the arithmetic.
+"""
+
+import logging
+
+import numpy as np
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Optional numba fast path
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+# Earth radius in nautical miles
+EARTH_RADIUS_NM = 3440.1
+
+# Earth radius in meters
+EARTH_RADIUS_M = 6371000.0
+
+# Arrays smaller than this never leave NumPy
+NUMBA_MIN_SIZE = 100_000
+
+# Batches smaller than this are not worth a host-device transfer
+GPU_MIN_SIZE = 1_000_000
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _haversine_numba(lat1, lon1, lat2, lon2, radius, out):
+        for i in numba.prange(out.shape[0]):
+            phi1 = np.radians(lat1[i])
+            phi2 = np.radians(lat2[i])
+            a = (np.sin((phi2 - phi1) / 2) ** 2 +
+                 np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2[i] - lon1[i]) / 2) ** 2)
+            out[i] = 2 * radius * np.arcsin(np.sqrt(min(a, 1.0)))
+        return out
+
+
+def _as_arrays(dtype, *values):
+    """Broadcast inputs to arrays of one shape and dtype."""
+    return np.broadcast_arrays(*(np.asarray(value, dtype=dtype) for value in values))
+
+
+def _scalar(value, dtype):
+    """A constant in the working dtype, so float32 math stays float32."""
+    return np.dtype(dtype).type(value)
+
+
+def _result(value, scalar):
+    """Return a Python float for scalar inputs, the array otherwise."""
+    return value.item() if scalar else value
+
+
+def haversine(lat1, lon1, lat2, lon2, radius=EARTH_RADIUS_NM, dtype=np.float64):
+    """
+    Great-circle distance between pairs of points.
+
+    Args:
+        lat1 (float or array-like): Latitudes of the first points in degrees
+        lon1 (float or array-like): Longitudes of the first points in degrees
+        lat2 (float or array-like): Latitudes of the second points in degrees
+        lon2 (float or array-like): Longitudes of the second points in degrees
+        radius (float, optional): Earth radius, which sets the unit (nautical
+            miles by default; EARTH_RADIUS_M for meters)
+        dtype (numpy.dtype, optional): np.float64 or np.float32
+
+    Returns:
+        float or numpy.ndarray: Distances, NaN where a coordinate is missing
+    """
+    scalar = all(np.ndim(value) == 0 for value in (lat1, lon1, lat2, lon2))
+    lat1, lon1, lat2, lon2 = _as_arrays(dtype, lat1, lon1, lat2, lon2)
+
+    if NUMBA_AVAILABLE and lat1.size >= NUMBA_MIN_SIZE:
+        shape = lat1.shape
+        out = np.empty(lat1.size, dtype=dtype)
+        _haversine_numba(*(np.ascontiguousarray(value).ravel() for value in (lat1, lon1, lat2, lon2)),
+                         _scalar(radius, dtype), out)
+        return out.reshape(shape)
+
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(lon2 - lon1) / 2) ** 2
+    return _result(2 * _scalar(radius, dtype) * np.arcsin(np.sqrt(np.minimum(a, 1))), scalar)
+
+
+def haversine_consecutive(lat, lon, radius=EARTH_RADIUS_NM, dtype=np.float64):
+    """
+    Distance between each point of a track and the next.
+
+    Args:
+        lat (array-like): Track latitudes in degrees
+        lon (array-like): Track longitudes in degrees
+        radius (float, optional): Earth radius, which sets the unit
+        dtype (numpy.dtype, optional): np.float64 or np.float32
+
+    Returns:
+        numpy.ndarray: len(lat) - 1 segment distances
+    """
+    lat, lon = _as_arrays(dtype, lat, lon)
+    return haversine(lat[:-1], lon[:-1], lat[1:], lon[1:], radius, dtype)
+
+
+def haversine_to_point(lat, lon, lat0, lon0, radius=EARTH_RADIUS_NM, dtype=np.float64):
+    """
+    Distance from one point to many.
+
+    Args:
+        lat (array-like): Latitudes in degrees
+        lon (array-like): Longitudes in degrees
+        lat0 (float): Latitude of the reference point in degrees
+        lon0 (float): Longitude of the reference point in degrees
+        radius (float, optional): Earth radius, which sets the unit
+        dtype (numpy.dtype, optional): np.float64 or np.float32
+
+    Returns:
+        numpy.ndarray: Distances from (lat0, lon0)
+    """
+    return haversine(lat, lon, lat0, lon0, radius, dtype)
+
+
+def bearing(lat1, lon1, lat2, lon2, dtype=np.float64):
+    """
+    Initial bearing of the great circle from the first points to the second.
+
+    Args:
+        lat1 (float or array-like): Latitudes of the start points in degrees
+        lon1 (float or array-like): Longitudes of the start points in degrees
+        lat2 (float or array-like): Latitudes of the end points in degrees
+        lon2 (float or array-like): Longitudes of the end points in degrees
+        dtype (numpy.dtype, optional): np.float64 or np.float32
+
+    Returns:
+        float or numpy.ndarray: Bearings in degrees clockwise from north, in [0, 360)
+    """
+    scalar = all(np.ndim(value) == 0 for value in (lat1, lon1, lat2, lon2))
+    lat1, lon1, lat2, lon2 = _as_arrays(dtype, lat1, lon1, lat2, lon2)
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dlon = np.radians(lon2 - lon1)
+    y = np.sin(dlon) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlon)
+    return _result(np.degrees(np.arctan2(y, x)) % 360, scalar)
+
+
+def destination_point(lat, lon, bearing_deg, distance, radius=EARTH_RADIUS_NM, dtype=np.float64):
+    """
+    Point reached by travelling a distance along a great circle.
+
+    Args:
+        lat (float or array-like): Start latitudes in degrees
+        lon (float or array-like): Start longitudes in degrees
+        bearing_deg (float or array-like): Initial bearings in degrees
+        distance (float or array-like): Distances, in the unit of radius
+        radius (float, optional): Earth radius, which sets the unit
+        dtype (numpy.dtype, optional): np.float64 or np.float32
+
+    Returns:
+        tuple: (lat, lon) of the destinations in degrees, longitudes in [-180, 180)
+    """
+    scalar = all(np.ndim(value) == 0 for value in (lat, lon, bearing_deg, distance))
+    lat, lon, bearing_deg, distance = _as_arrays(dtype, lat, lon, bearing_deg, distance)
+    phi1, theta = np.radians(lat), np.radians(bearing_deg)
+    delta = distance / _scalar(radius, dtype)
+    phi2 = np.arcsin(np.clip(np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta), -1, 1))
+    lambda2 = np.radians(lon) + np.arctan2(np.sin(theta) * np.sin(delta) * np.cos(phi1),
+                                           np.cos(delta) - np.sin(phi1) * np.sin(phi2))
+    lon2 = (np.degrees(lambda2) + 180) % 360 - 180
+    return _result(np.degrees(phi2), scalar), _result(lon2, scalar)
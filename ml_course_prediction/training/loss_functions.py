@@ -5,9 +5,18 @@ Implements multi-objective loss with position, speed, course, and uncertainty co
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
+import sys
 import numpy as np
+from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+try:
+    from geo_kernels import EARTH_RADIUS_NM
+except ImportError:
+    # Scripts run from ml_course_prediction/ lack the repository root
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from geo_kernels import EARTH_RADIUS_NM
+
 
 class CoursePredictionLoss(nn.Module):
     """
@@ -348,10 +357,7 @@ def haversine_distance_nm(
     
     c = 2 * torch.asin(torch.sqrt(a))
     
-    # Earth radius in nautical miles
-    R_NM = 3440.0  # approximately
-    
-    distance_nm = R_NM * c
+    distance_nm = EARTH_RADIUS_NM * c
     
     return distance_nm
 
@@ -13,6 +13,14 @@ import warnings
 import hashlib
 import json
 
+# Canonical compact AIS schema shared with SFD.py (top-level module of the project)
+try:
+    from ais_schema import AIS_SCHEMA_VERSION, conform_dataframe, concat_ais_frames, write_ais_parquet
+    AIS_SCHEMA_AVAILABLE = True
+except ImportError:
+    AIS_SCHEMA_VERSION = None
+    AIS_SCHEMA_AVAILABLE = False
+
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 
 logger = logging.getLogger(__name__)
@@ -83,7 +91,8 @@ class HistoricalDataPreprocessor:
             'lon_range': valid_lon_range,
             'cog_range': valid_cog_range,
             'filter_unknown_types': filter_unknown_vessel_types,
-            'version': '1.0'  # Increment if preprocessing logic changes
+            'version': '1.0',  # Increment if preprocessing logic changes
+            'ais_schema': AIS_SCHEMA_VERSION  # Cached column types follow the shared schema
         }
         params_str = json.dumps(cache_params, sort_keys=True)
         self.cache_version_hash = hashlib.md5(params_str.encode()).hexdigest()[:8]
@@ -122,6 +131,9 @@ class HistoricalDataPreprocessor:
             else:
                 df = pd.read_parquet(filepath)
             
+            if AIS_SCHEMA_AVAILABLE:
+                df = conform_dataframe(df)
+            
             logger.info(f"Loaded {len(df):,} records from {filename}")
             return df
             
@@ -145,6 +157,8 @@ class HistoricalDataPreprocessor:
             try:
                 logger.debug(f"Loading cached data from {cache_path.name}")
                 df = pd.read_parquet(cache_path)
+                if AIS_SCHEMA_AVAILABLE:
+                    df = conform_dataframe(df)
                 logger.debug(f"Loaded {len(df):,} records from cache")
                 return df
             except Exception as e:
@@ -159,7 +173,10 @@ class HistoricalDataPreprocessor:
         
         cache_path = self._get_cache_path(date)
         try:
-            df.to_parquet(cache_path, index=False, compression='snappy')
+            if AIS_SCHEMA_AVAILABLE:
+                write_ais_parquet(df, cache_path, compression='snappy')
+            else:
+                df.to_parquet(cache_path, index=False, compression='snappy')
             logger.debug(f"Cached preprocessed data to {cache_path.name} ({len(df):,} records)")
         except Exception as e:
             logger.warning(f"Error saving cache file {cache_path}: {e}")
@@ -242,7 +259,10 @@ class HistoricalDataPreprocessor:
         
         # Combine all preprocessed dataframes
         logger.info(f"Combining {len(all_data)} days of data...")
-        combined_df = pd.concat(all_data, ignore_index=True)
+        if AIS_SCHEMA_AVAILABLE:
+            combined_df = concat_ais_frames(all_data, ignore_index=True)
+        else:
+            combined_df = pd.concat(all_data, ignore_index=True)
         
         logger.info(f"Combined {len(combined_df):,} total records from {len(all_data)} files")
         if preprocess and self.use_cache:
@@ -3,11 +3,20 @@ Feature Engineering for ML Course Prediction
 Extracts features from AIS trajectories for model training and prediction.
 """
 import logging
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import math
+from pathlib import Path
+
+try:
+    from geo_kernels import haversine, haversine_consecutive
+except ImportError:
+    # Repository root, appended as in trajectory_utils
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from geo_kernels import haversine, haversine_consecutive
 
 logger = logging.getLogger(__name__)
 
@@ -169,16 +178,10 @@ class FeatureEngineer:
         
         # Distance traveled
         if 'LAT' in trajectory.columns and 'LON' in trajectory.columns:
-            distances = []
-            for i in range(1, len(trajectory)):
-                dist = self._haversine_distance(
-                    trajectory.iloc[i-1]['LAT'], trajectory.iloc[i-1]['LON'],
-                    trajectory.iloc[i]['LAT'], trajectory.iloc[i]['LON']
-                )
-                distances.append(dist)
+            distances = haversine_consecutive(trajectory['LAT'].to_numpy(), trajectory['LON'].to_numpy())
             
-            if distances:
-                features['distance_total_nm'] = sum(distances)
+            if len(distances):
+                features['distance_total_nm'] = distances.sum()
                 features['distance_mean_nm'] = np.mean(distances)
                 features['distance_std_nm'] = np.std(distances)
         
@@ -258,16 +261,7 @@ class FeatureEngineer:
         Returns:
             Distance in nautical miles
         """
-        R = 3440.065  # Earth radius in nautical miles
-        
-        dlat = np.radians(lat2 - lat1)
-        dlon = np.radians(lon2 - lon1)
-        
-        a = (np.sin(dlat/2)**2 + 
-             np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon/2)**2)
-        c = 2 * np.arcsin(np.sqrt(a))
-        
-        return R * c
+        return haversine(lat1, lon1, lat2, lon2)
     
     def create_sequence_features(self, trajectory: pd.DataFrame,
                                 sequence_length: int = 24,
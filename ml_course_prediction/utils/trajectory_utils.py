@@ -3,6 +3,7 @@ Trajectory Processing Utilities
 Handles trajectory segmentation, gap detection, and preprocessing for AIS data.
 """
 import gc
+import sys
 import logging
 import numpy as np
 import pandas as pd
@@ -10,6 +11,15 @@ from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    from geo_kernels import haversine_consecutive
+except ImportError:
+    # geo_kernels lives at the repository root, which scripts run from inside
+    # ml_course_prediction/ do not put on sys.path. Appended, so the package's
+    # own utils keeps precedence over the root utils module.
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from geo_kernels import haversine_consecutive
+
 logger = logging.getLogger(__name__)
 
 
@@ -216,26 +226,9 @@ class TrajectoryProcessor:
         trajectory['lat_diff'] = trajectory['LAT'].diff()
         trajectory['lon_diff'] = trajectory['LON'].diff()
         
-        # Calculate distance (nautical miles) using Haversine formula
-        def haversine_distance(lat1, lon1, lat2, lon2):
-            """Calculate distance in nautical miles"""
-            R = 3440.065  # Earth radius in nautical miles
-            dlat = np.radians(lat2 - lat1)
-            dlon = np.radians(lon2 - lon1)
-            a = (np.sin(dlat/2)**2 + 
-                 np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon/2)**2)
-            c = 2 * np.arcsin(np.sqrt(a))
-            return R * c
-        
-        distances = []
-        for i in range(1, len(trajectory)):
-            dist = haversine_distance(
-                trajectory.iloc[i-1]['LAT'], trajectory.iloc[i-1]['LON'],
-                trajectory.iloc[i]['LAT'], trajectory.iloc[i]['LON']
-            )
-            distances.append(dist)
-        
-        trajectory['distance_nm'] = [0] + distances
+        # Calculate distance (nautical miles) between consecutive points
+        distances = haversine_consecutive(trajectory['LAT'].to_numpy(), trajectory['LON'].to_numpy())
+        trajectory['distance_nm'] = np.r_[0, distances]
         trajectory['speed_knots'] = trajectory['distance_nm'] / trajectory['time_diff_hours'].replace(0, np.nan)
         
         # Filter outliers
@@ -20,6 +20,13 @@ import numpy as np
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# The SFD day cache (and its memory-mapped hot tier) serves vessel histories
+try:
+    from day_cache import read_cached_days
+    DAY_CACHE_AVAILABLE = True
+except ImportError:
+    DAY_CACHE_AVAILABLE = False
+
 # Try to import ML dependencies
 ML_PREDICTION_AVAILABLE = False
 try:
@@ -628,6 +635,37 @@ class MLPredictionIntegrator:
         }
 
 
+def load_vessel_history(mmsi: int, start_date: str, end_date: str,
+                        ship_types: Optional[List[int]] = None,
+                        settings: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Load one vessel's AIS records from the SFD day cache.
+    
+    Only the vessel's rows are materialised: days kept in the hot cache are
+    filtered straight from their memory-mapped Arrow files, other days are
+    scanned from parquet with the MMSI filter pushed down to the MMSI-sorted
+    row groups.
+    
+    Args:
+        mmsi: Vessel MMSI number
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
+        ship_types: Ship type selection of the run that cached the days
+        settings: Geographic box, MMSI list and speed threshold of that run,
+            as in day_cache.preprocess_settings
+        
+    Returns:
+        DataFrame with the vessel's records (empty if nothing is cached)
+    """
+    if not DAY_CACHE_AVAILABLE:
+        return pd.DataFrame()
+    try:
+        return read_cached_days(start_date, end_date, ship_types, mmsi=[int(mmsi)], settings=settings)
+    except Exception as e:
+        logger.warning(f"Could not load vessel {mmsi} from the day cache: {e}")
+        return pd.DataFrame()
+
+
 def is_available() -> bool:
     """Check if ML prediction is available."""
     return ML_PREDICTION_AVAILABLE
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+NOAA Downloader Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module downloads the daily NOAA AIS ZIP archives. All transfers share one
+pooled HTTP session, several files are fetched at once, interrupted transfers
+are resumed from their partial file with Range requests, and every completed
+file is checked against the size reported by the server. Completed downloads
+are handed back to the caller as they finish, so converting one day overlaps
+with downloading the next.
+"""
+
+import os
+import re
+import time
+import logging
+import concurrent.futures
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin
+
+try:
+    from urllib3.util.retry import Retry
+    RETRY_AVAILABLE = True
+except ImportError:
+    RETRY_AVAILABLE = False
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Yearly NOAA directory; {year} is filled in per file so ranges may span years
+NOAA_BASE_URL = "https://coast.noaa.gov/htdata/CMSP/AISDataHandler/{year}/"
+
+# Default number of simultaneous transfers
+DEFAULT_DOWNLOAD_WORKERS = 4
+
+# Bytes read from the socket per write
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Suffix of in-progress downloads
+PARTIAL_SUFFIX = ".part"
+
+
+def noaa_zip_filename(date):
+    """
+    Name of the NOAA archive for a date.
+
+    Args:
+        date (datetime): Day to download
+
+    Returns:
+        str: File name like AIS_2024_10_01.zip
+    """
+    return f"AIS_{date.year}_{date.month:02d}_{date.day:02d}.zip"
+
+
+def noaa_url_for_date(date, base_url=None):
+    """
+    Build the download URL for a date.
+
+    Args:
+        date (datetime): Day to download
+        base_url (str, optional): Base URL, optionally containing a {year} placeholder.
+            Defaults to NOAA_BASE_URL. Point this at a local server for testing.
+
+    Returns:
+        str: Full URL of the day's ZIP archive
+    """
+    base_url = (base_url or NOAA_BASE_URL).format(year=date.year)
+    if not base_url.endswith('/'):
+        base_url += '/'
+    return urljoin(base_url, noaa_zip_filename(date))
+
+
+def create_session(pool_size=DEFAULT_DOWNLOAD_WORKERS, retries=3):
+    """
+    Create an HTTP session whose connection pool fits the number of workers.
+
+    Args:
+        pool_size (int, optional): Number of connections kept per host
+        retries (int, optional): Connection-level retries for transient failures
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter_kwargs = {'pool_connections': pool_size, 'pool_maxsize': pool_size}
+    if RETRY_AVAILABLE:
+        adapter_kwargs['max_retries'] = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=['HEAD', 'GET'],
+            raise_on_status=False
+        )
+    adapter = HTTPAdapter(**adapter_kwargs)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Sizes are verified against Content-Length, so ask for the raw bytes
+    session.headers.update({'Accept-Encoding': 'identity'})
+    return session
+
+
+def _total_size_from_content_range(header):
+    """Parse the total size out of a Content-Range header ("bytes 0-99/1000")."""
+    if not header:
+        return None
+    match = re.search(r'/(\d+)\s*$', header)
+    return int(match.group(1)) if match else None
+
+
+class DownloadJob:
+    """One file to download and the outcome of the transfer."""
+
+    def __init__(self, url, target_path, label=None, context=None):
+        """
+        Initialize the job.
+
+        Args:
+            url (str): Source URL
+            target_path (str): Where the completed file is written
+            label (str, optional): Name used in progress messages
+            context (object, optional): Caller data passed back untouched (e.g. the date)
+        """
+        self.url = url
+        self.target_path = target_path
+        self.label = label or os.path.basename(target_path)
+        self.context = context
+        self.success = False
+        self.error = None
+        self.bytes_downloaded = 0
+        self.resumed_from = 0
+        self.elapsed = 0.0
+
+
+class NOAADownloader:
+    """
+    Concurrent, resumable downloader built on a pooled requests session.
+    """
+
+    def __init__(self, max_workers=DEFAULT_DOWNLOAD_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE,
+                 timeout=60, retries=3, session=None, log=None):
+        """
+        Initialize the downloader.
+
+        Args:
+            max_workers (int, optional): Number of simultaneous transfers
+            chunk_size (int, optional): Bytes read per write
+            timeout (float, optional): Connect/read timeout in seconds
+            retries (int, optional): Attempts to resume an interrupted transfer
+            session (requests.Session, optional): Session to use instead of a new pooled one
+            log (callable, optional): Function receiving progress messages
+        """
+        self.max_workers = max(1, int(max_workers or 1))
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.session = session or create_session(self.max_workers, self.retries)
+        self.log = log or logger.info
+
+    def verify_url(self, url):
+        """
+        Check that a URL answers without an error status.
+
+        Args:
+            url (str): URL to check
+
+        Returns:
+            bool: True if the server responded with a status below 400
+        """
+        try:
+            response = self.session.head(url, timeout=min(self.timeout, 10), allow_redirects=True)
+            return response.status_code < 400
+        except requests.exceptions.RequestException:
+            return False
+
+    def download_file(self, url, target_path):
+        """
+        Download one file, resuming from a partial download when one exists.
+
+        Data is written to target_path + '.part' and only renamed to target_path
+        once its size matches what the server reported.
+
+        Args:
+            url (str): Source URL
+            target_path (str): Destination path
+
+        Returns:
+            DownloadJob: The finished job; check job.success and job.error
+        """
+        job = DownloadJob(url, target_path)
+        self._run_job(job)
+        return job
+
+    def _run_job(self, job):
+        """Transfer a job's file with resume and size verification."""
+        partial_path = job.target_path + PARTIAL_SUFFIX
+        start = time.perf_counter()
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # Back off before resuming an interrupted transfer
+                time.sleep(min(2 ** (attempt - 1), 10))
+            try:
+                done = self._transfer(job, partial_path)
+            except (requests.exceptions.RequestException, OSError) as e:
+                job.error = str(e)
+                logger.warning(f"Transfer of {job.label} interrupted (attempt {attempt + 1}): {e}")
+                continue
+
+            if done:
+                os.replace(partial_path, job.target_path)
+                job.success = True
+                job.error = None
+                break
+            if job.error and job.error.startswith('HTTP 4'):
+                # Missing file or bad request; retrying will not help
+                break
+
+        job.elapsed = time.perf_counter() - start
+        return job
+
+    def _transfer(self, job, partial_path):
+        """
+        Perform one request for the job, appending to the partial file.
+
+        Returns:
+            bool: True when the partial file is complete and verified
+        """
+        offset = os.path.getsize(partial_path) if os.path.exists(partial_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with self.session.get(job.url, stream=True, headers=headers, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # Requested range starts at or past the end: the partial file may already be whole
+                total = _total_size_from_content_range(response.headers.get('Content-Range'))
+                if total is not None and total == offset:
+                    job.resumed_from = offset
+                    return True
+                os.remove(partial_path)
+                job.error = "Partial file did not match the remote file; restarting"
+                return False
+
+            if response.status_code == 206 and offset:
+                mode = 'ab'
+                expected = _total_size_from_content_range(response.headers.get('Content-Range'))
+                job.resumed_from = offset
+            elif response.status_code == 200:
+                # Server ignored the Range header (or there was nothing to resume)
+                mode = 'wb'
+                offset = 0
+                content_length = response.headers.get('Content-Length')
+                expected = int(content_length) if content_length and content_length.isdigit() else None
+            else:
+                job.error = f"HTTP {response.status_code}"
+                return False
+
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        job.bytes_downloaded += len(chunk)
+
+        size = os.path.getsize(partial_path)
+        if expected is None or size == expected:
+            return True
+        if size > expected:
+            os.remove(partial_path)
+        job.error = f"Size mismatch: got {size} bytes, expected {expected}"
+        return False
+
+    def download_all(self, jobs, on_complete=None):
+        """
+        Download several files concurrently.
+
+        Transfers run on a thread pool of max_workers. Each finished job is
+        passed to on_complete on the calling thread as soon as it is done, so
+        slow post-processing (ZIP to parquet conversion) of one file overlaps
+        with the remaining transfers.
+
+        Args:
+            jobs (list): DownloadJob instances
+            on_complete (callable, optional): Called with each finished DownloadJob
+
+        Returns:
+            list: The same jobs with their outcome filled in
+        """
+        if not jobs:
+            return jobs
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(jobs)),
+                thread_name_prefix="SFD-Download") as executor:
+            futures = {executor.submit(self._run_job, job): job for job in jobs}
+            for future in concurrent.futures.as_completed(futures):
+                job = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    job.success = False
+                    job.error = str(e)
+                if on_complete:
+                    on_complete(job)
+
+        return jobs
+
+    def close(self):
+        """Close the pooled session."""
+        self.session.close()
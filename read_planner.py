@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Read Planner Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module turns the loaded SFD configuration into a column projection and a
+set of row filters that are pushed down into the parquet reader. Row groups
+whose statistics cannot match the selected ship types, geographic box, MMSI
+list or speed threshold are skipped instead of being decoded and thrown away.
+"""
+
+import os
+import logging
+
+import pandas as pd
+
+# Set up module-level logger
+logger = logging.getLogger(__name__)
+
+# Required columns for AIS data
+REQUIRED_COLUMNS = [
+    'MMSI', 'VesselName', 'VesselType', 'LAT', 'LON',
+    'BaseDateTime', 'SOG', 'Heading', 'COG'
+]
+
+# Columns that are kept when present because downstream reports and the
+# ML course prediction use them. Anything else in the source file is not read.
+OPTIONAL_COLUMNS = ['IMO', 'CallSign', 'Length', 'Width', 'Draft']
+
+
+def expand_ship_types(selected_types):
+    """
+    Expand the configured ship types into the set of raw VesselType codes they select.
+
+    Mirrors the filter in SFD.load_and_preprocess_day: when any selected type is a
+    2-digit main type the whole decade is selected (70 -> 70..79), otherwise the
+    codes are matched exactly.
+
+    Args:
+        selected_types (list): Ship types from SELECTED_SHIP_TYPES
+
+    Returns:
+        list: Sorted list of VesselType codes
+    """
+    if not selected_types:
+        return []
+
+    selected_types = [int(t) for t in selected_types]
+    has_main_types = any(t < 100 for t in selected_types)
+
+    if not has_main_types:
+        return sorted(set(selected_types))
+
+    codes = set()
+    for main_type in selected_types:
+        # Only multiples of 10 can be produced by (VesselType // 10) * 10
+        if main_type % 10 == 0:
+            codes.update(range(main_type, main_type + 10))
+    return sorted(codes)
+
+
+class ReadPlan:
+    """
+    Column projection and row filters for reading one daily AIS file.
+
+    The filters are kept in the list-of-tuples (DNF conjunction) form accepted by
+    pandas.read_parquet, pyarrow.parquet.read_table and dask.dataframe.read_parquet.
+    """
+
+    def __init__(self, columns=None, filters=None):
+        """
+        Initialize the read plan.
+
+        Args:
+            columns (list, optional): Columns to read, or None for all columns
+            filters (list, optional): List of (column, op, value) tuples that must all hold
+        """
+        self.columns = columns
+        self.filters = filters or []
+
+    def reader_kwargs(self):
+        """Keyword arguments for pandas/pyarrow/dask parquet readers."""
+        kwargs = {}
+        if self.columns:
+            kwargs['columns'] = self.columns
+        if self.filters:
+            kwargs['filters'] = self.filters
+        return kwargs
+
+    def apply(self, df):
+        """
+        Evaluate the plan's filters on an in-memory DataFrame.
+
+        Used for readers without predicate pushdown (CSV, cuDF) so that every
+        loading path produces the same rows.
+
+        Args:
+            df (DataFrame): Loaded data
+
+        Returns:
+            DataFrame: Rows matching all filters
+        """
+        if df is None or df.empty or not self.filters:
+            return df
+
+        mask = pd.Series(True, index=df.index)
+        for column, op, value in self.filters:
+            if column not in df.columns:
+                continue
+            values = df[column]
+            if values.dtype == object:
+                values = pd.to_numeric(values, errors='coerce')
+            if op == 'in':
+                mask &= values.isin(value)
+            elif op == '>=':
+                mask &= values >= value
+            elif op == '<=':
+                mask &= values <= value
+        return df[mask]
+
+    def describe(self):
+        """Short human-readable summary for logging."""
+        parts = []
+        for column, op, value in self.filters:
+            if op == 'in':
+                parts.append(f"{column} in <{len(value)} values>")
+            else:
+                parts.append(f"{column} {op} {value}")
+        columns = len(self.columns) if self.columns else 'all'
+        return f"columns={columns}, filters=[{', '.join(parts)}]"
+
+
+def build_read_plan(config, schema_types=None):
+    """
+    Build a read plan from the SFD configuration.
+
+    Args:
+        config (dict): Configuration dictionary from SFD.load_config
+        schema_types (dict, optional): Mapping of column name to a type string for the
+            source file (e.g. from read_parquet_schema). When given, the projection is
+            restricted to columns that exist and filters are only pushed down for
+            numeric columns, so a source with string-typed columns still loads.
+
+    Returns:
+        ReadPlan: The read plan
+    """
+    # Without a known schema every column is read, since projecting a missing
+    # optional column would fail the read
+    columns = None
+    if schema_types is not None:
+        columns = [col for col in REQUIRED_COLUMNS + OPTIONAL_COLUMNS if col in schema_types]
+
+    def can_filter(column):
+        if schema_types is None:
+            return True
+        type_str = schema_types.get(column)
+        if type_str is None:
+            return False
+        return any(token in type_str for token in ('int', 'float', 'double', 'decimal'))
+
+    filters = []
+
+    # Ship type selection
+    ship_codes = expand_ship_types(config.get('SELECTED_SHIP_TYPES', []))
+    if ship_codes and can_filter('VesselType'):
+        filters.append(('VesselType', 'in', ship_codes))
+
+    # Geographic box: always drop invalid coordinates, narrowed by ANALYSIS_FILTERS
+    min_lat = max(-90.0, float(config.get('min_latitude', -90.0)))
+    max_lat = min(90.0, float(config.get('max_latitude', 90.0)))
+    min_lon = max(-180.0, float(config.get('min_longitude', -180.0)))
+    max_lon = min(180.0, float(config.get('max_longitude', 180.0)))
+    if can_filter('LAT'):
+        filters.append(('LAT', '>=', min_lat))
+        filters.append(('LAT', '<=', max_lat))
+    if can_filter('LON'):
+        filters.append(('LON', '>=', min_lon))
+        filters.append(('LON', '<=', max_lon))
+
+    # MMSI list
+    mmsi_list = config.get('filter_mmsi_list', [])
+    if isinstance(mmsi_list, str):
+        mmsi_list = [int(mmsi.strip()) for mmsi in mmsi_list.split(',') if mmsi.strip()]
+    if mmsi_list and can_filter('MMSI'):
+        filters.append(('MMSI', 'in', sorted(set(int(m) for m in mmsi_list))))
+
+    # Unrealistic speeds
+    speed_threshold = config.get('SPEED_THRESHOLD', 102)
+    if speed_threshold is not None and can_filter('SOG'):
+        filters.append(('SOG', '<=', float(speed_threshold)))
+
+    return ReadPlan(columns=columns, filters=filters)
+
+
+def read_parquet_schema(file_path):
+    """
+    Read the column types of a local parquet file without reading any data.
+
+    Args:
+        file_path (str): Path to the parquet file
+
+    Returns:
+        dict or None: Mapping of column name to type string, or None if unavailable
+    """
+    if file_path.startswith('s3://') or not os.path.exists(file_path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+        schema = pq.read_schema(file_path)
+        return {field.name: str(field.type) for field in schema}
+    except Exception as e:
+        logger.debug(f"Could not read parquet schema for {file_path}: {e}")
+        return None
+
+
+def plan_for_file(file_path, config):
+    """
+    Build the read plan for a specific daily file.
+
+    Args:
+        file_path (str): Path to the CSV or Parquet file
+        config (dict): Configuration dictionary
+
+    Returns:
+        ReadPlan: The read plan
+    """
+    schema_types = None
+    if os.path.splitext(file_path)[1].lower() == '.parquet':
+        schema_types = read_parquet_schema(file_path)
+    return build_read_plan(config, schema_types)
@@ -53,7 +53,8 @@ def get_latest_output_dir():
                 item_path = os.path.join(search_dir, item)
                 if os.path.isdir(item_path):
                     # Check if this directory contains AIS analysis outputs
-                    if (os.path.exists(os.path.join(item_path, "AIS_Anomalies_Summary.csv")) or 
+                    if (os.path.exists(os.path.join(item_path, "AIS_Anomalies_Summary.csv")) or
+                        os.path.exists(os.path.join(item_path, "AIS_Anomalies_Summary.parquet")) or
                         os.path.exists(os.path.join(item_path, "vessel_details.csv")) or
                         os.path.exists(os.path.join(item_path, "All Anomalies Map.html"))):
                         
@@ -39,18 +39,17 @@ def get_cache_dir():
     return cache_dir
 
 def clear_cache():
-    """Clear the data cache directory."""
+    """Clear the data cache directory, including cached day folders, and reset its manifest."""
     cache_dir = get_cache_dir()
     if not cache_dir or not os.path.exists(cache_dir):
         logger.info("No cache directory found")
         return True
     
     try:
-        for filename in os.listdir(cache_dir):
-            file_path = os.path.join(cache_dir, filename)
-            if os.path.isfile(file_path):
-                os.unlink(file_path)
-        logger.info(f"Cache cleared: {cache_dir}")
+        # Imported here because cache_manager itself depends on this module
+        from cache_manager import CacheManager
+        removed = CacheManager(cache_dir).clear()
+        logger.info(f"Cache cleared: {cache_dir} ({removed} files removed)")
         return True
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
@@ -288,22 +287,3 @@ def validate_config(config_path='config.ini'):
         
     except Exception as e:
         return False, f"Error reading config file: {str(e)}"
-
-def generate_cache_key(file_path, config):
-    """Generate a unique cache key for a file based on path and config."""
-    import hashlib
-    
-    file_name = os.path.basename(file_path)
-    ship_types_str = ",".join(map(str, config.get('SELECTED_SHIP_TYPES', []))) if 'SELECTED_SHIP_TYPES' in config else ""
-    key_string = f"{file_name}_{ship_types_str}"
-    
-    # Include file modification time if file exists locally
-    if os.path.exists(file_path) and not file_path.startswith('s3://'):
-        try:
-            mtime = os.path.getmtime(file_path)
-            key_string += f"_{mtime}"
-        except Exception:
-            pass
-    
-    # Generate hash of the key string
-    return hashlib.md5(key_string.encode()).hexdigest()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Vessel State Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module keeps the per-vessel state that cross-day detection needs, so a new
+day can be analysed without reloading the days before it. For every MMSI ever
+seen the store holds its last report (last position and timestamp, and the
+identity fields VesselName, IMO, CallSign and VesselType as last reported), the
+day of that report and the restricted zones it was in. It also holds the tail of
+recent positions that the rolling loitering windows reach back into.
+
+The vessels table, kept in MMSI order, is also the last-seen table the AIS beacon
+detectors join each new day against, so beacon gaps are measured from a
+vessel's actual last report however many days ago it was.
+
+SFD._process_anomaly_detection updates the state after every day and saves it at
+the end of a run; SFD.py --incremental --date D loads it, analyses day D against
+it and saves it again.
+
+Layout inside the state directory:
+
+    vessels.parquet     last report of every vessel, with LastSeenDate and
+                        LastZone; the file metadata records the last day
+                        processed
+    loitering.parquet   positions carried into the next day's loitering windows
+"""
+
+import os
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ais_schema import read_ais_parquet, write_ais_parquet, read_parquet_metadata, concat_ais_frames
+from anomaly_detectors import first_last_positions, loitering_carry, LOITERING_COLUMNS, LAST_SEEN_COLUMNS
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes; older state is then ignored
+VESSEL_STATE_VERSION = 1
+
+# Parquet metadata keys
+STATE_DATE_KEY = 'sfd.state_date'
+STATE_VERSION_KEY = 'sfd.state_version'
+
+# State directory inside the output directory when none is configured
+DEFAULT_STATE_DIRNAME = 'vessel_state'
+
+VESSELS_FILE = 'vessels.parquet'
+LOITERING_FILE = 'loitering.parquet'
+
+
+def vessel_state_dir(config):
+    """
+    Directory holding the vessel state of a configuration.
+
+    Args:
+        config (dict): Configuration dictionary
+
+    Returns:
+        str: STATE_DIRECTORY if set, otherwise vessel_state in the output directory
+    """
+    return config.get('STATE_DIRECTORY') or os.path.join(config.get('OUTPUT_DIRECTORY', 'output'),
+                                                         DEFAULT_STATE_DIRNAME)
+
+
+class VesselState:
+    """
+    Last known report of every vessel, plus the loitering tail.
+
+    Attributes:
+        last_date (date or None): Last day folded into the state
+        vessels (DataFrame or None): Last report per MMSI in MMSI order, with
+            LastSeenDate and LastZone columns
+        loitering (DataFrame or None): LOITERING_COLUMNS carried into the next day
+    """
+
+    def __init__(self, last_date=None, vessels=None, loitering=None):
+        self.last_date = last_date
+        self.vessels = vessels
+        self.loitering = loitering
+
+    @property
+    def empty(self):
+        return self.last_date is None
+
+    def previous_day_last(self):
+        """
+        Last report of each vessel seen on last_date.
+
+        Returns:
+            DataFrame or None: One row per MMSI in MMSI order, the same rows
+                first_last_positions gives for that day
+        """
+        if self.vessels is None:
+            return None
+        seen = self.vessels['LastSeenDate'] == self.last_date
+        return self.vessels[seen].drop(columns=LAST_SEEN_COLUMNS).reset_index(drop=True)
+
+    def update(self, df_day, day, loitering_positions=None, loitering_duration_hours=24.0, zone_index=None):
+        """
+        Fold one analysed day into the state.
+
+        Args:
+            df_day (DataFrame): The day's AIS reports
+            day (date): The day
+            loitering_positions (DataFrame, optional): Tail returned by
+                detect_loitering; computed from df_day when not given
+            loitering_duration_hours (float, optional): Loitering window length
+            zone_index (ZoneIndex, optional): Restricted zones for LastZone
+        """
+        _, last = first_last_positions(df_day)
+        last = last.assign(LastSeenDate=day, LastZone=_zone_names(last, zone_index))
+        if self.vessels is not None:
+            kept = self.vessels[~self.vessels['MMSI'].isin(last['MMSI'])]
+            last = concat_ais_frames([kept, last], ignore_index=True)
+            last = last.sort_values('MMSI', kind='stable', ignore_index=True)
+
+        if loitering_positions is None:
+            cutoff = pd.Timestamp(day) + pd.Timedelta(days=1) - pd.Timedelta(hours=loitering_duration_hours)
+            loitering_positions = loitering_carry(df_day, cutoff)
+
+        self.vessels = last
+        self.loitering = loitering_positions
+        self.last_date = day
+
+    def save(self, directory):
+        """
+        Write the state to a directory, replacing what was there.
+
+        Args:
+            directory (str): State directory
+        """
+        if self.empty:
+            return
+        os.makedirs(directory, exist_ok=True)
+        metadata = {STATE_DATE_KEY: self.last_date.strftime('%Y-%m-%d'),
+                    STATE_VERSION_KEY: VESSEL_STATE_VERSION}
+        # The vessels file carries the date, so it is written last
+        write_ais_parquet(self.loitering, os.path.join(directory, LOITERING_FILE))
+        write_ais_parquet(self.vessels, os.path.join(directory, VESSELS_FILE), metadata=metadata)
+        logger.info(f"Saved state of {len(self.vessels)} vessels as of {self.last_date} to {directory}")
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Read the state saved in a directory.
+
+        Args:
+            directory (str): State directory
+
+        Returns:
+            VesselState: The saved state, or an empty state if there is none
+                (or it was written by another layout version)
+        """
+        vessels_path = os.path.join(directory, VESSELS_FILE)
+        loitering_path = os.path.join(directory, LOITERING_FILE)
+        if not (os.path.exists(vessels_path) and os.path.exists(loitering_path)):
+            return cls()
+
+        metadata = read_parquet_metadata(vessels_path)
+        if metadata.get(STATE_VERSION_KEY) != str(VESSEL_STATE_VERSION) or STATE_DATE_KEY not in metadata:
+            logger.warning(f"Ignoring vessel state in {directory} written by another version")
+            return cls()
+
+        last_date = datetime.strptime(metadata[STATE_DATE_KEY], '%Y-%m-%d').date()
+        vessels = read_ais_parquet(vessels_path)
+        loitering = read_ais_parquet(loitering_path, columns=LOITERING_COLUMNS)
+        logger.info(f"Loaded state of {len(vessels)} vessels as of {last_date} from {directory}")
+        return cls(last_date, vessels, loitering)
+
+
+def _zone_names(positions, zone_index):
+    """Names of the zones each position lies in, joined with ', ' (None outside all zones)."""
+    names = np.full(len(positions), None, dtype=object)
+    if zone_index is None or positions.empty:
+        return names
+    point, zone = zone_index.locate(positions['LAT'].to_numpy(dtype=np.float64, na_value=np.nan),
+                                    positions['LON'].to_numpy(dtype=np.float64, na_value=np.nan))
+    if len(point) == 0:
+        return names
+    # locate orders memberships by point, then zone
+    starts = np.flatnonzero(np.r_[True, point[1:] != point[:-1]])
+    for start, end in zip(starts, np.r_[starts[1:], len(point)]):
+        names[point[start]] = ', '.join(zone_index.zones[z]['name'] for z in zone[start:end])
+    return names
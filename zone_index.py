@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Zone Index Module for SFD Project
+
+[VERSION}
+Team = Dreadnaught
+Alex Giacomello, Christopher Matherne, Rupert Rigg, Zachary Zhao
+version = 2.1 Beta
+
+This module indexes the restricted zones from the [ZONE_VIOLATIONS] section so
+that AIS positions can be assigned to zones in one vectorized pass. Zones are
+either lat/lon boxes (zone_N_lat_min ... zone_N_lon_max) or polygons given as
+"lat,lon; lat,lon; ..." in zone_N_polygon.
+
+Every zone's bounding box is registered on a fixed one-degree grid. A position
+only tests the zones registered on its grid cell, so hundreds of EEZ-sized
+zones cost about the same as a handful of boxes.
+"""
+
+import logging
+
+import numpy as np
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# Width of a grid cell in degrees
+ZONE_GRID_DEGREES = 1.0
+
+
+def parse_polygon(text):
+    """
+    Parse a polygon written as "lat,lon; lat,lon; ...".
+
+    Args:
+        text (str): Polygon vertices; the ring is closed automatically
+
+    Returns:
+        numpy.ndarray: (n, 2) array of lat/lon vertices
+
+    Raises:
+        ValueError: If the text has fewer than three valid vertices
+    """
+    vertices = []
+    for vertex in text.replace('\n', ';').split(';'):
+        if vertex.strip():
+            lat, lon = (float(value) for value in vertex.split(','))
+            vertices.append((lat, lon))
+    if len(vertices) < 3:
+        raise ValueError(f"A zone polygon needs at least three vertices, got {len(vertices)}")
+    return np.array(vertices, dtype=np.float64)
+
+
+def format_polygon(vertices):
+    """
+    Write polygon vertices in the zone_N_polygon format.
+
+    Args:
+        vertices (array-like): (n, 2) lat/lon vertices
+
+    Returns:
+        str: "lat,lon; lat,lon; ..."
+    """
+    return '; '.join(f"{lat:g},{lon:g}" for lat, lon in vertices)
+
+
+def points_in_polygon(lat, lon, polygon):
+    """
+    Even-odd test of points against a polygon in lat/lon degrees.
+
+    Args:
+        lat (numpy.ndarray): Point latitudes
+        lon (numpy.ndarray): Point longitudes
+        polygon (numpy.ndarray): (n, 2) lat/lon vertices
+
+    Returns:
+        numpy.ndarray: Boolean mask of points inside the polygon
+    """
+    inside = np.zeros(len(lat), dtype=bool)
+    lat1, lon1 = polygon[-1]
+    for lat2, lon2 in polygon:
+        crosses = (lat1 > lat) != (lat2 > lat)
+        if crosses.any():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                edge_lon = lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1)
+            inside ^= crosses & (lon < edge_lon)
+        lat1, lon1 = lat2, lon2
+    return inside
+
+
+class ZoneIndex:
+    """
+    Grid index over restricted zones.
+
+    Args:
+        zones (list): Zone dicts with 'name' and either 'polygon' ((n, 2)
+            lat/lon vertices or a "lat,lon; ..." string) or the lat_min,
+            lat_max, lon_min and lon_max box bounds
+        cell_degrees (float, optional): Grid cell width in degrees
+    """
+
+    def __init__(self, zones, cell_degrees=ZONE_GRID_DEGREES):
+        self.zones = []
+        self.polygons = []
+        for zone in zones:
+            polygon = zone.get('polygon')
+            if isinstance(polygon, str):
+                polygon = parse_polygon(polygon)
+            zone = dict(zone, name=zone.get('name', 'Unknown Zone'))
+            if polygon is not None:
+                polygon = np.asarray(polygon, dtype=np.float64)
+                zone.update(lat_min=polygon[:, 0].min(), lat_max=polygon[:, 0].max(),
+                            lon_min=polygon[:, 1].min(), lon_max=polygon[:, 1].max())
+            else:
+                zone.update(lat_min=zone.get('lat_min', -90), lat_max=zone.get('lat_max', 90),
+                            lon_min=zone.get('lon_min', -180), lon_max=zone.get('lon_max', 180))
+            self.zones.append(zone)
+            self.polygons.append(polygon)
+
+        self.lat_min = np.array([zone['lat_min'] for zone in self.zones], dtype=np.float64)
+        self.lat_max = np.array([zone['lat_max'] for zone in self.zones], dtype=np.float64)
+        self.lon_min = np.array([zone['lon_min'] for zone in self.zones], dtype=np.float64)
+        self.lon_max = np.array([zone['lon_max'] for zone in self.zones], dtype=np.float64)
+
+        # Dense CSR table: zones registered on each grid cell
+        self.cell_degrees = cell_degrees
+        self.rows = int(np.ceil(180 / cell_degrees))
+        self.cols = int(np.ceil(360 / cell_degrees))
+        cells, zone_ids = [], []
+        for zone_id in range(len(self.zones)):
+            rows = np.arange(self._row(self.lat_min[zone_id]), self._row(self.lat_max[zone_id]) + 1)
+            cols = np.arange(self._col(self.lon_min[zone_id]), self._col(self.lon_max[zone_id]) + 1)
+            cells.append((rows[:, None] * self.cols + cols[None, :]).ravel())
+            zone_ids.append(np.full(cells[-1].size, zone_id))
+        cells = np.concatenate(cells) if cells else np.array([], dtype=np.int64)
+        zone_ids = np.concatenate(zone_ids) if zone_ids else np.array([], dtype=np.int64)
+        order = np.argsort(cells, kind='stable')
+        self.cell_zones = zone_ids[order]
+        self.cell_offsets = np.r_[0, np.cumsum(np.bincount(cells, minlength=self.rows * self.cols))]
+        logger.info(f"Indexed {len(self.zones)} zones on {np.count_nonzero(np.diff(self.cell_offsets))} "
+                    f"grid cells of {cell_degrees} degrees")
+
+    def __len__(self):
+        return len(self.zones)
+
+    def _row(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_degrees), 0, self.rows - 1).astype(np.int64)
+
+    def _col(self, lon):
+        return np.clip(np.floor((np.asarray(lon) + 180) / self.cell_degrees), 0, self.cols - 1).astype(np.int64)
+
+    def locate(self, lat, lon):
+        """
+        Zones containing each position.
+
+        Box zones include their edges, as before. A position inside several
+        overlapping zones is reported once per zone.
+
+        Args:
+            lat (array-like): Latitudes in degrees
+            lon (array-like): Longitudes in degrees
+
+        Returns:
+            tuple: (point, zone) index arrays, ordered by point then zone
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        empty = np.array([], dtype=np.int64)
+        valid = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        if len(self.zones) == 0 or len(valid) == 0:
+            return empty, empty
+
+        # Candidate zones registered on each position's cell
+        cell = self._row(lat[valid]) * self.cols + self._col(lon[valid])
+        start = self.cell_offsets[cell]
+        counts = self.cell_offsets[cell + 1] - start
+        point = np.repeat(valid, counts)
+        zone = self.cell_zones[np.repeat(start - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+
+        plat, plon = lat[point], lon[point]
+        inside = ((plat >= self.lat_min[zone]) & (plat <= self.lat_max[zone]) &
+                  (plon >= self.lon_min[zone]) & (plon <= self.lon_max[zone]))
+        point, zone = point[inside], zone[inside]
+
+        # Exact test for polygon zones, one polygon at a time
+        polygon_ids = [zone_id for zone_id, polygon in enumerate(self.polygons) if polygon is not None]
+        if polygon_ids and len(zone):
+            keep = np.ones(len(zone), dtype=bool)
+            by_zone = np.argsort(zone, kind='stable')
+            bounds = np.searchsorted(zone[by_zone], np.array([polygon_ids, np.add(polygon_ids, 1)]))
+            for zone_id, lo, hi in zip(polygon_ids, bounds[0], bounds[1]):
+                if hi > lo:
+                    members = by_zone[lo:hi]
+                    keep[members] = points_in_polygon(lat[point[members]], lon[point[members]],
+                                                      self.polygons[zone_id])
+            point, zone = point[keep], zone[keep]
+
+        order = np.lexsort((zone, point))
+        return point[order], zone[order]